@@ -0,0 +1,3 @@
+"""
+performance benchmarks of tempoo, see benchmarks/__main__.py
+"""
@@ -0,0 +1,142 @@
+"""
+run the benchmarks (asv style) and store the results in a json file
+
+from the repository root:
+    python -m benchmarks                          # run all, save into .benchmarks/
+    python -m benchmarks -k timetick              # run the benchmarks matching a pattern
+    python -m benchmarks -o results.json          # choose the output file
+    python -m benchmarks --compare old.json new.json
+
+the benchmarks are the methods time_* (timed) and track_* (value recorded)
+of the classes *Suite in the modules benchmarks/bench_*.py
+like asv, the class attribute params lists the parameters passed to setup and to the benchmark methods
+"""
+import argparse
+import datetime
+import glob
+import importlib
+import inspect
+import json
+import os
+import platform
+import sys
+import timeit
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPEAT = 5
+
+
+def iter_benchmarks(pattern: str = ""):
+    """generate (name, suite_class, method_name, param)"""
+    for filename in sorted(glob.glob(os.path.join(BENCHMARK_DIR, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(filename))[0]
+        module = importlib.import_module(f'benchmarks.{module_name}')
+
+        for class_name, suite_class in inspect.getmembers(module, inspect.isclass):
+            if not class_name.endswith('Suite') or suite_class.__module__ != module.__name__:
+                continue
+
+            params = getattr(suite_class, 'params', [None])
+            for method_name in sorted(dir(suite_class)):
+                if not method_name.startswith(('time_', 'track_')):
+                    continue
+                for param in params:
+                    name = f'{module_name}.{class_name}.{method_name}'
+                    if param is not None:
+                        name += f'({param})'
+                    if pattern in name:
+                        yield name, suite_class, method_name, param
+
+
+def run_benchmark(suite_class, method_name: str, param):
+    suite = suite_class()
+    args = () if param is None else (param,)
+    if hasattr(suite, 'setup'):
+        suite.setup(*args)
+
+    method = getattr(suite, method_name)
+    try:
+        if method_name.startswith('track_'):
+            return {"value": method(*args), "unit": getattr(method, "unit", "")}
+
+        timer = timeit.Timer(lambda: method(*args))
+        number, _ = timer.autorange()
+        times = np.asarray(timer.repeat(repeat=REPEAT, number=number)) / number
+        return {"min": times.min(), "median": float(np.median(times)),
+                "number": number, "repeat": REPEAT, "unit": "seconds"}
+    finally:
+        if hasattr(suite, 'teardown'):
+            suite.teardown(*args)
+
+
+def machine_info() -> dict:
+    from tempoo.version import __version__
+    return {
+        "tempoo": __version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+
+
+def format_result(result: dict) -> str:
+    if "value" in result:
+        return f'{result["value"]} {result["unit"]}'
+    seconds = result["min"]
+    for unit, scale in [("s", 1.), ("ms", 1e-3), ("us", 1e-6), ("ns", 1e-9)]:
+        if seconds >= scale:
+            break
+    return f'{seconds / scale:.3f} {unit}'
+
+
+def compare(old_file: str, new_file: str):
+    with open(old_file, 'r') as fid:
+        old = json.load(fid)["results"]
+    with open(new_file, 'r') as fid:
+        new = json.load(fid)["results"]
+
+    for name in sorted(set(old) & set(new)):
+        key = "value" if "value" in new[name] else "min"
+        try:
+            ratio = f'{new[name][key] / old[name][key]:8.3f}'
+        except (TypeError, ZeroDivisionError):
+            ratio = f'{"":8s}'
+        print(f'{ratio} {format_result(old[name]):>16s} {format_result(new[name]):>16s}  {name}')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='pattern', default="", help='run only the benchmarks matching pattern')
+    parser.add_argument('-o', dest='output', default=None, help='output json file')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    info = machine_info()
+    output = args.output
+    if output is None:
+        date = datetime.datetime.now().strftime('%Y%m%dT%H%M%S')
+        output = os.path.join('.benchmarks', f'{info["tempoo"]}_{date}.json')
+
+    results = {}
+    for name, suite_class, method_name, param in iter_benchmarks(args.pattern):
+        results[name] = run_benchmark(suite_class, method_name, param)
+        print(f'{format_result(results[name]):>16s}  {name}')
+        sys.stdout.flush()
+
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as fid:
+        json.dump({"machine": info, "results": results}, fid, indent=1)
+    print(f'results saved in {output}')
+
+
+if __name__ == '__main__':
+    main()
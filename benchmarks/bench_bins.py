@@ -0,0 +1,48 @@
+"""
+benchmarks for tempoo.bins : events per calendar bin
+"""
+import numpy as np
+from tempoo.bins import calendar_bins, CalendarBinAggregator
+from tempoo.utc import UTCFromTimestamp, days_between
+
+
+class CalendarBinsSuite:
+    params = ['hour', 'day', 'week', 'month', 'year']
+    param_names = ['unit']
+
+    def setup(self, unit):
+        rng = np.random.RandomState(0)
+        self.timestamps = rng.uniform(1.5e9, 1.7e9, 1000000)
+        self.microseconds = (self.timestamps * 1e6).astype(np.int64)
+        self.values = rng.normal(size=1000000)
+
+    def time_counts_1000000(self, unit):
+        calendar_bins(self.timestamps, unit)
+
+    def time_counts_microseconds_1000000(self, unit):
+        calendar_bins(self.microseconds, unit)
+
+    def time_means_1000000(self, unit):
+        calendar_bins(self.timestamps, unit, values=self.values).means
+
+    def time_streaming_100_chunks(self, unit):
+        aggregator = CalendarBinAggregator(unit)
+        for chunk in np.array_split(self.timestamps, 100):
+            aggregator.add(chunk)
+        aggregator.result()
+
+
+class DailyCountsSuite:
+    # former approach : list of days with days_between, then one mask per day
+
+    def setup(self):
+        self.timestamps = np.random.RandomState(0).uniform(1.6e9, 1.6e9 + 365 * 86400., 100000)
+
+    def time_days_between_loop(self):
+        days = days_between(UTCFromTimestamp(self.timestamps.min()).floorday,
+                            UTCFromTimestamp(self.timestamps.max()).ceilday)
+        starts = np.asarray([day.timestamp for day in days])
+        [((self.timestamps >= t1) & (self.timestamps < t2)).sum() for t1, t2 in zip(starts[:-1], starts[1:])]
+
+    def time_calendar_bins(self):
+        calendar_bins(self.timestamps, 'day')
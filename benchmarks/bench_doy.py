@@ -0,0 +1,16 @@
+"""
+benchmarks for tempoo.doy
+"""
+import io
+from tempoo.doy import doy_table, write_doy
+
+
+class DoySuite:
+    params = [1, 100]
+    param_names = ['nyears']
+
+    def time_doy_table(self, nyears):
+        doy_table(2000, 2000 + nyears - 1)
+
+    def time_write_doy_text(self, nyears):
+        write_doy(doy_table(2000, 2000 + nyears - 1), io.BytesIO(), format="text")
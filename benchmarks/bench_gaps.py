@@ -0,0 +1,44 @@
+"""
+benchmarks for tempoo.gaps : gaps and overlaps of a waveform archive, 100000 records of 60 s
+"""
+import numpy as np
+from tempoo.gaps import detect_gaps, GapDetector, window_coverage
+from tempoo.utc import UTCFromTimestamp
+
+
+class GapsSuite:
+
+    def setup(self):
+        rng = np.random.RandomState(0)
+        n = 100000
+        self.starts = np.arange(n) * 60. + 1.6e9 + np.cumsum(rng.choice([0., 0., 0., 2.5, -1.5], n))
+        self.npts = np.full(n, 6000)
+        self.ends = self.starts + 60.
+
+    def time_detect_gaps(self):
+        detect_gaps(self.starts, npts=self.npts, dt=0.01, tolerance=0.005)
+
+    def time_streaming_100_chunks(self):
+        detector = GapDetector(tolerance=0.005)
+        for i in range(0, len(self.starts), 1000):
+            detector.add(self.starts[i:i + 1000], self.ends[i:i + 1000])
+
+    def time_streaming_100_chunks_minute_windows(self):
+        window_starts = np.arange(self.starts[0], self.ends[-1], 60.)
+        detector = GapDetector(tolerance=0.005, window_starts=window_starts, window_ends=window_starts + 60.)
+        for i in range(0, len(self.starts), 1000):
+            detector.add(self.starts[i:i + 1000], self.ends[i:i + 1000])
+
+    def time_window_coverage_hourly(self):
+        window_coverage(self.starts, self.ends, self.starts[0], self.ends[-1], winlen=3600., winstep=3600.)
+
+    def time_utc_loop_1000(self):
+        # former approach : python loop over UTC objects
+        gaps = []
+        previous_end = None
+        for start, npts in zip(self.starts[:1000], self.npts[:1000]):
+            start = UTCFromTimestamp(start)
+            end = start + npts * 0.01
+            if previous_end is not None and abs((start - previous_end).timestamp) > 0.005:
+                gaps.append((previous_end, start))
+            previous_end = end
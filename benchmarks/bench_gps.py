@@ -0,0 +1,18 @@
+"""
+benchmarks for tempoo.gps
+"""
+import numpy as np
+from tempoo.gps import gps2timestamp
+
+
+class GPSSuite:
+
+    def setup(self):
+        self.number_of_seconds_since_gps_epoch = 1378771200.0
+        self.array = np.linspace(1e6, 1.4e9, 100000)
+
+    def time_gps2timestamp(self):
+        gps2timestamp(self.number_of_seconds_since_gps_epoch)
+
+    def time_gps2timestamp_array_100000(self):
+        gps2timestamp(self.array)
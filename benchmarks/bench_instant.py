@@ -0,0 +1,84 @@
+"""
+benchmarks for tempoo.instant : construction rate, field access and memory per instance
+"""
+import sys
+import tracemalloc
+import numpy as np
+from tempoo.instant import Instant
+from tempoo.utc import UTC, UTCFromTimestamp, utc2microseconds
+
+
+def _make(kind: str, microseconds: np.ndarray) -> list:
+    # new python ints, owned by the Instants only
+    microseconds = microseconds.tolist()
+    if kind == 'utc':
+        return [UTCFromTimestamp(us / 1e6) for us in microseconds]
+    elif kind == 'instant':
+        return [Instant(us) for us in microseconds]
+    elif kind == 'float':
+        return [us / 1e6 for us in microseconds]
+    raise ValueError(kind)
+
+
+class InstantConstructionSuite:
+
+    def setup(self):
+        self.utc = UTC(2016, 3, 5, 12, 30, 15, 123456)
+        self.microseconds = utc2microseconds(self.utc)
+        self.timestamp = self.utc.timestamp
+        self.string = str(self.utc)
+        self.instant = Instant(self.microseconds)
+
+    def time_instant(self):
+        Instant(self.microseconds)
+
+    def time_instant_from_timestamp(self):
+        Instant.from_timestamp(self.timestamp)
+
+    def time_instant_from_utc(self):
+        Instant.from_utc(self.utc)
+
+    def time_instant_from_str(self):
+        Instant.from_str(self.string)
+
+    def time_instant_to_utc(self):
+        self.instant.to_utc()
+
+
+class InstantPropertiesSuite:
+    params = ['timestamp', 'year', 'julday', 'weekday', 'hour', 'decimal_year',
+              'flooryear', 'ceilmonth', 'floorday', 'ceilhour', 'floorweek']
+    param_names = ['name']
+
+    def setup(self, name):
+        self.instant = Instant(utc2microseconds(UTC(2016, 3, 5, 12, 30, 15, 123456)))
+
+    def time_property(self, name):
+        getattr(self.instant, name)
+
+
+class InstantMemorySuite:
+    params = ['utc', 'instant', 'float']
+    param_names = ['kind']
+
+    def setup(self, kind):
+        self.microseconds = np.random.RandomState(0).randint(
+            0, 2 ** 31 * 1000000, 10000, dtype=np.int64)
+
+    def time_construct_10000(self, kind):
+        _make(kind, self.microseconds)
+
+    def track_getsizeof(self, kind):
+        # bytes of the object itself, without the int referenced by an Instant
+        return sys.getsizeof(_make(kind, self.microseconds[:1])[0])
+
+    def track_memory_per_instance(self, kind):
+        # bytes kept alive per object, including the int referenced by an Instant
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            objects = _make(kind, self.microseconds)
+            used = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        return (used - sys.getsizeof(objects)) / len(objects)
@@ -0,0 +1,39 @@
+"""
+benchmarks for tempoo.intervals
+"""
+import numpy as np
+from tempoo.intervals import IntervalIndex, merge_intervals
+
+
+class IntervalIndexSuite:
+    params = [10000, 100000]
+    param_names = ['nintervals']
+
+    def setup(self, nintervals):
+        rng = np.random.RandomState(0)
+        self.starts = np.sort(rng.uniform(0., 1e7, nintervals))
+        self.ends = self.starts + rng.exponential(3600., nintervals)
+        self.groups = rng.randint(0, 40, nintervals)
+        self.times = rng.uniform(0., 1e7, 1000)
+        self.index = IntervalIndex(self.starts, self.ends)
+        # the same intervals with a first one spanning all the others
+        long_ends = self.ends.copy()
+        long_ends[0] = 1e7
+        self.long_index = IntervalIndex(self.starts, long_ends)
+
+    def time_linear_scan_1000(self, nintervals):
+        # former way : one scan of all the intervals per query
+        for time in self.times:
+            np.flatnonzero((self.starts <= time) & (self.ends >= time))
+
+    def time_build_index(self, nintervals):
+        IntervalIndex(self.starts, self.ends)
+
+    def time_stab_1000(self, nintervals):
+        self.index.stab(self.times)
+
+    def time_stab_1000_with_long_interval(self, nintervals):
+        self.long_index.stab(self.times)
+
+    def time_merge_intervals_per_group(self, nintervals):
+        merge_intervals(self.starts, self.ends, self.groups)
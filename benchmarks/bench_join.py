@@ -0,0 +1,51 @@
+"""
+benchmarks for tempoo.join : as-of joins up to 10M x 10M
+"""
+import bisect
+from functools import lru_cache
+import numpy as np
+from tempoo.join import asof_join
+from tempoo.utc import UTCFromTimestamp
+
+
+@lru_cache(maxsize=2)
+def _times(n: int) -> (np.ndarray, np.ndarray):
+    # e.g. waveform samples (left) and gps fixes (right), both sorted
+    rng = np.random.RandomState(0)
+    left = np.sort(rng.uniform(1.6e9, 1.6e9 + 86400., n))
+    right = np.sort(rng.uniform(1.6e9, 1.6e9 + 86400., n))
+    return left, right
+
+
+class AsofJoinSuite:
+    params = [100000, 10000000]
+    param_names = ['n']
+
+    def setup(self, n):
+        self.left, self.right = _times(n)
+        self.microseconds = (self.left * 1e6).astype(np.int64), (self.right * 1e6).astype(np.int64)
+
+    def time_backward(self, n):
+        asof_join(self.left, self.right, 'backward')
+
+    def time_nearest_tolerance(self, n):
+        asof_join(self.left, self.right, 'nearest', tolerance=0.01)
+
+    def time_nearest_microseconds(self, n):
+        asof_join(*self.microseconds, 'nearest')
+
+
+class AsofLoopSuite:
+    # former approach : python loop over UTC objects (binary search with bisect), 1000 x 1000
+
+    def setup(self):
+        left, right = _times(100000)
+        self.left, self.right = left[::100], right[::100]
+        self.left_utcs = [UTCFromTimestamp(t) for t in self.left]
+        self.right_utcs = [UTCFromTimestamp(t) for t in self.right]
+
+    def time_utc_bisect_loop(self):
+        [bisect.bisect_right(self.right_utcs, utc) - 1 for utc in self.left_utcs]
+
+    def time_asof_join(self):
+        asof_join(self.left, self.right)
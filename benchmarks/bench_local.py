@@ -0,0 +1,38 @@
+"""
+benchmarks for tempoo.local
+"""
+import numpy as np
+from tempoo.local import timestamp2french, timestamps2french_fields, french_fields2timestamps, \
+    local_floor, local_between
+
+
+class FrenchConversionSuite:
+
+    def setup(self):
+        self.timestamps = np.random.RandomState(0).uniform(0., 2e9, 100000)
+        self.fields = timestamps2french_fields(self.timestamps)
+
+    def time_timestamp2french_loop_1000(self):
+        # former way : one datetime at a time
+        for timestamp in self.timestamps[:1000]:
+            timestamp2french(timestamp)
+
+    def time_timestamps2french_fields_100000(self):
+        timestamps2french_fields(self.timestamps)
+
+    def time_french_fields2timestamps_100000(self):
+        french_fields2timestamps(*self.fields)
+
+
+class LocalCalendarSuite:
+    params = ['day', 'week', 'month', 'year']
+    param_names = ['unit']
+
+    def setup(self, unit):
+        self.timestamps = np.random.RandomState(0).uniform(0., 2e9, 100000)
+
+    def time_local_floor_100000(self, unit):
+        local_floor(self.timestamps, unit, zone='Europe/Paris')
+
+    def time_local_between_30_years(self, unit):
+        local_between(1e9, 1e9 + 30 * 365.25 * 86400., unit, zone='Europe/Paris')
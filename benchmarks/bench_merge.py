@@ -0,0 +1,30 @@
+"""
+benchmarks for tempoo.merge : 300 sorted streams of 1000 events
+"""
+import heapq
+import numpy as np
+from tempoo.merge import merge_streams
+
+
+class MergeSuite:
+    params = [1024, 65536]
+    param_names = ['chunk_size']
+
+    def setup(self, chunk_size):
+        rng = np.random.RandomState(0)
+        self.streams = [np.sort(rng.uniform(1.6e9, 1.6e9 + 86400., 1000)) for _ in range(300)]
+        self.lists = [stream.tolist() for stream in self.streams]
+
+    def time_merge_streams(self, chunk_size):
+        for _ in merge_streams(self.streams, chunk_size=chunk_size):
+            pass
+
+    def time_heapq_merge(self, chunk_size):
+        # pure python reference, one (time, stream, index) tuple per event
+        for _ in heapq.merge(*[[(t, n, i) for i, t in enumerate(stream)] for n, stream in enumerate(self.lists)]):
+            pass
+
+    def time_concatenate_argsort(self, chunk_size):
+        # everything in memory, no streaming
+        times = np.concatenate(self.streams)
+        np.argsort(times, kind="stable")
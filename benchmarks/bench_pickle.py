@@ -0,0 +1,50 @@
+"""
+benchmarks for the pickling of tempoo.utc objects (multiprocessing)
+"""
+import datetime
+import pickle
+import numpy as np
+from tempoo.utc import UTC, UTCFromTimestamp, UTCArray
+
+
+class LegacyUTC(UTC):
+    # former format : the bytes state of datetime.datetime, rebuilt by the constructor
+    def __reduce_ex__(self, protocol):
+        return datetime.datetime.__reduce_ex__(self, protocol)
+
+
+class PickleSuite:
+    # out-of-band buffers need the pickle protocol 5 (python >= 3.8)
+    params = ['legacy', 'utc', 'utcarray'] + (['utcarray_out_of_band'] if pickle.HIGHEST_PROTOCOL >= 5 else [])
+    param_names = ['format']
+
+    def setup(self, format):
+        timestamps = np.random.RandomState(0).uniform(0., 2e9, 10000)
+        utcs = [UTCFromTimestamp(timestamp) for timestamp in timestamps]
+        if format == 'legacy':
+            self.obj = [LegacyUTC(*utc.__getstate__()) for utc in utcs]
+        elif format == 'utc':
+            self.obj = utcs
+        else:
+            self.obj = UTCArray.from_utcs(utcs)
+        self.out_of_band = format == 'utcarray_out_of_band'
+        self.pkl, self.buffers = self.dumps()
+
+    def dumps(self) -> (bytes, list):
+        if not self.out_of_band:
+            return pickle.dumps(self.obj, protocol=pickle.HIGHEST_PROTOCOL), None
+        buffers = []
+        return pickle.dumps(self.obj, protocol=5, buffer_callback=buffers.append), buffers
+
+    def time_dumps_10000(self, format):
+        self.dumps()
+
+    def time_loads_10000(self, format):
+        if self.out_of_band:
+            pickle.loads(self.pkl, buffers=self.buffers)
+        else:
+            pickle.loads(self.pkl)
+
+    def track_pickle_size_10000(self, format):
+        # in-band size, in bytes
+        return len(self.pkl)
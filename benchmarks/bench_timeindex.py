@@ -0,0 +1,29 @@
+"""
+benchmarks for tempoo.timeindex : slicing one year of 1 s samples (31.5M times) by period
+"""
+import numpy as np
+from tempoo.timeindex import TimeIndex
+from tempoo.utc import UTC
+
+
+class TimeIndexSuite:
+
+    def setup(self):
+        self.timestamps = np.arange(UTC(2021, 1, 1).timestamp, UTC(2022, 1, 1).timestamp, 1.)
+        self.amplitude = np.zeros(len(self.timestamps), np.float32)
+        self.index = TimeIndex(self.timestamps, amplitude=self.amplitude)
+        self.start, self.stop = UTC(2021, 3, 5, 12), UTC(2021, 3, 6)
+
+    def time_month_string(self):
+        self.index["2021-03"].columns['amplitude']
+
+    def time_hour_string(self):
+        self.index["2021-03-05T12"].columns['amplitude']
+
+    def time_utc_slice(self):
+        self.index[self.start:self.stop].columns['amplitude']
+
+    def time_boolean_mask(self):
+        # former approach : mask and copy
+        t1, t2 = self.start.timestamp, self.stop.timestamp
+        self.amplitude[(self.timestamps >= t1) & (self.timestamps <= t2)]
@@ -0,0 +1,60 @@
+"""
+benchmarks for tempoo.timeline
+"""
+import os
+import tempfile
+import numpy as np
+from tempoo.utc import UTCFromTimestamp
+from tempoo.timeline import load_timeline, parse_timeline_line, TimelineReader, TimelineViewer
+
+
+class LoadTimelineSuite:
+    params = [1000, 20000]
+    param_names = ['nrows']
+
+    def setup(self, nrows):
+        fid, self.filename = tempfile.mkstemp(suffix='.txt')
+        starts = np.sort(np.random.RandomState(0).uniform(1.6e9, 1.7e9, nrows))
+        with os.fdopen(fid, 'w') as fid:
+            for n, start in enumerate(starts):
+                fid.write(f"{n % 40},{n % 256}/0/0,"
+                          f"{UTCFromTimestamp(start)},{UTCFromTimestamp(start + 3600.)},task {n}\n")
+
+    def teardown(self, nrows):
+        os.remove(self.filename)
+
+    def time_parse_lines(self, nrows):
+        # former way : one line at a time
+        with open(self.filename, 'r') as fid:
+            [parse_timeline_line(line) for line in fid]
+
+    def time_load_timeline(self, nrows):
+        load_timeline(self.filename)
+
+    def time_load_timeline_mmap(self, nrows):
+        load_timeline(self.filename, mmap=True)
+
+
+class TimelineViewerSuite:
+    params = [1000, 20000]
+    param_names = ['nrows']
+
+    def setup(self, nrows):
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        LoadTimelineSuite.setup(self, nrows)
+        self.fig, self.ax = plt.subplots()
+
+    def teardown(self, nrows):
+        import matplotlib.pyplot as plt
+
+        plt.close(self.fig)
+        LoadTimelineSuite.teardown(self, nrows)
+
+    def time_first_update(self, nrows):
+        # read the whole file, draw the segments and the visible titles
+        viewer = TimelineViewer(self.ax, TimelineReader(self.filename))
+        viewer.update()
+        viewer.clear()
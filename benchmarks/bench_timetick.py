@@ -0,0 +1,43 @@
+"""
+benchmarks for tempoo.timetick
+"""
+import matplotlib
+matplotlib.use('Agg')
+from tempoo.utc import UTC, UTCFromTimestamp
+from tempoo.timetick import CalendarTimeFormatter, TimeLocator
+
+
+class CalendarTimeFormatterSuite:
+    """the dynamic ticker is formatted on every mouse move"""
+
+    def setup(self):
+        self.formatter = CalendarTimeFormatter()
+        self.formatter.format_ticks([
+            UTC(2016, 3, 5, 12).timestamp,
+            UTC(2016, 3, 5, 13).timestamp])
+        self.timevalue = UTC(2016, 3, 5, 12, 30, 15, 123456).timestamp
+
+    def time_call(self):
+        self.formatter(self.timevalue)
+
+    def time_call_reference(self):
+        # former implementation, for comparison
+        ans = str(UTCFromTimestamp(self.timevalue))
+        ans.split(self.formatter.offset_string)[-1]
+
+
+class TimeLocatorSuite:
+    # width of the view for each zoom level, in seconds
+    params = ['decades', 'years', 'months', 'days', 'hours', 'minutes', 'seconds', 'milliseconds', 'microseconds']
+    durations = {
+        'decades': 50 * 365.25 * 86400., 'years': 3 * 365.25 * 86400., 'months': 120 * 86400.,
+        'days': 5 * 86400., 'hours': 5 * 3600., 'minutes': 5 * 60., 'seconds': 5.,
+        'milliseconds': 5e-3, 'microseconds': 5e-6}
+
+    def setup(self, zoom):
+        self.locator = TimeLocator(maxticks=10)
+        self.vmin = UTC(2016, 3, 5, 12, 30, 15, 123456).timestamp
+        self.vmax = self.vmin + self.durations[zoom]
+
+    def time_tick_values(self, zoom):
+        self.locator.tick_values(self.vmin, self.vmax)
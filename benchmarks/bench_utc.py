@@ -0,0 +1,211 @@
+"""
+benchmarks for tempoo.utc
+"""
+import datetime
+from tempoo.civil import timestamps2decimal_years, decimal_years2timestamps, add_months, add_days
+from tempoo.utc import UTC, UTCFromTimestamp, UTCFromStr, UTCFromJulday, UTCFromDecimalYear, \
+    years_between, months_between, days_between, hours_between, minutes_between, DAY, HOUR, \
+    str2timestamps, julday2timestamps, UTCArray, enable_utc_cache, disable_utc_cache, utc_cache_info
+
+
+class UTCConstructionSuite:
+
+    def setup(self):
+        self.utc = UTC(2016, 3, 5, 12, 30, 15, 123456)
+        self.timestamp = self.utc.timestamp
+        self.string = str(self.utc)
+
+    def time_utc(self):
+        UTC(2016, 3, 5, 12, 30, 15, 123456)
+
+    def time_utc_from_timestamp(self):
+        UTCFromTimestamp(self.timestamp)
+
+    def time_utc_from_str(self):
+        UTCFromStr(self.string)
+
+    def time_utc_from_julday(self):
+        UTCFromJulday(2016, 65, 12, 30, 15, 123456)
+
+
+class UTCArithmeticSuite:
+
+    def setup(self):
+        self.utc = UTC(2016, 3, 5, 12, 30, 15, 123456)
+        self.other = UTC(1970, 1, 2)
+        self.timedelta = datetime.timedelta(seconds=3600.5)
+
+    def time_add_float(self):
+        self.utc + 3600.5
+
+    def time_add_timedelta(self):
+        self.utc + self.timedelta
+
+    def time_add_utc(self):
+        self.utc + self.other
+
+    def time_sub_float(self):
+        self.utc - 3600.5
+
+    def time_sub_utc(self):
+        self.utc - self.other
+
+
+class UTCPropertiesSuite:
+    params = [
+        'timestamp', 'julday', 'weekday', 'decimal_year',
+        'flooryear', 'ceilyear', 'floormonth', 'ceilmonth',
+        'floorweek', 'ceilweek', 'floorday', 'ceilday',
+        'floorhour', 'ceilhour', 'floorminute', 'ceilminute']
+
+    def setup(self, name):
+        self.utc = UTC(2016, 3, 5, 12, 30, 15, 123456)
+
+    def time_property(self, name):
+        getattr(self.utc, name)
+
+
+class BetweenSuite:
+    # (function, time range) such that the output list holds a few hundred items
+    params = ['years', 'months', 'days', 'hours', 'minutes']
+    functions = {
+        'years': (years_between, 300 * 365.25 * DAY),
+        'months': (months_between, 30 * 365.25 * DAY),
+        'days': (days_between, 365 * DAY),
+        'hours': (hours_between, 15 * DAY),
+        'minutes': (minutes_between, 6 * HOUR)}
+
+    def setup(self, name):
+        function, duration = self.functions[name]
+        self.function = function
+        self.t1 = UTC(1900, 3, 5, 12, 30, 15, 123456) if name == 'years' else UTC(2016, 3, 5, 12, 30, 15, 123456)
+        self.t2 = self.t1 + duration
+
+    def time_between(self, name):
+        self.function(self.t1, self.t2)
+
+
+class StrParsingSuite:
+
+    def setup(self):
+        import numpy as np
+        timestamps = np.random.RandomState(0).uniform(0., 2e9, 10000)
+        self.strings = [str(UTCFromTimestamp(timestamp)) for timestamp in timestamps]
+
+    def time_utc_from_str_loop_10000(self):
+        [UTCFromStr(string).timestamp for string in self.strings]
+
+    def time_str2timestamps_10000(self):
+        str2timestamps(self.strings)
+
+
+class JuldaySuite:
+
+    def setup(self):
+        import numpy as np
+        rng = np.random.RandomState(0)
+        self.years = rng.randint(1970, 2100, 10000)
+        self.juldays = rng.randint(1, 366, 10000)
+        self.hours = rng.randint(0, 24, 10000)
+
+    def time_utc_from_julday_loop_10000(self):
+        [UTCFromJulday(year, julday, hour).timestamp
+         for year, julday, hour in zip(self.years.tolist(), self.juldays.tolist(), self.hours.tolist())]
+
+    def time_julday2timestamps_10000(self):
+        julday2timestamps(self.years, self.juldays, self.hours)
+
+
+class DecimalYearSuite:
+
+    def setup(self):
+        import numpy as np
+        self.timestamps = np.random.RandomState(0).uniform(0., 2e9, 10000)
+        self.utcs = [UTCFromTimestamp(timestamp) for timestamp in self.timestamps[:1000]]
+        self.decimal_years = timestamps2decimal_years(self.timestamps)
+
+    def time_decimal_year_1000(self):
+        [utc.decimal_year for utc in self.utcs]
+
+    def time_utc_from_decimal_year_1000(self):
+        [UTCFromDecimalYear(decimal_year) for decimal_year in self.decimal_years[:1000].tolist()]
+
+    def time_timestamps2decimal_years_10000(self):
+        timestamps2decimal_years(self.timestamps)
+
+    def time_decimal_years2timestamps_10000(self):
+        decimal_years2timestamps(self.decimal_years)
+
+
+class UTCArrayFieldsSuite:
+    params = ['year', 'julday', 'weekday', 'hour']
+    param_names = ['name']
+
+    def setup(self, name):
+        import numpy as np
+        self.array = UTCArray.from_timestamps(np.random.RandomState(0).uniform(0., 2e9, 100000))
+        self.utcs = self.array[:1000].tolist()
+
+    def time_utc_property_loop_1000(self, name):
+        # former way : one UTC at a time
+        [getattr(utc, name) for utc in self.utcs]
+
+    def time_utc_array_field_100000(self, name):
+        getattr(self.array, name)
+
+
+class UTCCacheSuite:
+    # ingest of the records of many channels : the same start times come back within a few hundred records,
+    # 10000 calls, about 2300 distinct times
+    params = [0, 256, 4096]
+    param_names = ['maxsize']  # 0 = no cache
+
+    def setup(self, maxsize):
+        import numpy as np
+        rng = np.random.RandomState(0)
+        starts = 1.6e9 + np.arange(10000) // 5 * 60. + rng.randint(0, 300, 10000) * 60.
+        self.timestamps = starts.tolist()
+        self.strings = [str(UTCFromTimestamp(t)) for t in self.timestamps]
+        if maxsize:
+            enable_utc_cache(maxsize)
+
+    def teardown(self, maxsize):
+        disable_utc_cache()
+
+    def time_from_timestamp_10000(self, maxsize):
+        for timestamp in self.timestamps:
+            UTCFromTimestamp(timestamp)
+
+    def time_from_str_10000(self, maxsize):
+        for string in self.strings:
+            UTCFromStr(string)
+
+    def track_hit_rate(self, maxsize):
+        if not maxsize:
+            return 0.
+        enable_utc_cache(maxsize)  # reset the statistics
+        self.time_from_timestamp_10000(maxsize)
+        return utc_cache_info().hit_rate
+
+
+class CalendarOffsetSuite:
+    # roll 100000 schedules forward by one month, per object or vectorized
+
+    def setup(self):
+        import numpy as np
+        self.timestamps = np.random.RandomState(0).uniform(0., 2e9, 100000)
+        self.microseconds = UTCArray.from_timestamps(self.timestamps).microseconds
+        self.utcs = [UTCFromTimestamp(t) for t in self.timestamps[:1000]]
+
+    def time_utc_add_months_1000(self):
+        for utc in self.utcs:
+            utc.add_months(1)
+
+    def time_add_months_timestamps_100000(self):
+        add_months(self.timestamps, 1)
+
+    def time_add_months_microseconds_100000(self):
+        add_months(self.microseconds, 1)
+
+    def time_add_days_timestamps_100000(self):
+        add_days(self.timestamps, 1)
@@ -0,0 +1,18 @@
+"""
+benchmarks for tempoo.windows
+"""
+from tempoo.utc import UTC
+from tempoo.windows import split_time_into_windows
+
+
+class SplitTimeIntoWindowsSuite:
+    params = [0, 1, 2, 3, 'auto']
+
+    def setup(self, winmode):
+        self.starttime = UTC(2017, 4, 18, 5, 17, 32, 189).timestamp
+        self.endtime = UTC(2017, 7, 12, 15, 2, 12, 8753).timestamp
+
+    def time_split_time_into_windows(self, winmode):
+        split_time_into_windows(
+            self.starttime, self.endtime,
+            winlen=3600., winstep=900., winmode=winmode, verbose=False)
@@ -1,3 +1,42 @@
+import sys
+import types
 from tempoo.version import __version__
-from tempoo.utc import UTC, UTCFromTimestamp, UTCFromStr
-from tempoo.timetick import timetick, millitimetick, microtimetick
+from tempoo.utc import UTC, UTCFromTimestamp, UTCFromStr, UTCArray, \
+    enable_utc_cache, disable_utc_cache, utc_cache_info
+from tempoo.instant import Instant
+
+# the plotting tools need matplotlib, which is slow to import
+# => resolved on first use only, so that "import tempoo" stays cheap
+_LAZY_NAMES = {
+    "timetick": "tempoo.timetick",
+    "millitimetick": "tempoo.timetick",
+    "microtimetick": "tempoo.timetick",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # next accesses do not go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_NAMES))
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name: str, value):
+        # importing the submodule tempoo.timetick binds it to the package attribute timetick,
+        # keep the function of the same name instead (like an eager "from tempoo.timetick import timetick")
+        if isinstance(value, types.ModuleType) and value.__name__ == _LAZY_NAMES.get(name):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
@@ -0,0 +1,187 @@
+from typing import Union, NamedTuple, Iterable
+import numpy as np
+from tempoo.civil import MICROSECONDS_PER_SECOND, MICROSECONDS_PER_MINUTE, MICROSECONDS_PER_HOUR, \
+    MICROSECONDS_PER_DAY, timestamps2microseconds, microseconds2timestamps, days_from_civil, calendar_from_days
+
+"""
+aggregation of time arrays into calendar bins (UTC), e.g. number of events per day or per month
+the bins follow the floor semantics of UTC.floorminute, floorhour, floorday, floorweek (mondays),
+floormonth and flooryear : a time belongs to the bin [floor(time), ceil(time)[
+the times are float timestamps or int64 microseconds since 1970-01-01, the kind of the input is preserved
+"""
+
+CALENDAR_BIN_UNITS = ['second', 'minute', 'hour', 'day', 'week', 'month', 'year']
+_FIXED_UNITS = {
+    'second': MICROSECONDS_PER_SECOND,
+    'minute': MICROSECONDS_PER_MINUTE,
+    'hour': MICROSECONDS_PER_HOUR,
+    'day': MICROSECONDS_PER_DAY}
+
+
+def _check_unit(unit: str):
+    if unit not in CALENDAR_BIN_UNITS:
+        raise ValueError(f'unit must be one of {CALENDAR_BIN_UNITS}, got {unit}')
+
+
+def _is_microseconds(times: np.ndarray) -> bool:
+    return times.dtype.kind in 'iu'
+
+
+def calendar_bin_ids(times, unit: str) -> np.ndarray:
+    """
+    integer index of the calendar bin of each time,
+    consecutive bins have consecutive indices (e.g. year * 12 + month - 1 for the months)
+    """
+    _check_unit(unit)
+    times = np.asarray(times)
+    microseconds = times.astype(np.int64, copy=False) if _is_microseconds(times) else timestamps2microseconds(times)
+
+    if unit in _FIXED_UNITS:
+        return microseconds // _FIXED_UNITS[unit]
+
+    days = microseconds // MICROSECONDS_PER_DAY
+    if unit == 'week':
+        # 1970-01-01 was a thursday, the weeks start on mondays
+        return (days + 3) // 7
+    elif unit == 'month':
+        year, month = calendar_from_days(days, names=('year', 'month'))
+        return year.astype(np.int64) * 12 + month - 1
+    return calendar_from_days(days, names=('year',))[0].astype(np.int64)
+
+
+def calendar_bin_starts(ids, unit: str) -> np.ndarray:
+    """inverse of calendar_bin_ids, start of the bins in integer microseconds"""
+    _check_unit(unit)
+    ids = np.asarray(ids, np.int64)
+    if unit in _FIXED_UNITS:
+        return ids * _FIXED_UNITS[unit]
+    elif unit == 'week':
+        return (ids * 7 - 3) * MICROSECONDS_PER_DAY
+    elif unit == 'month':
+        return days_from_civil(ids // 12, ids % 12 + 1, 1) * MICROSECONDS_PER_DAY
+    return days_from_civil(ids, 1, 1) * MICROSECONDS_PER_DAY
+
+
+def calendar_floor(times, unit: str) -> np.ndarray:
+    """vectorized UTC.floorday, floormonth, ..., the kind of the input (timestamps, microseconds) is preserved"""
+    times = np.asarray(times)
+    microseconds = calendar_bin_starts(calendar_bin_ids(times, unit), unit)
+    return microseconds if _is_microseconds(times) else microseconds2timestamps(microseconds)
+
+
+class CalendarBins(NamedTuple):
+    unit: str
+    edges: np.ndarray  # nbins + 1 bounds, timestamps or microseconds like the input times
+    counts: np.ndarray  # number of times per bin, int64
+    sums: Union[None, np.ndarray]  # sum of the values per bin, None if no values were provided
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.edges[:-1]
+
+    @property
+    def means(self) -> np.ndarray:
+        """mean of the values per bin, nan for the empty bins"""
+        if self.sums is None:
+            raise ValueError('no values were aggregated')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts > 0, self.sums / self.counts, np.nan)
+
+
+class CalendarBinAggregator(object):
+    """
+    streaming version of calendar_bins : the times (and values) are added chunk by chunk,
+    in any order, the memory used is proportional to the number of bins between the first and the last time
+    """
+
+    def __init__(self, unit: str):
+        _check_unit(unit)
+        self.unit = unit
+        self.first_id = None
+        self.counts = np.zeros(0, np.int64)
+        self.sums = None
+        self.microseconds = None  # kind of the times, set by the first chunk
+        self.with_values = None
+
+    def _extend(self, first_id: int, last_id: int):
+        if self.first_id is None:
+            self.first_id = first_id
+        before = max(self.first_id - first_id, 0)
+        after = max(last_id - (self.first_id + len(self.counts) - 1), 0)
+        if before or after:
+            self.counts = np.pad(self.counts, (before, after))
+            if self.sums is not None:
+                self.sums = np.pad(self.sums, (before, after))
+            self.first_id -= before
+
+    def add(self, times, values=None):
+        """
+        :param times: timestamps or microseconds, same kind for all the chunks
+        :param values: optional values to sum per bin, same length as times
+        """
+        times = np.asarray(times)
+        # check everything before modifying the state, a failed add leaves the aggregator unchanged
+        if self.microseconds is not None and self.microseconds != _is_microseconds(times):
+            raise TypeError('all the chunks must be timestamps (float) or microseconds (int)')
+        if self.with_values is not None and self.with_values != (values is not None):
+            raise ValueError('values must be provided for all the chunks or for none')
+        if values is not None:
+            values = np.asarray(values, float).ravel()
+            if len(values) != times.size:
+                raise ValueError('times and values must have the same length')
+        ids = calendar_bin_ids(times.ravel(), self.unit)
+
+        if self.microseconds is None:
+            self.microseconds = _is_microseconds(times)
+            self.with_values = values is not None
+            if self.with_values:
+                self.sums = np.zeros(0, float)
+        if not times.size:
+            return
+
+        self._extend(int(ids.min()), int(ids.max()))
+        ids -= self.first_id
+        self.counts += np.bincount(ids, minlength=len(self.counts))
+        if self.with_values:
+            self.sums += np.bincount(ids, weights=values, minlength=len(self.sums))
+
+    def result(self) -> CalendarBins:
+        if self.first_id is None:
+            edges = np.zeros(0, np.int64)
+        else:
+            edges = calendar_bin_starts(
+                np.arange(self.first_id, self.first_id + len(self.counts) + 1), self.unit)
+        if not self.microseconds:
+            edges = microseconds2timestamps(edges)
+        sums = None if self.sums is None else self.sums.copy()
+        return CalendarBins(self.unit, edges, self.counts.copy(), sums)
+
+
+def calendar_bins(times, unit: str, values=None, chunk_size: Union[None, int] = None) -> CalendarBins:
+    """
+    count (and sum the values of) the times per calendar bin, e.g. events per day
+    the bins are contiguous from the bin of the first time to the bin of the last time, empty bins included
+    :param times: float timestamps or int64 microseconds, any order, may be a np.memmap
+    :param unit: one of CALENDAR_BIN_UNITS
+    :param values: optional values to sum per bin (see also CalendarBins.means)
+    :param chunk_size: process the times by chunks of this length, to bound the memory used for large inputs
+    :return bins: CalendarBins(unit, edges, counts, sums)
+    """
+    aggregator = CalendarBinAggregator(unit)
+    for start, stop in _chunks(len(times), chunk_size):
+        aggregator.add(times[start:stop], None if values is None else values[start:stop])
+    return aggregator.result()
+
+
+def _chunks(n: int, chunk_size: Union[None, int]) -> Iterable:
+    if chunk_size is None or chunk_size >= n:
+        return [(0, n)]
+    return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+
+if __name__ == '__main__':
+    timestamps = np.random.uniform(1.7e9, 1.8e9, 1000000)
+    bins = calendar_bins(timestamps, 'month')
+    from tempoo.utc import UTCFromTimestamp
+    for start, count in zip(bins.starts, bins.counts):
+        print(UTCFromTimestamp(start), count)
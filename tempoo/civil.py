@@ -0,0 +1,314 @@
+from typing import Union
+from functools import lru_cache
+import datetime
+import numpy as np
+
+"""
+vectorized calendar arithmetic on integers (proleptic gregorian calendar, no leap seconds)
+days are counted from 1970-01-01, times are stored in integer microseconds since 1970-01-01
+source : http://howardhinnant.github.io/date_algorithms.html
+"""
+
+MICROSECONDS_PER_SECOND = 1000000
+MICROSECONDS_PER_MINUTE = 60 * MICROSECONDS_PER_SECOND
+MICROSECONDS_PER_HOUR = 60 * MICROSECONDS_PER_MINUTE
+MICROSECONDS_PER_DAY = 24 * MICROSECONDS_PER_HOUR
+
+
+def days_from_civil(year, month, day) -> np.ndarray:
+    """number of days since 1970-01-01 for arrays of year, month (1-12), day (1-31)"""
+    year = np.asarray(year, np.int64)
+    month = np.asarray(month, np.int64)
+    day = np.asarray(day, np.int64)
+
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400  # [0, 399]
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1  # [0, 365], from march 1st
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year  # [0, 146096]
+    return era * 146097 + day_of_era - 719468
+
+
+def civil_from_days(days) -> (np.ndarray, np.ndarray, np.ndarray):
+    """inverse of days_from_civil, returns year, month (1-12), day (1-31)"""
+    days = np.asarray(days, np.int64) + 719468
+    era = days // 146097
+    day_of_era = days - era * 146097  # [0, 146096]
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365  # [0, 399]
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)  # [0, 365]
+    mp = (5 * day_of_year + 2) // 153  # [0, 11], from march
+    day = day_of_year - (153 * mp + 2) // 5 + 1
+    month = mp + np.where(mp < 10, 3, -9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def is_leap_year(year) -> np.ndarray:
+    year = np.asarray(year, np.int64)
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+
+def days_in_month(year, month) -> np.ndarray:
+    month = np.asarray(month, np.int64)
+    ndays = np.asarray([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], np.int64)[month]
+    return ndays + ((month == 2) & is_leap_year(year))
+
+
+def weekday_from_days(days) -> np.ndarray:
+    """0 = Monday, 1970-01-01 was a Thursday"""
+    return (np.asarray(days, np.int64) + 3) % 7
+
+
+def julday_from_civil(year, month, day) -> np.ndarray:
+    """day of year, 1 = January 1st"""
+    return days_from_civil(year, month, day) - days_from_civil(year, 1, 1) + 1
+
+
+def timestamps2microseconds(timestamps: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    convert timestamps (float seconds) to integer microseconds
+    the rounding is the same as in datetime.datetime.fromtimestamp (half even, on the fractional part)
+    """
+    timestamps = np.asarray(timestamps, float)
+    integer_part = np.trunc(timestamps)
+    fractional_part = np.round((timestamps - integer_part) * 1e6)
+    return integer_part.astype(np.int64) * MICROSECONDS_PER_SECOND + fractional_part.astype(np.int64)
+
+
+def microseconds2timestamps(microseconds: Union[int, np.ndarray]) -> np.ndarray:
+    """convert integer microseconds to timestamps (float seconds), like datetime.datetime.timestamp"""
+    return np.asarray(microseconds, np.int64) / 1e6
+
+
+def microseconds2fields(microseconds) -> tuple:
+    """
+    split integer microseconds since 1970-01-01
+    into year, month, day, hour, minute, second, microsecond arrays
+    """
+    days, microseconds = np.divmod(np.asarray(microseconds, np.int64), MICROSECONDS_PER_DAY)
+    hour, microseconds = np.divmod(microseconds, MICROSECONDS_PER_HOUR)
+    minute, microseconds = np.divmod(microseconds, MICROSECONDS_PER_MINUTE)
+    second, microsecond = np.divmod(microseconds, MICROSECONDS_PER_SECOND)
+    year, month, day = civil_from_days(days)
+    return year, month, day, hour, minute, second, microsecond
+
+
+def fields2microseconds(year, month, day, hour=0, minute=0, second=0, microsecond=0) -> np.ndarray:
+    """inverse of microseconds2fields, no validation of the fields"""
+    return days_from_civil(year, month, day) * MICROSECONDS_PER_DAY \
+        + np.asarray(hour, np.int64) * MICROSECONDS_PER_HOUR \
+        + np.asarray(minute, np.int64) * MICROSECONDS_PER_MINUTE \
+        + np.asarray(second, np.int64) * MICROSECONDS_PER_SECOND \
+        + np.asarray(microsecond, np.int64)
+
+
+def microseconds2decimal_years(microseconds) -> np.ndarray:
+    """
+    decimal years, e.g. 2024.5 = 2024-07-02T00:00:00Z (middle of a leap year)
+    computed from integers : a single rounding for the fraction of year, a second one when adding the year
+    the float64 resolution is 2 ** -42 years for the years 1024-2047, i.e. about 7 microseconds
+    """
+    microseconds = np.asarray(microseconds, np.int64)
+    year = civil_from_days(microseconds // MICROSECONDS_PER_DAY)[0]
+    year_start = days_from_civil(year, 1, 1) * MICROSECONDS_PER_DAY
+    year_length = (365 + is_leap_year(year)) * MICROSECONDS_PER_DAY
+    return year + (microseconds - year_start) / year_length
+
+
+def decimal_years2microseconds(decimal_years) -> np.ndarray:
+    """
+    inverse of microseconds2decimal_years
+    the round trip error is bounded by half the float64 resolution of the decimal years (+ 0.5 microsecond),
+    i.e. 4 microseconds for the years 1024-2047, 8 microseconds for 2048-4095
+    """
+    decimal_years = np.asarray(decimal_years, float)
+    year = np.floor(decimal_years)
+    fraction = decimal_years - year  # exact
+    year = year.astype(np.int64)
+    year_start = days_from_civil(year, 1, 1) * MICROSECONDS_PER_DAY
+    year_length = (365 + is_leap_year(year)) * MICROSECONDS_PER_DAY
+    return year_start + np.round(fraction * year_length).astype(np.int64)
+
+
+# ======== calendar offsets
+# rules when the day does not exist in the target month (e.g. january 31st + 1 month) :
+#     clip     : last day of the target month (february 28th or 29th)
+#     overflow : the extra days spill over the next month (march 3rd or 2nd)
+#     raise    : ValueError
+END_OF_MONTH_RULES = ('clip', 'overflow', 'raise')
+
+
+def _check_end_of_month(end_of_month: str):
+    if end_of_month not in END_OF_MONTH_RULES:
+        raise ValueError(f'end_of_month must be one of {END_OF_MONTH_RULES}, got {end_of_month}')
+
+
+def _times2microseconds(times: np.ndarray) -> np.ndarray:
+    # integer inputs are microseconds, float inputs are timestamps
+    if times.dtype.kind in 'iu':
+        return times.astype(np.int64, copy=False)
+    return timestamps2microseconds(times)
+
+
+def _microseconds2times(microseconds: np.ndarray, times: np.ndarray) -> np.ndarray:
+    # back to the kind of times (microseconds or timestamps)
+    if times.dtype.kind in 'iu':
+        return microseconds
+    return microseconds2timestamps(microseconds)
+
+
+def add_months_to_date(year: int, month: int, day: int, months: int, end_of_month: str = 'clip') -> (int, int, int):
+    """scalar version of add_months on python ints, returns year, month, day"""
+    _check_end_of_month(end_of_month)
+    year, month = divmod(year * 12 + month - 1 + months, 12)
+    month += 1
+    ndays = 29 if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) \
+        else (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)[month]
+    if day <= ndays:
+        return year, month, day
+    if end_of_month == 'clip':
+        return year, month, ndays
+    if end_of_month == 'overflow':
+        return (year, month + 1, day - ndays) if month < 12 else (year + 1, 1, day - ndays)
+    raise ValueError(f'day {day} does not exist in {year:04d}-{month:02d}')
+
+
+def add_months(times, months, end_of_month: str = 'clip') -> np.ndarray:
+    """
+    add calendar months, the time of day is preserved
+    :param times: float timestamps or integer microseconds since 1970-01-01, the dtype is preserved
+    :param months: number of months, integer or integer array (broadcast with times), may be negative
+    :param end_of_month: clip, overflow or raise, see END_OF_MONTH_RULES
+    """
+    _check_end_of_month(end_of_month)
+    times = np.asarray(times)
+    days, time_of_day = np.divmod(_times2microseconds(times), MICROSECONDS_PER_DAY)
+    year, month, day = civil_from_days(days)
+
+    total = year * 12 + month - 1 + np.asarray(months, np.int64)
+    year, month = total // 12, total % 12 + 1
+    ndays = days_in_month(year, month)
+    if end_of_month == 'clip':
+        day = np.minimum(day, ndays)
+    elif end_of_month == 'raise' and (day > ndays).any():
+        day, year, month, ndays = np.broadcast_arrays(day, year, month, ndays)
+        n = np.flatnonzero(day > ndays)[0]
+        raise ValueError(
+            f'day {day.flat[n]} does not exist in {year.flat[n]:04d}-{month.flat[n]:02d}, at index {n}')
+    # overflow : days_from_civil accepts days beyond the end of the month
+    microseconds = (days_from_civil(year, month, 1) + day - 1) * MICROSECONDS_PER_DAY + time_of_day
+    return _microseconds2times(microseconds, times)
+
+
+def add_years(times, years, end_of_month: str = 'clip') -> np.ndarray:
+    """add calendar years, see add_months, end_of_month applies to february 29th"""
+    return add_months(times, np.asarray(years, np.int64) * 12, end_of_month=end_of_month)
+
+
+def add_days(times, days) -> np.ndarray:
+    """add days of 86400 seconds, see add_months"""
+    times = np.asarray(times)
+    microseconds = _times2microseconds(times) + np.asarray(days, np.int64) * MICROSECONDS_PER_DAY
+    return _microseconds2times(microseconds, times)
+
+
+def add_weeks(times, weeks) -> np.ndarray:
+    """add weeks of 7 days, see add_months"""
+    return add_days(times, np.asarray(weeks, np.int64) * 7)
+
+
+def timestamps2decimal_years(timestamps) -> np.ndarray:
+    return microseconds2decimal_years(timestamps2microseconds(timestamps))
+
+
+def decimal_years2timestamps(decimal_years) -> np.ndarray:
+    return microseconds2timestamps(decimal_years2microseconds(decimal_years))
+
+
+# ======== lookup table : day number => calendar fields
+CALENDAR_TABLE_YEARS = (1900, 2200)  # first and last years in the table
+CALENDAR_FIELDS = ('year', 'month', 'day', 'julday', 'weekday')
+
+
+class CalendarTable(object):
+    """
+    calendar fields of all the days of a range of years, 7 bytes per day (~0.8 MB for 1900-2200)
+    the index in the arrays is the number of days since 1970-01-01 minus first_day
+    """
+
+    def __init__(self, first_year: int, last_year: int):
+        self.first_day = int(days_from_civil(first_year, 1, 1))
+        self.ndays = int(days_from_civil(last_year + 1, 1, 1)) - self.first_day
+
+        days = np.arange(self.first_day, self.first_day + self.ndays)
+        year, month, day = civil_from_days(days)
+        self.year = year.astype(np.int16)
+        self.month = month.astype(np.uint8)
+        self.day = day.astype(np.uint8)
+        self.julday = (days - days_from_civil(year, 1, 1) + 1).astype(np.uint16)
+        self.weekday = weekday_from_days(days).astype(np.uint8)
+
+        # indexing a memoryview returns a python int, much faster than a numpy scalar
+        self.year_view = memoryview(self.year)
+        self.month_view = memoryview(self.month)
+        self.day_view = memoryview(self.day)
+        self.julday_view = memoryview(self.julday)
+        self.weekday_view = memoryview(self.weekday)
+
+
+@lru_cache(maxsize=1)
+def calendar_table() -> CalendarTable:
+    """the calendar table of CALENDAR_TABLE_YEARS, built on first use and shared"""
+    return CalendarTable(*CALENDAR_TABLE_YEARS)
+
+
+def calendar_from_days(days, names: tuple = CALENDAR_FIELDS) -> tuple:
+    """
+    year, month, day, julday, weekday (0 = monday) of arrays of days since 1970-01-01
+    table lookup for the years of CALENDAR_TABLE_YEARS, arithmetic outside
+    :param names: the fields to return, among CALENDAR_FIELDS
+    :return fields: int64 arrays, whatever the days (the table is compact, the results are not :
+        unsigned fields would wrap in arithmetic, e.g. weekday - 1)
+    """
+    table = calendar_table()
+    days = np.asarray(days, np.int64)
+    index = days - table.first_day
+    inside = (index >= 0) & (index < table.ndays)
+    if inside.all():
+        return tuple(getattr(table, name)[index].astype(np.int64) for name in names)
+
+    outside = days[~inside]
+    year, month, day = civil_from_days(outside)
+    arithmetic = {
+        'year': year, 'month': month, 'day': day,
+        'julday': outside - days_from_civil(year, 1, 1) + 1,
+        'weekday': weekday_from_days(outside)}
+
+    fields = []
+    for name in names:
+        field = np.empty(days.shape, np.int64)
+        field[inside] = getattr(table, name)[index[inside]]
+        field[~inside] = arithmetic[name]
+        fields.append(field)
+    return tuple(fields)
+
+
+def julday_from_day(day: int) -> int:
+    """scalar julday (1 = january 1st) of a day number since 1970-01-01"""
+    table = calendar_table()
+    index = day - table.first_day
+    if 0 <= index < table.ndays:
+        return table.julday_view[index]
+    year = int(civil_from_days(day)[0])
+    return day - int(days_from_civil(year, 1, 1)) + 1
+
+
+def calendar_from_day(day: int) -> tuple:
+    """scalar version of calendar_from_days, returns python ints year, month, day, julday, weekday"""
+    table = calendar_table()
+    index = day - table.first_day
+    if 0 <= index < table.ndays:
+        return (table.year_view[index], table.month_view[index], table.day_view[index],
+                table.julday_view[index], table.weekday_view[index])
+    date = datetime.date.fromordinal(day + 719163)
+    return date.year, date.month, date.day, date.timetuple().tm_yday, date.weekday()
@@ -1,32 +1,114 @@
 #!/usr/bin/env python
-import datetime
-from tempoo.utc import UTC, UTCFromTimestamp, DAY
+import argparse
+import io
 import sys
+import numpy as np
+from tempoo.civil import days_from_civil, civil_from_days, weekday_from_days
 
 
 help_message = """daysofyear (doy) : list days in a year, use grep
     argument 1 : year
+    argument 2 : last year (optional), to list all the days from year to last year
+    --format text (default), csv or npy
+    -o output file (default stdout)
 """
 
-def main():
-    day_delta = datetime.timedelta(seconds=DAY)
-    weekdays = "mon.tue.wed.thu.fri.sat.sun".split('.')
-    months = "jan.feb.mar.apr.may.jun.jul.aug.sep.oct.nov.dec".split('.')
-    yr = int(sys.argv[1])
-    t = UTC(year=yr, month=1, day=1)
+WEEKDAYS = "mon.tue.wed.thu.fri.sat.sun".split('.')
+MONTHS = "jan.feb.mar.apr.may.jun.jul.aug.sep.oct.nov.dec".split('.')
+DOY_DTYPE = np.dtype([
+    ('year', np.int32), ('julday', np.int16), ('weekday', np.int8),
+    ('day', np.int8), ('month', np.int8), ('timestamp', np.int64)])
 
-    while t.year == yr:
-        wd = weekdays[t.weekday]
-        month = months[t.month - 1]
 
-        # print("%04.0f %03.0f   %s  %02.0f %s %.0f" % (t.year, t.julday, wd, t.day, month, t.timestamp))
-        print(f"{t.year:04d} {t.julday:03d} {wd:s} {t.day:} {month:s} {t.timestamp:.0f}")
+def doy_table(year: int, last_year: int = None) -> np.ndarray:
+    """
+    calendar table of all the days of one or several years
+    :param year: first year
+    :param last_year: last year included, default year
+    :return table: structured array with fields year, julday, weekday (0 = monday),
+        day, month (1-12), timestamp (of 00:00 UTC, integer seconds)
+    """
+    if last_year is None:
+        last_year = year
+    if last_year < year:
+        raise ValueError('last_year must be greater or equal to year')
 
-        t + datetime.timedelta(seconds=24 * 3600.)
-        (t + datetime.timedelta(seconds=24 * 3600.)).timestamp
-        t + 24 * 3600.
-        t = UTCFromTimestamp((t + datetime.timedelta(seconds=24 * 3600.)).timestamp)
+    first_day = days_from_civil(year, 1, 1)
+    days = np.arange(first_day, days_from_civil(last_year + 1, 1, 1))
+    years, months, monthdays = civil_from_days(days)
 
+    # julday = days since january 1st of the same year
+    year_starts = days_from_civil(np.arange(year, last_year + 1), 1, 1)
+    table = np.empty(len(days), DOY_DTYPE)
+    table['year'] = years
+    table['julday'] = days - year_starts[years - year] + 1
+    table['weekday'] = weekday_from_days(days)
+    table['day'] = monthdays
+    table['month'] = months
+    table['timestamp'] = days * 86400
+    return table
 
-if __name__ == "__main__":        
+
+def format_doy_text(table: np.ndarray) -> str:
+    """one line per day : year julday weekday day month timestamp"""
+    return "".join([
+        f"{year:04d} {julday:03d} {WEEKDAYS[weekday]:s} {day:} {MONTHS[month - 1]:s} {timestamp:.0f}\n"
+        for year, julday, weekday, day, month, timestamp in table.tolist()])
+
+
+def format_doy_csv(table: np.ndarray) -> str:
+    """same content as format_doy_text with a header, comma separated"""
+    return "year,julday,weekday,day,month,timestamp\n" + "".join([
+        f"{year:04d},{julday:03d},{WEEKDAYS[weekday]:s},{day:},{MONTHS[month - 1]:s},{timestamp:d}\n"
+        for year, julday, weekday, day, month, timestamp in table.tolist()])
+
+
+def write_doy(table: np.ndarray, fid, format: str = "text"):
+    """
+    write the calendar table in one buffered write
+    :param table: output of doy_table
+    :param fid: binary file object
+    :param format: text, csv or npy
+    """
+    if format == "text":
+        data = format_doy_text(table).encode()
+    elif format == "csv":
+        data = format_doy_csv(table).encode()
+    elif format == "npy":
+        buffer = io.BytesIO()
+        np.save(buffer, table)
+        data = buffer.getvalue()
+    else:
+        raise ValueError(f'unknown format {format}')
+    fid.write(data)
+    fid.flush()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        prog="doy", description=help_message,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('year', type=int)
+    parser.add_argument('last_year', type=int, nargs='?', default=None)
+    parser.add_argument('--format', choices=['text', 'csv', 'npy'], default='text')
+    parser.add_argument('-o', dest='output', default=None, help='output file')
+    args = parser.parse_args(argv)
+
+    try:
+        table = doy_table(args.year, args.last_year)
+    except ValueError as err:
+        parser.error(str(err))
+
+    if args.output is None:
+        try:
+            write_doy(table, sys.stdout.buffer, format=args.format)
+        except BrokenPipeError:
+            # e.g. doy 2024 | head
+            sys.stderr.close()
+    else:
+        with open(args.output, 'wb') as fid:
+            write_doy(table, fid, format=args.format)
+
+
+if __name__ == "__main__":
     main()
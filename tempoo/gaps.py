@@ -0,0 +1,199 @@
+from typing import Union, NamedTuple
+import numpy as np
+from tempoo.intervals import merge_intervals
+from tempoo.windows import split_time_into_windows
+
+"""
+gaps and overlaps between consecutive records of a continuous stream (e.g. waveform archives)
+a record covers [start, end[, with end = start + npts * dt for sampled data :
+two records are contiguous when the next one starts at the end of the previous one
+the times are float timestamps (or int64 microseconds), one pass over the records sorted by start
+"""
+
+
+def record_ends(starts: np.ndarray, npts: np.ndarray, dt: Union[float, np.ndarray]) -> np.ndarray:
+    """end of the records, i.e. the time of the sample that would follow the last one"""
+    return np.asarray(starts) + np.asarray(npts) * np.asarray(dt)
+
+
+class GapsAndOverlaps(NamedTuple):
+    gap_starts: np.ndarray  # end of the data before the gap
+    gap_ends: np.ndarray  # start of the record after the gap
+    gap_records: np.ndarray  # index of the record after the gap
+    overlap_starts: np.ndarray  # start of the record overlapping the previous data
+    overlap_ends: np.ndarray  # end of the overlapping part
+    overlap_records: np.ndarray  # index of the overlapping record
+
+    @property
+    def gap_durations(self) -> np.ndarray:
+        return self.gap_ends - self.gap_starts
+
+    @property
+    def overlap_durations(self) -> np.ndarray:
+        return self.overlap_ends - self.overlap_starts
+
+
+def _cumulated_coverage(piece_starts: np.ndarray, piece_ends: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    duration covered by sorted disjoint pieces before each time
+    """
+    lengths = piece_ends - piece_starts
+    cumulated = np.concatenate(([0], np.cumsum(lengths)))
+    k = np.searchsorted(piece_starts, times, side="right") - 1
+    inside = np.clip(times - piece_starts[np.maximum(k, 0)], 0, lengths[np.maximum(k, 0)])
+    return np.where(k >= 0, cumulated[np.maximum(k, 0)] + inside, 0)
+
+
+class GapDetector(object):
+    """
+    streaming gap and overlap detection, the records are added chunk by chunk, sorted by start
+    the state is the running maximum of the record ends (plus the coverage per window if windows are given)
+    => constant memory, O(n) for n records, a chunk only updates the coverage of the windows it overlaps
+    """
+
+    def __init__(self, tolerance: float = 0.,
+                 window_starts: Union[None, np.ndarray] = None,
+                 window_ends: Union[None, np.ndarray] = None):
+        """
+        :param tolerance: gaps and overlaps shorter or equal to tolerance are ignored (e.g. half a sample)
+        :param window_starts, window_ends: windows where to measure the coverage, see coverage
+        """
+        self.tolerance = tolerance
+        self.nrecords = 0
+        self.max_end = None
+        self.last_start = None
+        if (window_starts is None) != (window_ends is None):
+            raise ValueError('window_starts and window_ends must be given together')
+        self.window_starts = None if window_starts is None else np.asarray(window_starts)
+        self.window_ends = None if window_ends is None else np.asarray(window_ends)
+        self.covered = None if window_starts is None else np.zeros(len(self.window_starts), float)
+        if self.covered is not None:
+            # windows sorted by start, the running maximum of their ends bounds the windows
+            # overlapping a chunk of records from below
+            self.window_order = np.argsort(self.window_starts, kind="stable")
+            self.sorted_window_starts = self.window_starts[self.window_order]
+            self.sorted_window_ends = self.window_ends[self.window_order]
+            self.max_window_ends = np.maximum.accumulate(self.sorted_window_ends) \
+                if len(self.window_order) else self.sorted_window_ends
+
+    def add(self, starts: np.ndarray, ends: np.ndarray) -> GapsAndOverlaps:
+        """
+        :param starts, ends: bounds of the next records, sorted by start, after the records already added
+        :return gaps_and_overlaps: found in this chunk (including between the previous chunk and this one),
+            the record indices count the records of all the chunks
+        """
+        starts = np.asarray(starts)
+        ends = np.asarray(ends)
+        if starts.shape != ends.shape or starts.ndim != 1:
+            raise ValueError('starts and ends must be 1d arrays with the same length')
+        if not (starts <= ends).all():
+            raise ValueError('starts must be lower or equal to ends')
+        if (starts[1:] < starts[:-1]).any() or \
+                (len(starts) and self.last_start is not None and starts[0] < self.last_start):
+            raise ValueError('the records must be sorted by start')
+
+        if not len(starts):
+            empty = starts[:0]
+            return GapsAndOverlaps(empty, empty, np.zeros(0, np.int64), empty, empty, np.zeros(0, np.int64))
+
+        # end of the data before each record
+        first = starts[:1] if self.max_end is None else np.asarray([self.max_end], starts.dtype)
+        before = np.maximum.accumulate(np.concatenate((first, ends[:-1])))
+
+        records = np.arange(self.nrecords, self.nrecords + len(starts))
+        gaps = starts - before > self.tolerance
+        overlaps = before - starts > self.tolerance
+        result = GapsAndOverlaps(
+            before[gaps], starts[gaps], records[gaps],
+            starts[overlaps], np.minimum(before, ends)[overlaps], records[overlaps])
+
+        if self.covered is not None:
+            # the parts of the records not covered yet : sorted and disjoint
+            piece_starts = np.maximum(starts, before)
+            keep = ends > piece_starts
+            piece_starts, piece_ends = piece_starts[keep], ends[keep]
+            if len(piece_starts):
+                # only the windows overlapping [piece_starts[0], piece_ends[-1]]
+                first = np.searchsorted(self.max_window_ends, piece_starts[0], side="right")
+                last = np.searchsorted(self.sorted_window_starts, piece_ends[-1], side="left")
+                if first < last:
+                    windows = self.window_order[first:last]
+                    self.covered[windows] += \
+                        _cumulated_coverage(piece_starts, piece_ends, self.sorted_window_ends[first:last]) - \
+                        _cumulated_coverage(piece_starts, piece_ends, self.sorted_window_starts[first:last])
+
+        self.nrecords += len(starts)
+        self.max_end = max(before[-1], ends[-1])  # before includes the previous max_end
+        self.last_start = starts[-1]
+        return result
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """percentage of each window covered by the records added so far"""
+        if self.covered is None:
+            raise ValueError('no windows were given')
+        return 100. * self.covered / (self.window_ends - self.window_starts)
+
+
+def detect_gaps(starts: np.ndarray, ends: Union[None, np.ndarray] = None,
+                npts: Union[None, np.ndarray] = None, dt: Union[None, float, np.ndarray] = None,
+                tolerance: float = 0.) -> GapsAndOverlaps:
+    """
+    gaps and overlaps between consecutive records
+    :param starts: start of the records, any order
+    :param ends: end of the records, or provide npts and dt instead (see record_ends)
+    :param npts, dt: number of samples and sampling interval of the records
+    :param tolerance: gaps and overlaps shorter or equal to tolerance are ignored (e.g. half a sample)
+    :return gaps_and_overlaps: the record indices refer to the input order
+    """
+    starts = np.asarray(starts)
+    if ends is None:
+        if npts is None or dt is None:
+            raise ValueError('provide ends, or npts and dt')
+        ends = record_ends(starts, npts, dt)
+    ends = np.asarray(ends)
+    if starts.shape != ends.shape or starts.ndim != 1:
+        raise ValueError('starts and ends must be 1d arrays with the same length')
+
+    order = np.argsort(starts, kind="stable")
+    result = GapDetector(tolerance).add(starts[order], ends[order])
+    return result._replace(gap_records=order[result.gap_records], overlap_records=order[result.overlap_records])
+
+
+def coverage(starts: np.ndarray, ends: np.ndarray, window_starts: np.ndarray, window_ends: np.ndarray) -> np.ndarray:
+    """
+    percentage of each window covered by the records (the overlaps are counted once)
+    :param starts, ends: bounds of the records, any order
+    :param window_starts, window_ends: bounds of the windows, e.g. from tempoo.windows.split_time_into_windows
+    """
+    window_starts = np.asarray(window_starts)
+    window_ends = np.asarray(window_ends)
+    merged_starts, merged_ends = merge_intervals(starts, ends)
+    if not len(merged_starts):
+        return np.zeros(len(window_starts), float)
+    covered = _cumulated_coverage(merged_starts, merged_ends, window_ends) - \
+        _cumulated_coverage(merged_starts, merged_ends, window_starts)
+    return 100. * covered / (window_ends - window_starts)
+
+
+def window_coverage(starts: np.ndarray, ends: np.ndarray, starttime: float, endtime: float,
+                    winlen: float, winstep: float, winmode: Union[None, int, str] = None) \
+        -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    coverage of the windows of split_time_into_windows (same arguments)
+    :return window_starts, window_ends, percentages:
+    """
+    window_starts, window_ends = split_time_into_windows(
+        starttime, endtime, winlen=winlen, winstep=winstep, winmode=winmode, verbose=False)
+    return window_starts, window_ends, coverage(starts, ends, window_starts, window_ends)
+
+
+if __name__ == '__main__':
+    dt = 0.01
+    npts = np.full(10, 6000)
+    starts = np.arange(10) * 60.
+    starts[4] += 1.
+    starts[7] -= 0.5
+    result = detect_gaps(starts, npts=npts, dt=dt, tolerance=dt / 2.)
+    print(result)
+    print(window_coverage(starts, record_ends(starts, npts, dt), 0., 600., winlen=100., winstep=100.))
@@ -1,3 +1,6 @@
+from typing import Union
+import warnings
+import numpy as np
 from tempoo.utc import UTCFromTimestamp, UTC
 
 
@@ -29,89 +32,103 @@ GPS_EPOCH = UTC(1980, 1, 6, 0, 0, 0)
 # GPS_EPOCH = datetime.datetime(
 #     1980, 1, 6, tzinfo=datetime.timezone.utc)     
  
-def cumulative_leap_seconds(timestamp: float):
+# dates from which the cumulative leap second correction is incremented by 1s
+# source : https://en.wikipedia.org/wiki/Leap_second
+LEAP_SECOND_DATES = [
+    UTC(1981, 7, 1), UTC(1982, 7, 1), UTC(1983, 7, 1), UTC(1985, 7, 1),
+    UTC(1988, 1, 1), UTC(1990, 1, 1), UTC(1991, 1, 1), UTC(1992, 7, 1),
+    UTC(1993, 7, 1), UTC(1994, 7, 1), UTC(1996, 1, 1), UTC(1997, 7, 1),
+    UTC(1999, 1, 1), UTC(2006, 1, 1), UTC(2009, 1, 1), UTC(2012, 7, 1),
+    UTC(2015, 7, 1), UTC(2017, 1, 1)]
+LEAP_SECOND_TIMESTAMPS = np.asarray([_.timestamp for _ in LEAP_SECOND_DATES], float)
+# the same dates on the GPS time scale (GPS_EPOCH.timestamp + number_of_seconds_since_gps_epoch),
+# where the n-th leap second has already been counted
+LEAP_SECOND_GPS_TIMESTAMPS = LEAP_SECOND_TIMESTAMPS + np.arange(1, len(LEAP_SECOND_TIMESTAMPS) + 1)
+
+# the leap second corrections are known in this period only,
+# the last correction is assumed to hold after LEAP_SECOND_VALIDITY_END (with a warning, once per process)
+LEAP_SECOND_VALIDITY_START = UTC(1980, 1, 1)
+LEAP_SECOND_VALIDITY_END = UTC(2025, 1, 1)
+_validity_end_warned = False
+
+
+def _count_leap_seconds(timestamp: Union[float, np.ndarray], leap_timestamps: np.ndarray,
+                        validity_end: float):
+    """number of leap_timestamps lower or equal to timestamp, float or array of floats"""
+    timestamps = np.asarray(timestamp, float)
+    if (timestamps <= LEAP_SECOND_VALIDITY_START.timestamp).any():
+        raise NotImplementedError(timestamp)
+
+    global _validity_end_warned
+    if not _validity_end_warned and (timestamps >= validity_end).any():
+        # current data is past the table : warning at each call (e.g. each redraw of a gps axis) is noise
+        _validity_end_warned = True
+        warnings.warn(
+            f'leap second corrections after {LEAP_SECOND_VALIDITY_END} not announced yet, '
+            f'assuming no leap second after {LEAP_SECOND_DATES[-1]}', stacklevel=3)
+
+    # one single binary search per timestamp
+    cumulative_leap_seconds = np.searchsorted(
+        leap_timestamps, timestamps, side='right').astype(float)
+
+    if cumulative_leap_seconds.ndim == 0:
+        return float(cumulative_leap_seconds)
+    return cumulative_leap_seconds
+
+
+def cumulative_leap_seconds(timestamp: Union[float, np.ndarray]):
 
     """
     source : https://en.wikipedia.org/wiki/Leap_second
     to convert GPS times into UTC times, you must subtract the leap seconds :
-        utc[date] = number_of_seconds_since_gps_epoch - cumulative_leap_seconds[date]   
+        utc[date] = number_of_seconds_since_gps_epoch - cumulative_leap_seconds[date]
+    :param timestamp: a UTC timestamp or an array of timestamps
+    :return cumulative_leap_seconds: float or array of floats, same shape as timestamp,
+        the last known value after LEAP_SECOND_VALIDITY_END (with a warning)
     """
-    if timestamp <= UTC(1980, 1, 1).timestamp:
-        raise NotImplementedError(timestamp)
-    elif timestamp < UTC(1981, 7, 1).timestamp:
-        cumulative_leap_seconds = 0.
-    elif timestamp < UTC(1982, 7, 1).timestamp:
-        cumulative_leap_seconds = 1.
-    elif timestamp < UTC(1983, 7, 1).timestamp:
-        cumulative_leap_seconds = 2.
-    elif timestamp < UTC(1985, 7, 1).timestamp:
-        cumulative_leap_seconds = 3.
-    elif timestamp < UTC(1988, 1, 1).timestamp:
-        cumulative_leap_seconds = 4.
-    elif timestamp < UTC(1990, 1, 1).timestamp:
-        cumulative_leap_seconds = 5.
-    elif timestamp < UTC(1991, 1, 1).timestamp:
-        cumulative_leap_seconds = 6.
-    elif timestamp < UTC(1992, 7, 1).timestamp:
-        cumulative_leap_seconds = 7.
-    elif timestamp < UTC(1993, 7, 1).timestamp:
-        cumulative_leap_seconds = 8.
-    elif timestamp < UTC(1994, 7, 1).timestamp:
-        cumulative_leap_seconds = 9.
-    elif timestamp < UTC(1996, 1, 1).timestamp:
-        cumulative_leap_seconds = 10.
-    elif timestamp < UTC(1997, 7, 1).timestamp:
-        cumulative_leap_seconds = 11.
-    elif timestamp < UTC(1999, 1, 1).timestamp:
-        cumulative_leap_seconds = 12.
-    elif timestamp < UTC(2006, 1, 1).timestamp:
-        cumulative_leap_seconds = 13.
-    elif timestamp < UTC(2009, 1, 1).timestamp:
-        cumulative_leap_seconds = 14.
-    elif timestamp < UTC(2012, 1, 1).timestamp:
-        cumulative_leap_seconds = 15.
-    elif timestamp < UTC(2015, 7, 1).timestamp:
-        cumulative_leap_seconds = 16.
-    elif timestamp < UTC(2017, 1, 1).timestamp:
-        cumulative_leap_seconds = 17.
-    elif timestamp < UTC(2024, 1, 1).timestamp:
-        cumulative_leap_seconds = 18.
-    elif timestamp < UTC(2025, 1, 1).timestamp:
-        cumulative_leap_seconds = 18.
-    else:
-        raise NotImplementedError(
-            'leap second corrections after 2025/01/01 not announced yet')        
-    return cumulative_leap_seconds
-    
-                   
-def gps2timestamp(number_of_seconds_since_gps_epoch: float):
+    return _count_leap_seconds(timestamp, LEAP_SECOND_TIMESTAMPS, LEAP_SECOND_VALIDITY_END.timestamp)
+
+
+def gps2timestamp(number_of_seconds_since_gps_epoch: Union[float, np.ndarray]):
     """
     convert a number of seconds in the GPS TIME reference
         (number of seconds elapsed since GPS_EPOCH = 1980-01-06T00:00:00.000000 in UTC reference
+    works for scalars and arrays
     """
     # adding the GPS offset returns a number of seconds which must be corrected to get true UTC
     uncorrected_timestamp = GPS_EPOCH.timestamp + number_of_seconds_since_gps_epoch
-    
-    # the time correction is adjusted by exactly +1 ou -1s, the correction is cummulative
-    leap_seconds_corrections = cumulative_leap_seconds(uncorrected_timestamp)
-    
+
+    # the time correction is adjusted by exactly +1 ou -1s, the correction is cummulative,
+    # the leap second dates are looked up on the GPS time scale
+    leap_seconds_corrections = _count_leap_seconds(
+        uncorrected_timestamp, LEAP_SECOND_GPS_TIMESTAMPS,
+        LEAP_SECOND_VALIDITY_END.timestamp + len(LEAP_SECOND_DATES))
+
     # leap_seconds_corrections is positive (since 1980) and must be subtracted to get true utc timestamps
     corrected_timestamp = uncorrected_timestamp - leap_seconds_corrections
     return corrected_timestamp # in UTC reference system
 
 
+def timestamp2gps(timestamp: Union[float, np.ndarray]):
+    """
+    inverse of gps2timestamp : convert UTC timestamps into numbers of seconds since the GPS_EPOCH
+    works for scalars and arrays
+    """
+    return timestamp - GPS_EPOCH.timestamp + _count_leap_seconds(
+        timestamp, LEAP_SECOND_TIMESTAMPS, LEAP_SECOND_VALIDITY_END.timestamp)
+
+
 def gps2utc(number_of_seconds_since_gps_epoch: float):
     return UTCFromTimestamp(gps2timestamp(number_of_seconds_since_gps_epoch))
     
     
 if __name__ == "__main__":
 
-    import numpy as np 
     import matplotlib.pyplot as plt
     from tempoo.timetick import timetick
     
     timestamp = np.linspace(GPS_EPOCH.timestamp, UTC(2023, 12, 24).timestamp, 10000)
-    cum_leap_seconds = np.asarray([cumulative_leap_seconds(_) for _ in timestamp], float)
+    cum_leap_seconds = cumulative_leap_seconds(timestamp)
 
     plt.plot(timestamp, cum_leap_seconds)
     plt.gca().set_ylabel('Cumulative Leap second correction [sec]')
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import calendar
+import datetime
+import operator
+from typing import Union
+from tempoo.civil import calendar_from_day, julday_from_day, add_months_to_date
+from tempoo.utc import UTC, UTCFromStr, utc2microseconds, _utc_from_microseconds
+
+"""
+light immutable time scalar for hot loops
+an Instant holds one python int (microseconds since 1970-01-01) in __slots__,
+the calendar fields are computed on access (tempoo.civil.calendar_table lookup)
+the properties have the same names as those of UTC, the conversions to and from UTC are exact
+
+policy (same as UTC)
+Instant + float (seconds) | datetime.timedelta | Instant => Instant
+Instant - float (seconds) | datetime.timedelta | Instant => Instant
+"""
+
+_US_PER_SECOND = 1000000
+_US_PER_MINUTE = 60 * _US_PER_SECOND
+_US_PER_HOUR = 60 * _US_PER_MINUTE
+_US_PER_DAY = 24 * _US_PER_HOUR
+_US_PER_WEEK = 7 * _US_PER_DAY
+
+
+def _new(cls, microseconds: int) -> Instant:
+    # bypass __init__, the value is already a python int
+    self = object.__new__(cls)
+    object.__setattr__(self, '_us', microseconds)
+    return self
+
+
+class Instant(object):
+    __slots__ = ('_us',)
+
+    def __init__(self, microseconds: Union[int, float] = 0):
+        """
+        :param microseconds: integer number of microseconds since 1970-01-01T00:00:00Z,
+            a float is a timestamp in seconds (see from_timestamp)
+        """
+        if isinstance(microseconds, float):
+            microseconds = self.from_timestamp(microseconds)._us
+        else:
+            # python or numpy integers only, no silent truncation
+            microseconds = operator.index(microseconds)
+        object.__setattr__(self, '_us', microseconds)
+
+    # ============ construction / conversion
+    @classmethod
+    def from_timestamp(cls, timestamp: float) -> Instant:
+        """same rounding as UTCFromTimestamp (nearest microsecond, half to even)"""
+        seconds = int(timestamp)
+        return _new(cls, seconds * _US_PER_SECOND + round((timestamp - seconds) * 1e6))
+
+    @classmethod
+    def from_utc(cls, utc: datetime.datetime) -> Instant:
+        return _new(cls, utc2microseconds(utc))
+
+    @classmethod
+    def from_str(cls, string: str) -> Instant:
+        """string in the str(UTC) format YYYY-MM-DDTHH:MM:SS.ffffffZ"""
+        return _new(cls, utc2microseconds(UTCFromStr(string)))
+
+    def to_utc(self) -> UTC:
+        return _utc_from_microseconds(UTC, self._us)
+
+    @property
+    def microseconds(self) -> int:
+        return self._us
+
+    # ============ immutability, hashing, pickling
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return self.__class__, (self._us,)
+
+    def __hash__(self):
+        return hash(self._us)
+
+    def __eq__(self, other):
+        if isinstance(other, Instant):
+            return self._us == other._us
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, Instant):
+            return self._us != other._us
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Instant):
+            return self._us < other._us
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Instant):
+            return self._us <= other._us
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Instant):
+            return self._us > other._us
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Instant):
+            return self._us >= other._us
+        return NotImplemented
+
+    # ============ formatting
+    def __str__(self):
+        year, month, day = calendar_from_day(self._us // _US_PER_DAY)[:3]
+        return f"{year:04d}-{month:02d}-{day:02d}T{self.hour:02d}:{self.minute:02d}:" \
+               f"{self.second:02d}.{self.microsecond:06d}Z"
+
+    def __repr__(self):
+        return f"Instant({self})"
+
+    def ymd(self) -> str:
+        year, month, day = calendar_from_day(self._us // _US_PER_DAY)[:3]
+        return f"{year:04d}.{month:02d}.{day:02d}"
+
+    def ymdhmsms(self) -> str:
+        return f"{self.ymd()}.{self.hour:02d}.{self.minute:02d}.{self.second:02d}.{self.microsecond:06d}"
+
+    def yjh(self) -> str:
+        return f"{self.year:04d}.{self.julday:03d}.{self.hour:02d}"
+
+    def yjhmsms(self) -> str:
+        return f"{self.yjh()}.{self.minute:02d}.{self.second:02d}.{self.microsecond:06d}"
+
+    # ============ fields
+    @property
+    def timestamp(self) -> float:
+        return self._us / _US_PER_SECOND
+
+    def __float__(self):
+        return self._us / _US_PER_SECOND
+
+    @property
+    def year(self) -> int:
+        return calendar_from_day(self._us // _US_PER_DAY)[0]
+
+    @property
+    def month(self) -> int:
+        return calendar_from_day(self._us // _US_PER_DAY)[1]
+
+    @property
+    def day(self) -> int:
+        return calendar_from_day(self._us // _US_PER_DAY)[2]
+
+    @property
+    def julday(self) -> int:
+        return julday_from_day(self._us // _US_PER_DAY)
+
+    @property
+    def weekday(self) -> int:
+        # 0 = Monday
+        return calendar_from_day(self._us // _US_PER_DAY)[4]
+
+    @property
+    def hour(self) -> int:
+        return self._us % _US_PER_DAY // _US_PER_HOUR
+
+    @property
+    def minute(self) -> int:
+        return self._us % _US_PER_HOUR // _US_PER_MINUTE
+
+    @property
+    def second(self) -> int:
+        return self._us % _US_PER_MINUTE // _US_PER_SECOND
+
+    @property
+    def microsecond(self) -> int:
+        return self._us % _US_PER_SECOND
+
+    @property
+    def decimal_year(self) -> float:
+        """same value as UTC.decimal_year"""
+        day = self._us // _US_PER_DAY
+        year, _, _, julday, _ = calendar_from_day(day)
+        elapsed = self._us - (day - julday + 1) * _US_PER_DAY
+        return year + elapsed / ((366 if calendar.isleap(year) else 365) * _US_PER_DAY)
+
+    # ============ floor / ceil
+    def _ceil(self, floor: Instant, step: int) -> Instant:
+        return floor if floor._us == self._us else _new(type(self), floor._us + step)
+
+    @property
+    def flooryear(self) -> Instant:
+        day = self._us // _US_PER_DAY
+        return _new(type(self), (day - julday_from_day(day) + 1) * _US_PER_DAY)
+
+    @property
+    def ceilyear(self) -> Instant:
+        floor = self.flooryear
+        return self._ceil(floor, (366 if calendar.isleap(self.year) else 365) * _US_PER_DAY)
+
+    @property
+    def floormonth(self) -> Instant:
+        day = self._us // _US_PER_DAY
+        return _new(type(self), (day - calendar_from_day(day)[2] + 1) * _US_PER_DAY)
+
+    @property
+    def ceilmonth(self) -> Instant:
+        floor = self.floormonth
+        year, month = calendar_from_day(floor._us // _US_PER_DAY)[:2]
+        return self._ceil(floor, calendar.monthrange(year, month)[1] * _US_PER_DAY)
+
+    @property
+    def floorweek(self) -> Instant:
+        day = self._us // _US_PER_DAY
+        return _new(type(self), (day - calendar_from_day(day)[4]) * _US_PER_DAY)
+
+    @property
+    def ceilweek(self) -> Instant:
+        return self._ceil(self.floorweek, _US_PER_WEEK)
+
+    @property
+    def floorday(self) -> Instant:
+        return _new(type(self), self._us - self._us % _US_PER_DAY)
+
+    @property
+    def ceilday(self) -> Instant:
+        return self._ceil(self.floorday, _US_PER_DAY)
+
+    @property
+    def floorhour(self) -> Instant:
+        return _new(type(self), self._us - self._us % _US_PER_HOUR)
+
+    @property
+    def ceilhour(self) -> Instant:
+        return self._ceil(self.floorhour, _US_PER_HOUR)
+
+    @property
+    def floorminute(self) -> Instant:
+        return _new(type(self), self._us - self._us % _US_PER_MINUTE)
+
+    @property
+    def ceilminute(self) -> Instant:
+        return self._ceil(self.floorminute, _US_PER_MINUTE)
+
+    # ============ calendar offsets, see tempoo.civil.add_months
+    def add_months(self, months: int, end_of_month: str = 'clip') -> Instant:
+        day, time_of_day = divmod(self._us, _US_PER_DAY)
+        year, month, monthday = add_months_to_date(*calendar_from_day(day)[:3], months, end_of_month)
+        day = datetime.date(year, month, monthday).toordinal() - 719163
+        return _new(type(self), day * _US_PER_DAY + time_of_day)
+
+    def add_years(self, years: int, end_of_month: str = 'clip') -> Instant:
+        return self.add_months(12 * years, end_of_month=end_of_month)
+
+    def add_weeks(self, weeks: int) -> Instant:
+        return _new(type(self), self._us + weeks * _US_PER_WEEK)
+
+    def add_days(self, days: int) -> Instant:
+        return _new(type(self), self._us + days * _US_PER_DAY)
+
+    # ============ arithmetic
+    @staticmethod
+    def _other_to_microseconds(other: Union[datetime.timedelta, float, int, Instant]) -> int:
+        if isinstance(other, Instant):
+            return other._us
+
+        elif isinstance(other, datetime.timedelta):
+            return (other.days * 86400 + other.seconds) * _US_PER_SECOND + other.microseconds
+
+        elif isinstance(other, int):
+            return other * _US_PER_SECOND
+
+        elif isinstance(other, float):
+            return Instant.from_timestamp(other)._us
+
+        raise TypeError(type(other))
+
+    def __add__(self, other):
+        return _new(type(self), self._us + self._other_to_microseconds(other))
+
+    def __sub__(self, other):
+        return _new(type(self), self._us - self._other_to_microseconds(other))
@@ -0,0 +1,209 @@
+from typing import Union
+import numpy as np
+
+"""
+vectorized operations on closed time intervals [start, end]
+the bounds are float timestamps or int64 microseconds, the dtype of the inputs is preserved
+"""
+
+
+def _as_bounds(starts, ends) -> (np.ndarray, np.ndarray):
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    if starts.shape != ends.shape or starts.ndim != 1:
+        raise ValueError('starts and ends must be 1d arrays with the same length')
+    if not (starts <= ends).all():
+        raise ValueError('starts must be lower or equal to ends')
+    return starts, ends
+
+
+def _expand_ranges(firsts: np.ndarray, lasts: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    concatenate the ranges firsts[i]:lasts[i]
+    :return owners: index i of the range of each item
+    :return items: the concatenated ranges
+    """
+    counts = np.maximum(lasts - firsts, 0)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    items = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - firsts, counts)
+    return owners, items
+
+
+class IntervalIndex(object):
+    """
+    static index over closed intervals [starts[i], ends[i]]
+    the intervals are split into classes of lengths (powers of 2) and sorted by start in each class,
+    a running maximum of the ends bounds the candidates of each query in each class :
+    for a class of maximum length L, the candidates of a query [t1, t2] start between t1 - L and t2
+    and those starting after t1 - L / 2 all match (the lengths of a class are above L / 2)
+    => a long interval is only a candidate of the queries it may overlap,
+    the cost of a query is about the number of matches plus one binary search per class
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        starts, ends = _as_bounds(starts, ends)
+        lengths = (ends - starts).astype(float)
+        # the exponent of the lengths, the empty intervals apart
+        classes = np.where(lengths > 0, np.frexp(lengths)[1], np.iinfo(np.int32).min)
+        self.order = np.lexsort((starts, classes))
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        classes = classes[self.order]
+        # the classes are self.starts[bounds[k]:bounds[k + 1]]
+        self.bounds = np.concatenate(([0], np.flatnonzero(classes[1:] != classes[:-1]) + 1, [len(classes)]))
+        self.max_ends = self.ends.copy()
+        for first, last in zip(self.bounds[:-1], self.bounds[1:]):
+            np.maximum.accumulate(self.ends[first:last], out=self.max_ends[first:last])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlap(self, t1: Union[float, np.ndarray], t2: Union[float, np.ndarray],
+                chunk_size: int = 1 << 20) -> (np.ndarray, np.ndarray):
+        """
+        find the intervals overlapping the query intervals [t1, t2], bounds included
+        :param t1, t2: bounds of the query intervals, arrays or scalars
+        :param chunk_size: maximum number of candidates expanded at once, bounds the memory used
+        :return queries: index of the query intervals, sorted
+        :return intervals: index of the matching intervals (in the input order), one per pair
+        """
+        t1 = np.atleast_1d(t1)
+        t2 = np.atleast_1d(t2)
+        queries, intervals = [np.zeros(0, np.int64)], [np.zeros(0, np.int64)]
+        for first, last in zip(self.bounds[:-1], self.bounds[1:]):
+            # candidates : start <= t2 and max_end >= t1
+            firsts = first + np.searchsorted(self.max_ends[first:last], t1, side="left")
+            lasts = first + np.searchsorted(self.starts[first:last], t2, side="right")
+            counts = np.maximum(lasts - firsts, 0)
+            cumulated = np.cumsum(counts)
+            start = 0
+            while start < len(counts):
+                before = cumulated[start - 1] if start else 0
+                stop = max(int(np.searchsorted(cumulated, before + chunk_size, side="right")), start + 1)
+                chunk_queries, candidates = _expand_ranges(firsts[start:stop], lasts[start:stop])
+                chunk_queries += start
+                keep = self.ends[candidates] >= t1[chunk_queries]
+                queries.append(chunk_queries[keep])
+                intervals.append(self.order[candidates[keep]])
+                start = stop
+
+        queries, intervals = np.concatenate(queries), np.concatenate(intervals)
+        order = np.argsort(queries, kind="stable")
+        return queries[order], intervals[order]
+
+    def stab(self, times: Union[float, np.ndarray]) -> (np.ndarray, np.ndarray):
+        """
+        find the intervals containing some times
+        :param times: array or scalar
+        :return queries: index of the times
+        :return intervals: index of the intervals containing them (in the input order)
+        """
+        return self.overlap(times, times)
+
+    def active(self, time: float) -> np.ndarray:
+        """indices of the intervals containing one time, sorted"""
+        return np.sort(self.stab(time)[1])
+
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray, groups: Union[None, np.ndarray] = None):
+    """
+    merge the overlapping or touching intervals
+    :param starts, ends: bounds of the intervals
+    :param groups: if provided, merge only the intervals of the same group (e.g. same timeline line number)
+    :return starts, ends: the merged intervals, sorted by group and start
+    :return groups: only if groups was provided, the group of each merged interval
+    """
+    starts, ends = _as_bounds(starts, ends)
+    group_ids = np.zeros(len(starts), np.int64) if groups is None else \
+        np.unique(np.asarray(groups), return_inverse=True)[1].ravel()
+
+    order = np.lexsort((starts, group_ids))
+    starts, ends, group_ids = starts[order], ends[order], group_ids[order]
+
+    # running maximum of the ends, restarted at each group :
+    # work on integer ranks so that an offset per group keeps the groups apart exactly
+    values, ranks = np.unique(np.concatenate((starts, ends)), return_inverse=True)
+    ranks = ranks.ravel()
+    start_ranks = ranks[:len(starts)] + group_ids * (len(values) + 1)
+    end_ranks = ranks[len(starts):] + group_ids * (len(values) + 1)
+    max_end_ranks = np.maximum.accumulate(end_ranks) if len(end_ranks) else end_ranks
+
+    new_block = np.ones(len(starts), bool)
+    new_block[1:] = start_ranks[1:] > max_end_ranks[:-1]
+    block_starts = np.flatnonzero(new_block)
+
+    merged_starts = starts[block_starts]
+    merged_ends = np.maximum.reduceat(ends, block_starts) if len(block_starts) else ends[:0]
+    if groups is None:
+        return merged_starts, merged_ends
+    return merged_starts, merged_ends, np.asarray(groups)[order][block_starts]
+
+
+def union_intervals(starts1: np.ndarray, ends1: np.ndarray, starts2: np.ndarray, ends2: np.ndarray):
+    """union of two sets of intervals, as sorted disjoint intervals"""
+    return merge_intervals(np.concatenate((starts1, starts2)), np.concatenate((ends1, ends2)))
+
+
+def intersect_intervals(starts1: np.ndarray, ends1: np.ndarray, starts2: np.ndarray, ends2: np.ndarray):
+    """intersection of two sets of intervals, as sorted disjoint intervals"""
+    starts1, ends1 = merge_intervals(starts1, ends1)
+    starts2, ends2 = merge_intervals(starts2, ends2)
+    queries, intervals = IntervalIndex(starts2, ends2).overlap(starts1, ends1)
+
+    # both sides are sorted and disjoint => the intersections are sorted and disjoint
+    order = np.lexsort((intervals, queries))
+    queries, intervals = queries[order], intervals[order]
+    return np.maximum(starts1[queries], starts2[intervals]), np.minimum(ends1[queries], ends2[intervals])
+
+
+def gap_intervals(starts: np.ndarray, ends: np.ndarray, groups: Union[None, np.ndarray] = None,
+                  tmin: Union[None, float] = None, tmax: Union[None, float] = None):
+    """
+    complement of the intervals, i.e. the periods covered by no interval
+    the gaps are open intervals (end of an interval, start of the next one)
+    :param starts, ends: bounds of the intervals
+    :param groups: if provided, find the gaps of each group separately
+    :param tmin, tmax: if provided, also report the gaps between tmin and the first interval
+        and between the last interval and tmax (of each group)
+    :return starts, ends: bounds of the gaps, sorted by group and start
+    :return groups: only if groups was provided, the group of each gap
+    """
+    if groups is None:
+        merged_starts, merged_ends = merge_intervals(starts, ends)
+        merged_groups = np.zeros(len(merged_starts), np.int64)
+    else:
+        merged_starts, merged_ends, merged_groups = merge_intervals(starts, ends, groups)
+
+    same_group = merged_groups[1:] == merged_groups[:-1]
+    gap_starts = [merged_ends[:-1][same_group]]
+    gap_ends = [merged_starts[1:][same_group]]
+    gap_groups = [merged_groups[1:][same_group]]
+
+    first_of_group = np.concatenate(([True], ~same_group)) if len(merged_starts) else np.zeros(0, bool)
+    last_of_group = np.concatenate((~same_group, [True])) if len(merged_starts) else np.zeros(0, bool)
+    if tmin is not None:
+        before = first_of_group & (merged_starts > tmin)
+        gap_starts.insert(0, np.full(before.sum(), tmin, merged_starts.dtype))
+        gap_ends.insert(0, merged_starts[before])
+        gap_groups.insert(0, merged_groups[before])
+    if tmax is not None:
+        after = last_of_group & (merged_ends < tmax)
+        gap_starts.append(merged_ends[after])
+        gap_ends.append(np.full(after.sum(), tmax, merged_ends.dtype))
+        gap_groups.append(merged_groups[after])
+
+    gap_starts, gap_ends, gap_groups = \
+        np.concatenate(gap_starts), np.concatenate(gap_ends), np.concatenate(gap_groups)
+    order = np.lexsort((gap_starts, np.unique(gap_groups, return_inverse=True)[1].ravel()))
+    if groups is None:
+        return gap_starts[order], gap_ends[order]
+    return gap_starts[order], gap_ends[order], gap_groups[order]
+
+
+if __name__ == '__main__':
+    starts = np.random.uniform(0., 100., 20)
+    ends = starts + np.random.uniform(0., 10., 20)
+    index = IntervalIndex(starts, ends)
+    print(index.active(50.))
+    print(merge_intervals(starts, ends))
+    print(gap_intervals(starts, ends, tmin=0., tmax=110.))
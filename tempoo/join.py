@@ -0,0 +1,77 @@
+from typing import Union
+import numpy as np
+
+"""
+as-of joins between two time arrays : for each left time, the right time just before, just after or closest
+e.g. gps fixes for waveform samples, catalog origins for picks
+the times are float timestamps or int64 microseconds (the same kind on both sides)
+"""
+
+ASOF_DIRECTIONS = ('backward', 'forward', 'nearest')
+
+
+def asof_join(left: np.ndarray, right: np.ndarray, direction: str = 'backward',
+              tolerance: Union[None, float, int] = None) -> np.ndarray:
+    """
+    match each left time with one right time, binary search in right : O((n + m) log m)
+    :param left: n times, any order
+    :param right: m times sorted in increasing order
+    :param direction: backward : last right time lower or equal to the left time
+                      forward  : first right time greater or equal to the left time
+                      nearest  : closest right time, the earlier one in case of a tie
+        among equal right times, the match is the one closest in index :
+        the last one for a match before the left time, the first one for a match after (or equal)
+    :param tolerance: maximum distance between matched times (inclusive), default no limit
+    :return matches: index in right of the match of each left time, -1 for no match, int64 array like left
+    """
+    if direction not in ASOF_DIRECTIONS:
+        raise ValueError(f'direction must be one of {ASOF_DIRECTIONS}, got {direction}')
+    left = np.asarray(left)
+    right = np.asarray(right)
+    if right.ndim != 1:
+        raise ValueError('right must be a 1d array')
+    if (left.dtype.kind in 'iu') != (right.dtype.kind in 'iu'):
+        raise TypeError('left and right must be both timestamps (float) or both microseconds (int)')
+    if (right[1:] < right[:-1]).any():
+        raise ValueError('right must be sorted')
+
+    m = len(right)
+    if direction == 'backward':
+        matches = np.searchsorted(right, left, side='right') - 1
+        valid = matches >= 0
+    elif direction == 'forward':
+        matches = np.searchsorted(right, left, side='left')
+        valid = matches < m
+    else:
+        after = np.searchsorted(right, left, side='left')  # first right time >= left
+        before = after - 1  # last right time < left
+        if m:
+            closer_after = (right[np.minimum(after, m - 1)] - left) < (left - right[np.maximum(before, 0)])
+        else:
+            closer_after = np.zeros(np.shape(left), bool)
+        matches = np.where((after < m) & ((before < 0) | closer_after), after, before)
+        valid = matches >= 0
+
+    if tolerance is not None and m:
+        clipped = np.clip(matches, 0, m - 1)
+        valid &= np.abs(left - right[clipped]) <= tolerance
+    return np.where(valid, matches, -1).astype(np.int64)
+
+
+def asof_pairs(left: np.ndarray, right: np.ndarray, direction: str = 'backward',
+               tolerance: Union[None, float, int] = None) -> (np.ndarray, np.ndarray):
+    """
+    asof_join restricted to the matched left times
+    :return left_indices, right_indices: index pairs of the matches
+    """
+    matches = asof_join(left, right, direction=direction, tolerance=tolerance).ravel()
+    left_indices = np.flatnonzero(matches >= 0)
+    return left_indices, matches[left_indices]
+
+
+if __name__ == '__main__':
+    right = np.sort(np.random.uniform(0., 100., 10))
+    left = np.random.uniform(0., 100., 5)
+    print(right)
+    for direction in ASOF_DIRECTIONS:
+        print(direction, left, asof_join(left, right, direction))
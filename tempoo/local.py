@@ -1,6 +1,12 @@
 import datetime
+from typing import Union
+from functools import lru_cache
+import numpy as np
 import pytz
 import warnings
+from tempoo.civil import \
+    MICROSECONDS_PER_SECOND, MICROSECONDS_PER_DAY, timestamps2microseconds, microseconds2timestamps, \
+    microseconds2fields, fields2microseconds, days_from_civil, civil_from_days, weekday_from_days
 
 # I want time zone in CET : WARNING TZINFO ARG OF DATETIME
 # IS NOT WORKING CORRECTLY WITH PYZT 
@@ -25,10 +31,11 @@ def frenchdatetime(
     :return frenchtime: 
     :rtype: datetime.datetime with timezone set to PARIS_TIME_ZONE
     """
-    return datetime.datetime(
+    # localize does not depend on the time zone of the host (unlike astimezone on a naive datetime)
+    return PARIS_TIME_ZONE.localize(datetime.datetime(
         year=year, month=month, day=day, 
         hour=hour, minute=minute, second=second, 
-        microsecond=microsecond).astimezone(PARIS_TIME_ZONE)
+        microsecond=microsecond))
 
 def utc2french(utcdatetime: datetime.datetime):
     """
@@ -73,7 +80,7 @@ def timestamp2utc(timestamp):
     """timestamp is the same for all time zones!
     return an datetime.datetime object that is informed that the time zone is utc
     """
-    d = datetime.datetime.fromtimestamp(timestamp).astimezone(datetime.timezone.utc)
+    d = datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
     return d
     
     
@@ -85,6 +92,301 @@ def timestamp2french(timestamp):
     return utc2french(timestamp2utc(timestamp))
        
 
+class TimeZoneTable(object):
+    """
+    the transitions of one time zone stored in compact sorted arrays,
+    read once from the compiled tzdata shipped with pytz (no dependency to the host time zone)
+    """
+    def __init__(self, zone: str):
+        tz = pytz.timezone(zone)
+        self.zone: str = tz.zone
+
+        if hasattr(tz, '_utc_transition_times'):
+            # time zone with transitions
+            transition_times = tz._utc_transition_times
+            transition_info = tz._transition_info
+        else:
+            # fixed offset time zone (UTC, Etc/GMT+3, ...)
+            transition_times = [datetime.datetime(1, 1, 1)]
+            transition_info = [(tz.utcoffset(None), datetime.timedelta(0), tz.tzname(None))]
+
+        epoch = datetime.datetime(1970, 1, 1)
+        one_microsecond = datetime.timedelta(microseconds=1)
+
+        # utc instants of the transitions, integer microseconds since 1970-01-01
+        self.transitions: np.ndarray = np.asarray(
+            [(transition - epoch) // one_microsecond for transition in transition_times], np.int64)
+        # utc offset and daylight saving time flag from each transition to the next
+        self.utcoffsets: np.ndarray = np.asarray(
+            [utcoffset // one_microsecond for utcoffset, dst, tzname in transition_info], np.int64)
+        self.dsts: np.ndarray = np.asarray(
+            [bool(dst) for utcoffset, dst, tzname in transition_info], bool)
+        # wall clock time at which each period starts, according to its own utc offset
+        self.period_starts: np.ndarray = self.transitions + self.utcoffsets
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.zone!r})"
+
+    def utcoffsets_at(self, microseconds: np.ndarray) -> np.ndarray:
+        """utc offsets (integer microseconds) at some utc times (integer microseconds)"""
+        # same lookup as pytz (bisect right on the utc transition times)
+        index = np.searchsorted(self.transitions, microseconds, side='right') - 1
+        return self.utcoffsets[np.maximum(index, 0)]
+
+    def utc2wall(self, microseconds: np.ndarray) -> np.ndarray:
+        """utc times to wall clock times (as if the wall clock was utc), integer microseconds"""
+        microseconds = np.asarray(microseconds, np.int64)
+        return microseconds + self.utcoffsets_at(microseconds)
+
+    def _wall_candidates(self, walls: np.ndarray) -> tuple:
+        """
+        a wall clock time has at most two possible utc times:
+        A with the offset of the period it falls in, B with the offset of the previous period
+        """
+        walls = np.asarray(walls, np.int64)
+        last = len(self.transitions) - 1
+        k = np.maximum(np.searchsorted(self.period_starts, walls, side='right') - 1, 0)
+        next_k = np.minimum(k + 1, last)
+        previous_k = np.maximum(k - 1, 0)
+
+        # A is wrong if the wall time falls in the gap of the next transition
+        utc_a = walls - self.utcoffsets[k]
+        valid_a = (k == last) | (utc_a < self.transitions[next_k])
+
+        # B is right if the wall time is repeated by transition k
+        utc_b = walls - self.utcoffsets[previous_k]
+        valid_b = (k > 0) & (utc_b < self.transitions[k])
+
+        return walls, k, next_k, previous_k, utc_a, valid_a, utc_b, valid_b
+
+    def wall2utc(self, walls: np.ndarray, is_dst: bool = False) -> np.ndarray:
+        """
+        wall clock times to utc times, integer microseconds,
+        ambiguous and non-existent times are solved like pytz localize
+        """
+        walls, k, next_k, previous_k, utc_a, valid_a, utc_b, valid_b = self._wall_candidates(walls)
+        ambiguous = valid_a & valid_b
+        nonexistent = ~valid_a & ~valid_b
+
+        if is_dst is None:
+            if ambiguous.any():
+                raise pytz.exceptions.AmbiguousTimeError(_first_wall_string(walls[ambiguous]))
+            if nonexistent.any():
+                raise pytz.exceptions.NonExistentTimeError(_first_wall_string(walls[nonexistent]))
+
+        utc = np.where(valid_a, utc_a, utc_b)
+
+        # ambiguous : prefer the candidate with the requested dst flag,
+        # otherwise the earliest if is_dst else the latest (like pytz)
+        match_a = self.dsts[k] == bool(is_dst)
+        match_b = self.dsts[previous_k] == bool(is_dst)
+        choose_b = np.where(match_a != match_b, match_b, bool(is_dst))
+        utc = np.where(ambiguous & choose_b, utc_b, utc)
+
+        # nonexistent : pytz shifts the wall time using the offset after the gap if is_dst else before the gap
+        utcoffsets = self.utcoffsets[next_k] if is_dst else self.utcoffsets[k]
+        utc = np.where(nonexistent, walls - utcoffsets, utc)
+        return utc
+
+    def wall2first_instant(self, walls: np.ndarray) -> np.ndarray:
+        """
+        first utc instant at which the wall clock reaches some wall clock times, integer microseconds
+        i.e. the first occurrence of ambiguous times, and the end of the gap for non-existent times
+        """
+        walls, k, next_k, previous_k, utc_a, valid_a, utc_b, valid_b = self._wall_candidates(walls)
+        return np.where(valid_b, utc_b, np.where(valid_a, utc_a, self.transitions[next_k]))
+
+
+@lru_cache(maxsize=32)
+def timezone_table(zone: str) -> TimeZoneTable:
+    """the transition table of a time zone (IANA name), built on first use, least recently used evicted"""
+    return TimeZoneTable(zone)
+
+
+def _first_wall_string(walls: np.ndarray) -> str:
+    return str(datetime.datetime(1970, 1, 1) + datetime.timedelta(microseconds=int(walls.flat[0])))
+
+
+def timestamps2local_utcoffsets(timestamps: np.ndarray, zone: str) -> np.ndarray:
+    """
+    vectorized utc offsets (in seconds) of a time zone at some timestamps
+    :param timestamps: array of timestamps
+    :param zone: IANA time zone name, e.g. "Europe/Paris"
+    """
+    microseconds = timestamps2microseconds(timestamps)
+    return timezone_table(zone).utcoffsets_at(microseconds) / MICROSECONDS_PER_SECOND
+
+
+def timestamps2local_fields(timestamps: np.ndarray, zone: str) -> tuple:
+    """
+    vectorized conversion from timestamps to the wall clock of a time zone
+    :param timestamps: array of timestamps
+    :param zone: IANA time zone name, e.g. "Europe/Paris"
+    :return year, month, day, hour, minute, second, microsecond: arrays of int, in local time
+    """
+    walls = timezone_table(zone).utc2wall(timestamps2microseconds(timestamps))
+    return microseconds2fields(walls)
+
+
+def local_fields2timestamps(
+        year: np.ndarray, month: np.ndarray, day: np.ndarray,
+        hour: np.ndarray = 0, minute: np.ndarray = 0,
+        second: np.ndarray = 0, microsecond: np.ndarray = 0,
+        *, zone: str, is_dst: bool = False) -> np.ndarray:
+    """
+    vectorized conversion from the wall clock of a time zone to timestamps,
+    same results as pytz.timezone(zone).localize(datetime.datetime(...), is_dst=is_dst).timestamp()
+    :param year, month, day, hour, minute, second, microsecond: arrays of int in local time
+    :param zone: IANA time zone name, e.g. "Europe/Paris"
+    :param is_dst: how to solve the ambiguous or non-existent local times (see pytz)
+        False : standard time, True : daylight saving time, None : raise an exception
+    :return timestamps: array of float
+    """
+    walls = fields2microseconds(year, month, day, hour, minute, second, microsecond)
+    return microseconds2timestamps(timezone_table(zone).wall2utc(walls, is_dst=is_dst))
+
+
+def timestamp2local(timestamp: float, zone: str) -> datetime.datetime:
+    """
+    timestamp is the same for all time zones!
+    return a datetime.datetime object with tzinfo set to the time zone (pytz)
+    """
+    return datetime.datetime.fromtimestamp(timestamp, tz=pytz.timezone(zone))
+
+
+def local2timestamp(
+        year: int, month: int, day: int, hour: int = 0,
+        minute: int = 0, second: int = 0, microsecond: int = 0,
+        *, zone: str, is_dst: bool = False) -> float:
+    """scalar version of local_fields2timestamps"""
+    walls = fields2microseconds(year, month, day, hour, minute, second, microsecond)
+    return float(microseconds2timestamps(timezone_table(zone).wall2utc(walls, is_dst=is_dst)))
+
+
+def timestamps2french_utcoffsets(timestamps: np.ndarray) -> np.ndarray:
+    """
+    vectorized utc offsets (in seconds) of the Paris time zone at some timestamps
+    same results as utc2french(...).utcoffset() but for arrays
+    """
+    return timestamps2local_utcoffsets(timestamps, zone=PARIS_TIME_ZONE.zone)
+
+
+def timestamps2french_fields(timestamps: np.ndarray) -> tuple:
+    """
+    vectorized conversion from timestamps to the wall clock in Paris
+    :param timestamps: array of timestamps
+    :return year, month, day, hour, minute, second, microsecond: arrays of int, in local french time
+    """
+    return timestamps2local_fields(timestamps, zone=PARIS_TIME_ZONE.zone)
+
+
+def french_fields2timestamps(
+        year: np.ndarray, month: np.ndarray, day: np.ndarray,
+        hour: np.ndarray = 0, minute: np.ndarray = 0,
+        second: np.ndarray = 0, microsecond: np.ndarray = 0,
+        is_dst: bool = False) -> np.ndarray:
+    """
+    vectorized conversion from the wall clock in Paris to timestamps,
+    same results as PARIS_TIME_ZONE.localize(datetime.datetime(...), is_dst=is_dst).timestamp()
+    see local_fields2timestamps
+    """
+    return local_fields2timestamps(
+        year, month, day, hour, minute, second, microsecond,
+        zone=PARIS_TIME_ZONE.zone, is_dst=is_dst)
+
+
+LOCAL_CALENDAR_UNITS = ['day', 'week', 'month', 'year']
+
+
+def _period_start_days(days: np.ndarray, unit: str, periods: Union[int, np.ndarray] = 0) -> np.ndarray:
+    """
+    first day of the calendar periods (day, week starting on monday, month, year) containing some days,
+    shifted by a number of periods, days are counted since 1970-01-01
+    """
+    if unit == 'day':
+        return days + periods
+
+    elif unit == 'week':
+        return days - weekday_from_days(days) + 7 * periods
+
+    year, month, day = civil_from_days(days)
+    if unit == 'month':
+        months = year * 12 + (month - 1) + periods
+        return days_from_civil(months // 12, months % 12 + 1, 1)
+
+    elif unit == 'year':
+        return days_from_civil(year + periods, 1, 1)
+
+    raise ValueError(f'unit must be one of {LOCAL_CALENDAR_UNITS}, got {unit}')
+
+
+def local_floor(timestamps: np.ndarray, unit: str, zone: str) -> np.ndarray:
+    """
+    vectorized start of the local calendar periods containing some timestamps
+    e.g. with unit="day", the utc timestamps of the local midnights before the timestamps
+    :param timestamps: array of timestamps
+    :param unit: "day", "week" (starting on monday), "month" or "year"
+    :param zone: IANA time zone name, e.g. "Europe/Paris"
+    :return floor_timestamps: array of timestamps
+    """
+    table = timezone_table(zone)
+    walls = table.utc2wall(timestamps2microseconds(timestamps))
+    start_days = _period_start_days(walls // MICROSECONDS_PER_DAY, unit)
+    return microseconds2timestamps(table.wall2first_instant(start_days * MICROSECONDS_PER_DAY))
+
+
+def local_ceil(timestamps: np.ndarray, unit: str, zone: str) -> np.ndarray:
+    """
+    same as local_floor for the end of the local calendar periods,
+    timestamps already at the start of a period are unchanged
+    """
+    table = timezone_table(zone)
+    microseconds = timestamps2microseconds(timestamps)
+    walls = table.utc2wall(microseconds)
+    days = walls // MICROSECONDS_PER_DAY
+
+    floor_microseconds = table.wall2first_instant(_period_start_days(days, unit) * MICROSECONDS_PER_DAY)
+    next_microseconds = table.wall2first_instant(_period_start_days(days, unit, 1) * MICROSECONDS_PER_DAY)
+    return microseconds2timestamps(
+        np.where(floor_microseconds == microseconds, microseconds, next_microseconds))
+
+
+def local_between(t1: float, t2: float, unit: str, zone: str, step: int = 1) -> np.ndarray:
+    """
+    starts of the local calendar periods between two times, bounds included
+    e.g. with unit="day", the utc timestamps of all the local midnights between t1 and t2
+    (days with a dst transition last 23 or 25 hours)
+    :param t1, t2: timestamps or UTC objects
+    :param unit: "day", "week" (starting on monday), "month" or "year"
+    :param zone: IANA time zone name, e.g. "Europe/Paris"
+    :param step: number of periods between two outputs, counted from the first period after t1
+    :return timestamps: array of timestamps
+    """
+    t1, t2 = float(t1), float(t2)
+    if t1 >= t2:
+        raise ValueError('utmin must be lower than utmax')
+
+    table = timezone_table(zone)
+    first_wall, last_wall = table.utc2wall(timestamps2microseconds(
+        local_ceil(np.asarray([t1]), unit, zone).tolist() + [t2]))
+    first_day = first_wall // MICROSECONDS_PER_DAY
+    last_day = last_wall // MICROSECONDS_PER_DAY
+
+    # number of periods between the first and the last day
+    if unit in ('day', 'week'):
+        nperiods = (last_day - first_day) // (1 if unit == 'day' else 7)
+    else:
+        (year1, month1, _), (year2, month2, _) = civil_from_days(first_day), civil_from_days(last_day)
+        nperiods = (year2 - year1) * (12 if unit == 'month' else 1) \
+            + ((month2 - month1) if unit == 'month' else 0)
+
+    periods = np.arange(0, nperiods + 1, step)
+    start_days = _period_start_days(np.asarray(first_day), unit, periods)
+    microseconds = table.wall2first_instant(start_days * MICROSECONDS_PER_DAY)
+    microseconds = microseconds[microseconds <= timestamps2microseconds(t2)]
+    return microseconds2timestamps(microseconds)
+
+
 if __name__ == "__main__":
 
     now_in_local_time = frenchdatetime(2023, 7, 6, 15, 17, 21, 0)
@@ -0,0 +1,231 @@
+from typing import Union, NamedTuple, Iterable, Iterator, AsyncIterator
+import datetime
+import heapq
+import itertools
+import numpy as np
+from tempoo.civil import timestamps2microseconds, microseconds2timestamps
+from tempoo.utc import utc2microseconds, UTCArray
+
+"""
+k-way merge of time sorted streams (e.g. the events of many stations) into one time sorted feed
+
+each stream is sorted by time, it is given as an array, an iterable of chunks (arrays or lists)
+or an iterable of single times ; the times are float timestamps, int64 microseconds or UTC objects
+the output is a sequence of chunks (times, streams, indices) :
+    indices = position of each time in its stream, e.g. to fetch the payload
+the equal times are ordered by stream number, the memory holds about one chunk per stream
+"""
+
+
+class MergedChunk(NamedTuple):
+    times: np.ndarray  # timestamps, or int64 microseconds (see the microseconds argument of merge_streams)
+    streams: np.ndarray  # index of the stream of each time
+    indices: np.ndarray  # index of each time in its stream
+
+
+def _is_scalar(item) -> bool:
+    return isinstance(item, (datetime.datetime, float, int, np.generic))
+
+
+def _iter_chunks(stream, chunk_size: int) -> Iterator:
+    """the chunks of one stream, single times are grouped by chunk_size"""
+    if isinstance(stream, UTCArray):
+        # sliced like an array, not iterated as UTC objects
+        stream = stream.microseconds
+    if isinstance(stream, np.ndarray):
+        for start in range(0, len(stream), chunk_size):
+            yield stream[start:start + chunk_size]
+        return
+
+    iterator = iter(stream)
+    for first in iterator:
+        if _is_scalar(first):
+            iterator = itertools.chain([first], iterator)
+            while True:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+        yield first
+        yield from iterator
+        return
+
+
+class _MergeState(object):
+    """buffers and heap of the k-way merge, shared by merge_streams and amerge_streams"""
+
+    def __init__(self, nstreams: int, chunk_size: int, microseconds: Union[None, bool]):
+        self.chunk_size = chunk_size
+        self.microseconds = microseconds
+        self.buffers = [[] for _ in range(nstreams)]  # pending chunks of each stream
+        self.offsets = [0] * nstreams  # index in the stream of the first pending time
+        self.last_times = [None] * nstreams  # last time read from each stream
+        self.nbuffered = 0
+        # (last pending time, stream) of the streams not exhausted :
+        # the stream at the top is the next one to read,
+        # every pending time lower than its last time can be sent
+        self.heap = []
+
+    def as_times(self, chunk) -> np.ndarray:
+        if isinstance(chunk, UTCArray):
+            chunk = chunk.microseconds
+        if isinstance(chunk, np.ndarray) and chunk.dtype.kind in 'iuf':
+            times = chunk
+        elif len(chunk) and isinstance(chunk[0], datetime.datetime):
+            times = np.fromiter((utc2microseconds(utc) for utc in chunk), np.int64, count=len(chunk))
+        else:
+            times = np.asarray(chunk)
+            if times.size == 0:
+                times = times.astype(float)
+        times = times.ravel()
+
+        integer = times.dtype.kind in 'iu'
+        if self.microseconds is None:
+            self.microseconds = integer
+        if self.microseconds and not integer:
+            return timestamps2microseconds(times)
+        elif not self.microseconds and integer:
+            return microseconds2timestamps(times)
+        return times
+
+    def push(self, stream: int, chunk) -> bool:
+        """add the next chunk of a stream, False for an empty chunk"""
+        times = self.as_times(chunk)
+        if not len(times):
+            return False
+        last_time = self.last_times[stream]
+        if (times[1:] < times[:-1]).any() or (last_time is not None and times[0] < last_time):
+            raise ValueError(f'stream {stream} is not sorted')
+        self.last_times[stream] = times[-1]
+        self.buffers[stream].append(times)
+        self.nbuffered += len(times)
+        heapq.heappush(self.heap, (times[-1], stream))
+        return True
+
+    def pop(self) -> int:
+        """the stream to read next"""
+        return heapq.heappop(self.heap)[1]
+
+    def emit(self, final: bool = False) -> Union[None, MergedChunk]:
+        """send the pending times that no future time can precede"""
+        if not final:
+            if not self.heap or self.nbuffered < self.chunk_size:
+                return None
+            bound, bound_stream = self.heap[0]
+
+        times, streams, indices = [], [], []
+        for stream, buffer in enumerate(self.buffers):
+            if not buffer:
+                continue
+            pending = np.concatenate(buffer) if len(buffer) > 1 else buffer[0]
+            if final:
+                n = len(pending)
+            else:
+                # the equal times are sorted by stream
+                n = np.searchsorted(pending, bound, side="right" if stream <= bound_stream else "left")
+            if not n:
+                self.buffers[stream] = [pending]
+                continue
+            times.append(pending[:n])
+            streams.append(np.full(n, stream, np.int64))
+            indices.append(np.arange(self.offsets[stream], self.offsets[stream] + n))
+            self.buffers[stream] = [pending[n:]] if n < len(pending) else []
+            self.offsets[stream] += n
+            self.nbuffered -= n
+
+        if not times:
+            return None
+        times, streams, indices = np.concatenate(times), np.concatenate(streams), np.concatenate(indices)
+        order = np.lexsort((streams, times))
+        return MergedChunk(times[order], streams[order], indices[order])
+
+
+def merge_streams(streams: Iterable, chunk_size: int = 65536,
+                  microseconds: Union[None, bool] = None) -> Iterator[MergedChunk]:
+    """
+    merge time sorted streams, lazily
+    :param streams: list of streams, each one is an array, an iterable of chunks (arrays, lists, UTCArray)
+        or an iterable of single times (float timestamps, int64 microseconds or UTC)
+    :param chunk_size: approximate number of times per output chunk, and per input chunk for the
+        arrays and single times
+    :param microseconds: output int64 microseconds (True) or float timestamps (False),
+        default : same as the first chunk read (UTC => microseconds)
+    :return chunks: generator of MergedChunk(times, streams, indices)
+    """
+    iterators = [_iter_chunks(stream, chunk_size) for stream in streams]
+    state = _MergeState(len(iterators), chunk_size, microseconds)
+
+    def read(stream: int):
+        for chunk in iterators[stream]:
+            if state.push(stream, chunk):
+                return
+
+    for stream in range(len(iterators)):
+        read(stream)
+    while state.heap:
+        chunk = state.emit()
+        if chunk is not None:
+            yield chunk
+        read(state.pop())
+    chunk = state.emit(final=True)
+    if chunk is not None:
+        yield chunk
+
+
+async def _aiter_chunks(stream, chunk_size: int) -> AsyncIterator:
+    if not hasattr(stream, '__aiter__'):
+        for chunk in _iter_chunks(stream, chunk_size):
+            yield chunk
+        return
+
+    batch = []
+    async for item in stream:
+        if _is_scalar(item):
+            batch.append(item)
+            if len(batch) == chunk_size:
+                yield batch
+                batch = []
+        else:
+            if batch:
+                yield batch
+                batch = []
+            yield item
+    if batch:
+        yield batch
+
+
+async def amerge_streams(streams: Iterable, chunk_size: int = 65536,
+                         microseconds: Union[None, bool] = None) -> AsyncIterator[MergedChunk]:
+    """
+    asyncio version of merge_streams, for live feeds : the streams may be async iterables
+    (of chunks or of single times) or regular iterables
+    a merged chunk is produced once every stream has provided data beyond it, so that a silent
+    stream delays the output (close it or end its iterator to release the others)
+    """
+    iterators = [_aiter_chunks(stream, chunk_size) for stream in streams]
+    state = _MergeState(len(iterators), chunk_size, microseconds)
+
+    async def read(stream: int):
+        async for chunk in iterators[stream]:
+            if state.push(stream, chunk):
+                return
+
+    for stream in range(len(iterators)):
+        await read(stream)
+    while state.heap:
+        chunk = state.emit()
+        if chunk is not None:
+            yield chunk
+        await read(state.pop())
+    chunk = state.emit(final=True)
+    if chunk is not None:
+        yield chunk
+
+
+def merge_all(streams: Iterable, chunk_size: int = 65536, microseconds: Union[None, bool] = None) -> MergedChunk:
+    """merge_streams, concatenated into a single MergedChunk"""
+    chunks = list(merge_streams(streams, chunk_size=chunk_size, microseconds=microseconds))
+    if not chunks:
+        empty = np.zeros(0, np.int64)
+        return MergedChunk(empty if microseconds else empty.astype(float), empty, empty)
+    return MergedChunk(*[np.concatenate(column) for column in zip(*chunks)])
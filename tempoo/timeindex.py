@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import datetime
+import re
+from typing import Union
+import numpy as np
+from tempoo.civil import MICROSECONDS_PER_SECOND, MICROSECONDS_PER_MINUTE, MICROSECONDS_PER_HOUR, \
+    MICROSECONDS_PER_DAY, add_months_to_date, timestamps2microseconds
+from tempoo.utc import UTCTZINFO, utc2microseconds, UTCArray
+
+"""
+sorted time array with attached columns, sliced by time with binary searches
+the slices are views of the arrays (no copy)
+
+    index = TimeIndex(timestamps, amplitude=amplitudes)
+    index["2021-03"]                         # march 2021
+    index["2021-03-05T12":"2021-03-06"]      # from 2021-03-05T12:00:00 to the end of 2021-03-06
+    index[UTC(2021, 3, 5):1615000000.]       # UTC or timestamps, bounds included
+    index["2021-03"].columns['amplitude']
+
+partial strings follow the format of str(UTC) (YYYY-MM-DDTHH:MM:SS.ffffffZ) truncated after any field,
+a partial string stands for the period [floor, ceil[ at its precision
+"""
+
+_PARTIAL_STR = re.compile(
+    r"^(?P<year>\d{4})"
+    r"(?:-(?P<month>\d{2})"
+    r"(?:-(?P<day>\d{2})"
+    r"(?:T(?P<hour>\d{2})"
+    r"(?::(?P<minute>\d{2})"
+    r"(?::(?P<second>\d{2})"
+    r"(?:\.(?P<fraction>\d{1,6}))?)?)?)?)?)?Z?$")
+
+
+def partial_str2microseconds(string: str) -> (int, int):
+    """
+    period represented by a partial time string, e.g. 2021-03 => [2021-03-01, 2021-04-01[
+    :param string: YYYY, YYYY-MM, YYYY-MM-DD, YYYY-MM-DDTHH, ..., YYYY-MM-DDTHH:MM:SS.ffffff, optional final Z
+    :return start, end: integer microseconds since 1970-01-01, end excluded
+    """
+    match = _PARTIAL_STR.match(string)
+    if match is None:
+        raise ValueError(f'could not parse the time string {string!r}')
+    fields = match.groupdict()
+    year, month, day = int(fields['year']), int(fields['month'] or 1), int(fields['day'] or 1)
+    hour, minute, second = int(fields['hour'] or 0), int(fields['minute'] or 0), int(fields['second'] or 0)
+    fraction = fields['fraction'] or ''
+    microsecond = int(fraction.ljust(6, '0'))
+    # validates the fields like UTCFromStr
+    start = utc2microseconds(
+        datetime.datetime(year, month, day, hour, minute, second, microsecond, tzinfo=UTCTZINFO))
+
+    if fields['month'] is None:
+        end = utc2microseconds(datetime.datetime(year + 1, 1, 1, tzinfo=UTCTZINFO))
+    elif fields['day'] is None:
+        end = utc2microseconds(datetime.datetime(*add_months_to_date(year, month, 1, 1), tzinfo=UTCTZINFO))
+    elif fields['hour'] is None:
+        end = start + MICROSECONDS_PER_DAY
+    elif fields['minute'] is None:
+        end = start + MICROSECONDS_PER_HOUR
+    elif fields['second'] is None:
+        end = start + MICROSECONDS_PER_MINUTE
+    else:
+        end = start + 10 ** (6 - len(fraction))
+    return start, end
+
+
+class TimeIndex(object):
+    """
+    sorted times (float timestamps or int64 microseconds) and columns of the same length (first axis)
+    """
+
+    def __init__(self, times: np.ndarray, **columns):
+        times = np.asarray(times)
+        if times.ndim != 1:
+            raise ValueError('times must be a 1d array')
+        if times.dtype.kind not in 'iuf':
+            raise TypeError('times must be float timestamps or integer microseconds')
+        if (times[1:] < times[:-1]).any():
+            raise ValueError('times must be sorted')
+        columns = {name: np.asarray(column) for name, column in columns.items()}
+        for name, column in columns.items():
+            if column.ndim == 0 or len(column) != len(times):
+                raise ValueError(f'column {name} must have the same length as times')
+        self.times = times
+        self.columns = columns
+
+    @classmethod
+    def _view(cls, times: np.ndarray, columns: dict) -> TimeIndex:
+        # the input is already checked
+        self = cls.__new__(cls)
+        self.times = times
+        self.columns = columns
+        return self
+
+    def __len__(self):
+        return len(self.times)
+
+    def __repr__(self):
+        if len(self):
+            utcs = UTCArray(self._microseconds(self.times[[0, -1]]))
+            period = f"{utcs[0]} - {utcs[1]}"
+        else:
+            period = "empty"
+        return f"TimeIndex({len(self)} times, {period}, columns={list(self.columns)})"
+
+    @property
+    def microseconds(self) -> bool:
+        return self.times.dtype.kind in 'iu'
+
+    def _microseconds(self, times: np.ndarray) -> np.ndarray:
+        return times if self.microseconds else timestamps2microseconds(times)
+
+    def _as_time(self, microseconds: int) -> Union[int, float]:
+        return microseconds if self.microseconds else microseconds / MICROSECONDS_PER_SECOND
+
+    def _bound(self, value, stop: bool) -> int:
+        """position of a slice bound, the strings stand for whole periods"""
+        if isinstance(value, str):
+            start, end = partial_str2microseconds(value)
+            return int(np.searchsorted(self.times, self._as_time(end if stop else start), side="left"))
+        if isinstance(value, datetime.datetime):
+            value = self._as_time(utc2microseconds(value))
+        elif self.microseconds and isinstance(value, (float, np.floating)):
+            value = int(timestamps2microseconds(value))
+        return int(np.searchsorted(self.times, value, side="right" if stop else "left"))
+
+    def slice_indices(self, start=None, stop=None) -> slice:
+        """
+        positions of the times between start and stop
+        :param start, stop: UTC (aware datetime), timestamp, microseconds (for an integer index),
+            partial time string or None, bounds included
+        """
+        first = 0 if start is None else self._bound(start, stop=False)
+        last = len(self) if stop is None else self._bound(stop, stop=True)
+        return slice(first, max(first, last))
+
+    def between(self, start=None, stop=None) -> TimeIndex:
+        """sub index of the times between start and stop (bounds included), zero-copy"""
+        return self.iloc(self.slice_indices(start, stop))
+
+    def iloc(self, item: slice) -> TimeIndex:
+        """sub index by position, zero-copy for slices"""
+        return self._view(self.times[item], {name: column[item] for name, column in self.columns.items()})
+
+    def __getitem__(self, item) -> TimeIndex:
+        """
+        index["2021-03"] : the times of a period
+        index[start:stop] : see between
+        """
+        if isinstance(item, slice):
+            if item.step is not None:
+                raise ValueError('a time slice has no step')
+            return self.between(item.start, item.stop)
+        if isinstance(item, str):
+            return self.between(item, item)
+        raise TypeError(f'expect a partial time string or a slice, got {type(item)}')
+
+    def utcs(self) -> UTCArray:
+        return UTCArray(self._microseconds(self.times))
@@ -1,75 +1,481 @@
 #!/usr/bin/env python
-import sys, glob, os, time
-import curses
+import sys, os, time
+from typing import NamedTuple
 import numpy as np
-import matplotlib.pyplot as plt
-from tempoo.utc import UTCFromStr, UTCFromTimestamp
-from tempoo.timetick import timetick
+from tempoo.utc import UTCFromStr, STR_LENGTH, chars2microseconds
+from tempoo.intervals import IntervalIndex
+
+"""
+timeline viewer, the timeline file has one segment per line :
+linenumber,r/g/b,start,end,title
+e.g. 3,255/0/0,2023-01-01T00:00:00.000000Z,2023-01-02T12:00:00.000000Z,some task
+lines starting with # or without comma are ignored
+the file is watched, only the lines appended since the last read are parsed
+load_timeline reads a whole file into columnar arrays, without matplotlib
+"""
+
+
+def parse_timeline_line(line: str) -> tuple:
+    """
+    :param line: one line of a timeline file
+    :return row: (linenumber, (r, g, b), start, end, title) or None for comments and empty lines,
+        r, g, b are integers 0-255, start and end are timestamps
+    """
+    if line.startswith('#') or "," not in line:
+        return None
+
+    linenumber, rgb, start, end, title = line.rstrip('\r\n').split(',')
+    r, g, b = [int(_) for _ in rgb.split('/')]
+    try:
+        start = UTCFromStr(start)
+        end = UTCFromStr(end)
+    except Exception as err:
+        raise ValueError(f'could not read the times of line {line!r}') from err
+
+    return int(linenumber), (r, g, b), start.timestamp, end.timestamp, title
+
+
+class Timeline(NamedTuple):
+    rows: np.ndarray  # row numbers in the file, 1 = first line
+    linenumbers: np.ndarray
+    rgb: np.ndarray  # (n, 3) uint8
+    starts: np.ndarray  # timestamps or int64 microseconds
+    ends: np.ndarray
+    titles: np.ndarray  # str objects
+
+    def tolist(self) -> list:
+        """rows in the format of parse_timeline_line"""
+        return list(zip(
+            self.linenumbers.tolist(), map(tuple, self.rgb.tolist()),
+            (self.starts / 1e6 if self.starts.dtype.kind == "i" else self.starts).tolist(),
+            (self.ends / 1e6 if self.ends.dtype.kind == "i" else self.ends).tolist(),
+            self.titles.tolist()))
+
+
+def _parse_integers(buffer: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    parse the unsigned integers written in buffer[starts[i]:stops[i]]
+    :return values: int64 array
+    :return valid: False where the bytes are not all digits or the width is not in 1-9
+    """
+    widths = stops - starts
+    valid = (widths >= 1) & (widths <= 9)
+    values = np.zeros(len(starts), np.int64)
+    for k in range(int(widths[valid].max(initial=0))):
+        inside = valid & (k < widths)
+        digits = buffer[np.where(inside, starts + k, 0)].astype(np.int64) - ord('0')
+        valid &= ~inside | ((digits >= 0) & (digits <= 9))
+        values = np.where(inside, values * 10 + digits, values)
+    return values, valid
+
+
+def parse_timeline_buffer(buffer: np.ndarray, first_row: int = 1, microseconds: bool = False,
+                          filename: str = "timeline") -> Timeline:
+    """
+    parse the content of a timeline file with numpy,
+    rows that do not fit the vectorized parser are parsed by parse_timeline_line
+    :param buffer: uint8 array with the content of the file (complete lines only)
+    :param first_row: row number of the first line in the buffer, for the error messages
+    :param microseconds: if True, starts and ends are int64 microseconds, else timestamps
+    :param filename: for the error messages
+    :return timeline: a Timeline of columnar arrays
+    :raises ValueError: with the row numbers of the malformed lines
+    """
+    buffer = np.asarray(buffer, np.uint8)
+    newlines = np.flatnonzero(buffer == ord('\n'))
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_stops = np.concatenate((newlines, [len(buffer)]))
+    if line_starts[-1] == len(buffer):
+        # ends with a new line
+        line_starts, line_stops = line_starts[:-1], line_stops[:-1]
+    carriage = (line_stops > line_starts) & (buffer[np.maximum(line_stops - 1, 0)] == ord('\r'))
+    line_stops = line_stops - carriage
+    rows = np.arange(first_row, first_row + len(line_starts))
+
+    # comments and lines without comma are ignored
+    commas = np.flatnonzero(buffer == ord(','))
+    comma_lines = np.searchsorted(line_starts, commas, side='right') - 1
+    ncommas = np.bincount(comma_lines, minlength=len(line_starts))
+    comment = (line_stops > line_starts) & (buffer[np.minimum(line_starts, max(len(buffer) - 1, 0))] == ord('#'))
+    keep = (ncommas > 0) & ~comment
+    line_starts, line_stops, rows = line_starts[keep], line_stops[keep], rows[keep]
+    valid = ncommas[keep] == 4
+
+    # positions of the 4 commas of each line
+    first_comma = np.searchsorted(commas, line_starts)
+    c1, c2, c3, c4 = [commas[np.minimum(first_comma + k, max(len(commas) - 1, 0))] if len(commas)
+                      else np.zeros(len(line_starts), np.int64) for k in range(4)]
+
+    linenumbers, valid_linenumbers = _parse_integers(buffer, line_starts, c1)
+    valid &= valid_linenumbers
+
+    # r/g/b
+    slashes = np.flatnonzero(buffer == ord('/'))
+    first_slash = np.searchsorted(slashes, c1)
+    s1 = slashes[np.minimum(first_slash, max(len(slashes) - 1, 0))] if len(slashes) else c1
+    s2 = slashes[np.minimum(first_slash + 1, max(len(slashes) - 1, 0))] if len(slashes) else c1
+    valid &= (first_slash + 1 < len(slashes)) & (c1 < s1) & (s1 < s2) & (s2 < c2)
+    rgb = np.zeros((len(rows), 3), np.int64)
+    for k, (start, stop) in enumerate(((c1 + 1, s1), (s1 + 1, s2), (s2 + 1, c2))):
+        rgb[:, k], valid_color = _parse_integers(buffer, start, stop)
+        valid &= valid_color
+    valid &= (rgb <= 255).all(axis=1)
+
+    # times in the format of str(UTC)
+    times = []
+    for start, stop in ((c2 + 1, c3), (c3 + 1, c4)):
+        valid &= stop - start == STR_LENGTH
+        chars = buffer[np.minimum(
+            np.where(valid, start, 0)[:, np.newaxis] + np.arange(STR_LENGTH), max(len(buffer) - 1, 0))]
+        time_microseconds, valid_times = chars2microseconds(chars)
+        valid &= valid_times
+        times.append(time_microseconds)
+    starts, ends = times
+
+    # other rows, one by one
+    malformed = []
+    for n in np.flatnonzero(~valid):
+        try:
+            line = bytes(buffer[line_starts[n]:line_stops[n]]).decode()
+            linenumber, (r, g, b), start, end, title = parse_timeline_line(line)
+            if not 0 <= r <= 255 or not 0 <= g <= 255 or not 0 <= b <= 255:
+                raise ValueError(f'rgb out of range {r}/{g}/{b}')
+        except ValueError as err:
+            malformed.append(f'row {rows[n]}: {err}')
+            continue
+        linenumbers[n] = linenumber
+        rgb[n] = r, g, b
+        starts[n] = round(start * 1e6)
+        ends[n] = round(end * 1e6)
+    if len(malformed):
+        raise ValueError(
+            f'{filename}: {len(malformed)} malformed line(s)\n' + '\n'.join(malformed[:20]))
+
+    titles = np.empty(len(rows), object)
+    titles[:] = [bytes(buffer[start:stop]).decode()
+                 for start, stop in zip((c4 + 1).tolist(), line_stops.tolist())]
+
+    if not microseconds:
+        starts, ends = starts / 1e6, ends / 1e6
+
+    return Timeline(rows=rows, linenumbers=linenumbers, rgb=rgb.astype(np.uint8),
+                    starts=starts, ends=ends, titles=titles)
+
+
+def load_timeline(filename: str, mmap: bool = False, microseconds: bool = False) -> Timeline:
+    """
+    read a timeline file into columnar arrays
+    :param filename: timeline file
+    :param mmap: if True, the file is memory-mapped instead of being read in memory
+    :param microseconds: if True, starts and ends are int64 microseconds, else timestamps
+    :return timeline: a Timeline with the arrays rows, linenumbers, rgb, starts, ends, titles
+    :raises ValueError: with the row numbers of the malformed lines
+    """
+    with open(filename, 'rb') as fid:
+        if not mmap or os.fstat(fid.fileno()).st_size == 0:
+            return parse_timeline_buffer(
+                np.frombuffer(fid.read(), np.uint8), microseconds=microseconds, filename=filename)
+
+        import mmap as mmap_module
+        mapped = mmap_module.mmap(fid.fileno(), 0, access=mmap_module.ACCESS_READ)
+        try:
+            return parse_timeline_buffer(
+                np.frombuffer(mapped, np.uint8), microseconds=microseconds, filename=filename)
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                # still referenced by a traceback, will be closed by the garbage collector
+                pass
+
+
+def _append_rows(array: np.ndarray, nrows: int, new_rows: np.ndarray) -> np.ndarray:
+    """
+    write new_rows after the first nrows rows of array, the capacity is doubled when needed
+    => appending is amortized O(1) per row
+    :return array: the same array, or a larger copy
+    """
+    total = nrows + len(new_rows)
+    if total > len(array):
+        grown = np.empty((max(total, 2 * len(array), 1024),) + array.shape[1:], array.dtype)
+        grown[:nrows] = array[:nrows]
+        array = grown
+    array[nrows:total] = new_rows
+    return array
+
+
+class TimelineReader(object):
+    """
+    read a timeline file incrementally,
+    remembers the offset of the last complete line read and the rows parsed so far (columnar arrays)
+    """
+
+    MARKER_LENGTH = 64  # bytes before the offset checked to detect a file rewritten in place
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.nlines = 0  # number of complete lines read
+        self.nrows = 0  # number of rows parsed
+        self.stat = None
+        self.marker = b""  # last bytes read before the offset
+        self._columns = parse_timeline_buffer(np.zeros(0, np.uint8))  # the capacity may exceed nrows
+
+    @property
+    def timeline(self) -> Timeline:
+        """the rows parsed so far, views of the arrays valid until the next read"""
+        return Timeline(*[column[:self.nrows] for column in self._columns])
+
+    @property
+    def rows(self) -> list:
+        """the rows parsed so far, in the format of parse_timeline_line"""
+        return self.timeline.tolist()
+
+    def _append(self, timeline: Timeline):
+        self._columns = Timeline(*[
+            _append_rows(column, self.nrows, new_column) for column, new_column in zip(self._columns, timeline)])
+        self.nrows += len(timeline.rows)
+
+    def changed(self) -> bool:
+        """True if the file was modified since the last read"""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return False
+
+        return self.stat is None or \
+            (stat.st_size, stat.st_mtime_ns, stat.st_ino) != \
+            (self.stat.st_size, self.stat.st_mtime_ns, self.stat.st_ino)
+
+    def read(self) -> (Timeline, bool):
+        """
+        parse the lines appended since the last read,
+        start over if the file was truncated, replaced or rewritten in place
+        :return new_timeline: the rows parsed during this call, as columnar arrays
+        :return reset: True if the file was read from the beginning again
+        """
+        with open(self.filename, 'rb') as fid:
+            stat = os.fstat(fid.fileno())
+            reset = self.stat is not None and \
+                (stat.st_ino != self.stat.st_ino or stat.st_size < self.offset)
+            if not reset and self.marker:
+                # a file rewritten in place may not be shorter : check the end of the last line read
+                fid.seek(self.offset - len(self.marker))
+                reset = fid.read(len(self.marker)) != self.marker
+            if reset:
+                self.reset()
+            self.stat = stat
+
+            fid.seek(self.offset)
+            data = fid.read()
+
+        # ignore the last line until it is complete
+        end = data.rfind(b'\n') + 1
+        new_timeline = parse_timeline_buffer(
+            np.frombuffer(data, np.uint8)[:end],
+            first_row=self.nlines + 1, filename=self.filename)
+        self.offset += end
+        self.nlines += data.count(b'\n', 0, end)
+        self.marker = (self.marker + data[max(end - self.MARKER_LENGTH, 0):end])[-self.MARKER_LENGTH:]
+
+        self._append(new_timeline)
+        return new_timeline, reset
+
+
+class TimelineViewer(object):
+    """
+    display the rows of a TimelineReader,
+    one LineCollection per color for the segments, new rows are added incrementally
+    only the titles of the segments starting in the view are written (at most max_titles),
+    the titles of the segments active at the current time are written in bold
+    """
+
+    def __init__(self, ax, reader: TimelineReader, max_titles: int = 200):
+        from tempoo.timetick import timetick
+
+        self.ax = ax
+        self.reader = reader
+        self.max_titles = max_titles
+        self.nrows = 0  # number of rows of the reader displayed
+        self.collections = {}  # rgb : LineCollection
+        self.caps = {}  # rgb : Line2D with the markers at both ends of the segments
+        self.segments = {}  # rgb : (capacity, 2 points, (x, y)) array, see _append_rows
+        self.nsegments = {}  # rgb : number of segments
+        self.texts = []  # reused for the visible titles, the extra ones are hidden
+        self.title_rows = np.zeros(0, int)  # index of the row of each visible title
+        self.yticks = {}
+        # index of the first nindexed rows, the rows appended since are scanned,
+        # the index is rebuilt when they exceed a fraction of it => amortized O(log n) per row
+        self.index = IntervalIndex([], [])
+        self.nindexed = 0
+        self.active = np.zeros(0, int)  # indices of the rows active at the current time
+        self.now_line = ax.axvline(time.time(), color="r", linestyle="--")
+        ax.grid(True)
+        timetick(ax)
+        ax.callbacks.connect('xlim_changed', self.draw_titles)
+        ax.callbacks.connect('ylim_changed', self.draw_titles)
+
+    def clear(self):
+        for artist in list(self.collections.values()) + list(self.caps.values()) + self.texts:
+            artist.remove()
+        self.nrows = 0
+        self.collections.clear()
+        self.caps.clear()
+        self.segments.clear()
+        self.nsegments.clear()
+        self.texts.clear()
+        self.title_rows = np.zeros(0, int)
+        self.yticks.clear()
+        self.index = IntervalIndex([], [])
+        self.nindexed = 0
+        self.active = np.zeros(0, int)
+
+    def add_rows(self, timeline: Timeline):
+        """
+        :param timeline: the new rows, as columnar arrays (timestamps)
+        """
+        from matplotlib.collections import LineCollection
+        from matplotlib.path import Path
+
+        for linenumber, title in zip(timeline.linenumbers.tolist(), timeline.titles.tolist()):
+            try:
+                self.yticks[linenumber] += " / " + title
+            except KeyError:
+                self.yticks[linenumber] = f"{linenumber:03d} {title}"
+
+        colors, color_ids = np.unique(timeline.rgb, axis=0, return_inverse=True)
+        color_ids = color_ids.ravel()
+        for color_id, rgb in enumerate(map(tuple, colors.tolist())):
+            selection = color_ids == color_id
+            new_segments = np.empty((selection.sum(), 2, 2))
+            new_segments[:, 0, 0] = timeline.starts[selection]
+            new_segments[:, 1, 0] = timeline.ends[selection]
+            new_segments[:, :, 1] = timeline.linenumbers[selection, np.newaxis]
+            if rgb not in self.collections:
+                color = np.asarray(rgb) / 255.
+                self.collections[rgb] = LineCollection([], linewidth=3, colors=[color])
+                self.ax.add_collection(self.collections[rgb])
+                self.caps[rgb], = self.ax.plot([], [], '|', markersize=10, color=color)
+                self.segments[rgb] = np.zeros((0, 2, 2))
+                self.nsegments[rgb] = 0
+
+            nsegments = self.nsegments[rgb]
+            self.segments[rgb] = _append_rows(self.segments[rgb], nsegments, new_segments)
+            self.nsegments[rgb] = nsegments = nsegments + len(new_segments)
+            segments = self.segments[rgb][:nsegments]
+            # set_segments would build one Path per segment, i.e. O(total rows) per append :
+            # only the paths of the new segments are added to the paths of the collection
+            collection = self.collections[rgb]
+            collection.get_paths().extend(Path(segment) for segment in new_segments)
+            collection.stale = True
+            self.caps[rgb].set_data(segments[:, :, 0].ravel(), segments[:, :, 1].ravel())
+
+        ax = self.ax
+        ax.set_yticks(list(self.yticks.keys()))
+        ax.set_yticklabels(list(self.yticks.values()))
+
+    def active_rows(self, time: float) -> np.ndarray:
+        """indices of the rows active at some time, sorted"""
+        timeline = self.reader.timeline
+        starts = timeline.starts[self.nindexed:self.nrows]
+        ends = timeline.ends[self.nindexed:self.nrows]
+        recent = np.flatnonzero((np.minimum(starts, ends) <= time) & (np.maximum(starts, ends) >= time))
+        return np.concatenate((self.index.active(time), self.nindexed + recent))
+
+    def update(self) -> bool:
+        """
+        read the new lines of the file if any, and move the current time line
+        :return modified: True if new rows were added
+        """
+        modified = False
+        if self.reader.changed():
+            new_timeline, reset = self.reader.read()
+            if reset:
+                self.clear()
+            timeline = self.reader.timeline
+            if self.nrows < len(timeline.rows):
+                new_rows = Timeline(*[column[self.nrows:] for column in timeline])
+                self.add_rows(new_rows)
+                self.nrows = len(timeline.rows)
+                if reset:
+                    self.ax.relim()
+                # extend the data limits with the new rows only (relim goes through all the segments)
+                self.ax.update_datalim(np.column_stack((
+                    np.concatenate((new_rows.starts, new_rows.ends)),
+                    np.tile(new_rows.linenumbers, 2))))
+                self.ax.autoscale_view()
+            modified = reset or len(new_timeline.rows) > 0
+            if self.nrows - self.nindexed > max(256, self.nindexed // 4):
+                starts, ends = timeline.starts[:self.nrows], timeline.ends[:self.nrows]
+                self.index = IntervalIndex(np.minimum(starts, ends), np.maximum(starts, ends))
+                self.nindexed = self.nrows
+
+        now = time.time()
+        self.now_line.set_xdata([now, now])
+        self.highlight(self.active_rows(now))
+        if modified:
+            self.draw_titles()
+        return modified
+
+    def draw_titles(self, ax=None):
+        """write the titles of the segments starting in the view, up to max_titles"""
+        timeline = self.reader.timeline
+        starts, linenumbers = timeline.starts[:self.nrows], timeline.linenumbers[:self.nrows]
+        xmin, xmax = sorted(self.ax.get_xlim())
+        ymin, ymax = sorted(self.ax.get_ylim())
+        visible = np.flatnonzero(
+            (starts >= xmin) & (starts <= xmax) & (linenumbers >= ymin) & (linenumbers <= ymax))
+        visible = visible[:self.max_titles]
+
+        while len(self.texts) < len(visible):
+            self.texts.append(self.ax.text(0., 0., "", ha="left", va="bottom"))
+        bold = np.isin(visible, self.active)
+        for text, n, is_bold in zip(self.texts, visible.tolist(), bold.tolist()):
+            text.set_position((starts[n], linenumbers[n]))
+            text.set_text(timeline.titles[n])
+            text.set_color(timeline.rgb[n] / 255.)
+            text.set_fontweight("bold" if is_bold else "normal")
+            text.set_visible(True)
+        for text in self.texts[len(visible):]:
+            text.set_visible(False)
+        self.title_rows = visible
+
+    def highlight(self, active: np.ndarray):
+        """write the titles of the active rows in bold"""
+        for text, is_bold in zip(self.texts, np.isin(self.title_rows, active).tolist()):
+            text.set_fontweight("bold" if is_bold else "normal")
+        self.active = active
 
 
 def main():
+    import matplotlib.pyplot as plt
 
     timeline_file = sys.argv[1]
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0  # seconds between two checks of the file
+
+    fig = plt.figure(figsize=(18, 4))
+    fig.subplots_adjust(left=0.3, right=1. - 0.01)
+    ax = fig.add_subplot(111)
+
+    viewer = TimelineViewer(ax, TimelineReader(timeline_file))
+    viewer.update()
+
+    def on_timer():
+        viewer.update()
+        fig.canvas.draw_idle()
+
+    timer = fig.canvas.new_timer(interval=int(interval * 1000))
+    timer.add_callback(on_timer)
+    timer.start()
+
+    try:
+        plt.show()
+    except KeyboardInterrupt:
+        sys.exit(1)
+
 
-    while True:
-        try:
-            now = UTCFromTimestamp(time.time())
-            fig = plt.figure(figsize=(18, 4))
-            fig.subplots_adjust(left=0.3, right=1. - 0.01)
-            ax = plt.gca()
-
-            yticks = {}
-
-            with open(timeline_file, 'r') as fid:
-                for n, l in enumerate(fid):
-                    if l.startswith('#'):
-                        continue
-                    if "," not in l:
-                        continue
-                    linenumber, rgb, start, end, title = l.split('\n')[0].split(',')
-                    linenumber = int(linenumber)
-                    r, g, b = np.asarray(rgb.split('/'), int) / 255.
-                    try:
-                        start = UTCFromStr(start)                        
-                        end = UTCFromStr(end)
-                    except:
-                        raise Exception(start, end)
-
-                    hdl, = ax.plot(
-                        [start.timestamp, end.timestamp],
-                        [linenumber, linenumber],
-                        '|-',
-                        linewidth=3,
-                        color=[r, g, b])
-                    ax.text(
-                        start.timestamp,
-                        linenumber, title,
-                        ha="left", 
-                        va="bottom",
-                        color=hdl.get_color())
-                    try:
-                        yticks[linenumber] += " / " + title
-                    except KeyError:
-                        yticks[linenumber] = f"{linenumber:03d} {title}"
-
-            ylim = ax.get_ylim()
-            ax.plot(now.timestamp * np.ones(2), ylim, 'r--')
-            ax.grid(True)
-            timetick(ax)
-
-            ax.set_yticks(list(yticks.keys()))
-            ax.set_yticklabels(list(yticks.values()))
-
-            plt.ion()
-            plt.show()
-            ans = input('q=quit, else redraw')
-
-            if ans.lower() == "q":
-                break
-            plt.close(fig)
-        except KeyboardInterrupt:
-            sys.exit(1)
-          
-            
 if __name__ == "__main__":
-    main()            
+    main()
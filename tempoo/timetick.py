@@ -1,8 +1,10 @@
+import datetime
 from typing import Optional
 from functools import lru_cache
 from matplotlib import ticker, axes
 from matplotlib.ticker import Formatter, Locator, MaxNLocator, AutoLocator, AutoMinorLocator
 from tempoo.utc import *
+from tempoo.gps import gps2timestamp, timestamp2gps
 import numpy as np
 
 MINUTE = 60.
@@ -41,8 +43,7 @@ class YearTicker(object):
     def days(self) -> list:
         """list the day timestamps in this year"""
         last_day_of_year = (self.year_end_utc - 12. * 3600.).julday
-        return [UTCFromJulday(year=self.year_int, julday=j, hour=0).timestamp
-                for j in range(1, last_day_of_year)]
+        return julday2timestamps(self.year_int, np.arange(1, last_day_of_year)).tolist()
 
     @staticmethod
     def add_to_ticks(old_ticks, new_ticks, start_timestamp, end_timestamp):
@@ -159,14 +160,61 @@ class YearTicker(object):
             yield ticks
 
 
+# sub-day steps (seconds) from coarse to fine, for the locators with uniform steps
+SUBDAY_STEPS = [
+    12 * HOUR, 6 * HOUR, 3 * HOUR, HOUR,
+    30 * MINUTE, 10 * MINUTE, 2 * MINUTE, MINUTE,
+    30., 10., 5., 1.,
+    0.5, 0.1, 0.05, 0.025, 0.005, 0.001,
+    500e-6, 100e-6, 50e-6, 25e-6, 5e-6, 1e-6]
+
+
+def select_ticks(tick_levels, maxticks: int) -> list:
+    """
+    the tick-step engine shared by all the time locators
+    :param tick_levels: an iterator over lists of ticks, from the coarsest to the finest precision
+    :param maxticks: maximum number of ticks
+    :return ticks: the finest list of ticks with no more than maxticks ticks
+        (or the first non empty one)
+    """
+    ticks = []  # to store the tick positions (timestamps)
+    try:
+        for next_ticks in tick_levels:
+            if len(ticks) and (len(next_ticks) > maxticks):
+                # if the desired level of accuracy has been exceeded
+                # ignore next_ticks and return ticks
+                break
+            ticks = next_ticks  # move to new level of accuracy
+    finally:
+        if hasattr(tick_levels, "close"):
+            tick_levels.close()
+    return list(ticks)
+
+
+def uniform_tick_levels(vmin: float, vmax: float, steps: list, origin: float = 0.):
+    """
+    a generator of lists of ticks at origin + k * step between vmin and vmax, for each step
+    """
+    for step in steps:
+        if step < 1.:
+            # anchor the sub-second ticks on a round second to preserve the precision
+            anchor = origin + np.floor(vmin - origin)
+        else:
+            anchor = origin
+        kmin = np.ceil((vmin - anchor) / step)
+        kmax = np.floor((vmax - anchor) / step)
+        yield list(anchor + np.arange(kmin, kmax + 1) * step)
+
+
 class TimeLocator(ticker.LinearLocator):
     def __init__(self, maxticks=5):
         ticker.LinearLocator.__init__(self)
         self.maxticks = maxticks
 
-    def tick_values(self, vmin: float, vmax: float):
+    def tick_levels(self, vmin: float, vmax: float):
         """
-        return nice tick locations between two dates (timestamps)
+        a generator of lists of nice tick locations between two dates (timestamps)
+        each iteration increases the precision
         """
 
         # if vmin < 0:
@@ -184,39 +232,94 @@ class TimeLocator(ticker.LinearLocator):
             tick_generator = YearTicker(year).ticks(vmin, vmax)
             tick_generators.append(tick_generator)
 
-        ticks = []  # to store the tick positions (timestamps)
-        while True:
-            try:
-                # prepare the next list of ticks (with one more level of accuracy)
-                next_ticks = []
-                for tick_generator in tick_generators:
-                    year_ticks = next(tick_generator)  # get the next of list of ticks for this year
-                    next_ticks.append(year_ticks)
-                    # print('**', next_ticks)
-                next_ticks = list(np.hstack(next_ticks))
-                if len(ticks) and (len(next_ticks) > self.maxticks):
-                    # if the desired level of accuracy has been exceeded
-                    # ignore next_ticks and return ticks
-                    break
-                ticks = next_ticks  # move to new level of accuracy
-                # for _ in ticks:
-                #     print(str(UTCFromTimestamp(_)))
-                # print(np.round(np.array(ticks)[1:] - np.array(ticks)[:-1],4))
-                # print('')
-
-            except StopIteration as err:
-                # max accuracy reached for at least one year.
-                break
+        try:
+            while True:
+                try:
+                    # prepare the next list of ticks (with one more level of accuracy)
+                    # get the next of list of ticks for each year
+                    next_ticks = [next(tick_generator) for tick_generator in tick_generators]
+                except StopIteration:
+                    # max accuracy reached for at least one year.
+                    return
+                yield list(np.hstack(next_ticks))
+
+        finally:
+            for tick_generator in tick_generators:
+                tick_generator.close()
+
+    def tick_values(self, vmin: float, vmax: float):
+        """
+        return nice tick locations between two dates (timestamps)
+        """
+        return select_ticks(self.tick_levels(vmin, vmax), self.maxticks)
 
-        for tick_generator in tick_generators:
-            tick_generator.close()
 
-        return ticks
+class JuldayLocator(TimeLocator):
+    """
+    ticks at round years, then round day of year values, then round times of the day
+    """
+    year_steps: list = [1000, 500, 100, 50, 20, 10, 5, 2, 1]
+    julday_steps: list = [100, 50, 20, 10, 5, 2, 1]
+
+    def tick_levels(self, vmin: float, vmax: float):
+        vmin, vmax = sorted([vmin, vmax])
+        years = np.arange(UTCFromTimestamp(vmin).year, UTCFromTimestamp(vmax).year + 2)
+        year_starts = np.asarray([UTC(int(year)).timestamp for year in years], float)
+        years, year_ends, year_starts = years[:-1], year_starts[1:], year_starts[:-1]
+        in_view = (year_starts >= vmin) & (year_starts <= vmax)
+
+        # ==== year precision
+        for step in self.year_steps:
+            yield list(year_starts[in_view & (years % step == 0)])
+
+        # ==== julday precision
+        number_of_days = np.round((year_ends - year_starts) / DAY).astype(int)
+        for step in self.julday_steps:
+            ticks = []
+            for year_start, ndays in zip(year_starts, number_of_days):
+                juldays = np.arange(step, ndays + 1, step)
+                if step >= 10:
+                    # the first day of the year is not round, but it is a year boundary
+                    juldays = np.hstack((1, juldays))
+                ticks.append(year_start + (juldays - 1) * DAY)
+            ticks = np.hstack(ticks)
+            yield list(ticks[(ticks >= vmin) & (ticks <= vmax)])
+
+        # ==== hour, minute, second and sub-second precision
+        yield from uniform_tick_levels(vmin, vmax, SUBDAY_STEPS)
+
+
+class GPSWeekLocator(TimeLocator):
+    """
+    for data in seconds since the GPS_EPOCH
+    ticks at round GPS weeks, then round days and times of week
+    """
+    week_steps: list = [1000, 500, 100, 50, 10, 5, 2, 1]
+
+    def tick_levels(self, vmin: float, vmax: float):
+        vmin, vmax = sorted([vmin, vmax])
+        steps = [step * WEEK for step in self.week_steps] + [DAY] + SUBDAY_STEPS
+        # the GPS_EPOCH is the origin of the gps weeks
+        yield from uniform_tick_levels(vmin, vmax, steps, origin=0.)
+
+
+class GPSCalendarLocator(TimeLocator):
+    """
+    for data in seconds since the GPS_EPOCH
+    ticks at the same round calendar dates (UTC) as TimeLocator
+    """
+    def tick_values(self, vmin: float, vmax: float):
+        # convert the view limits and the ticks once per redraw, with vectorized leap second lookups
+        utc_vmin, utc_vmax = gps2timestamp(np.asarray([vmin, vmax], float))
+        ticks = TimeLocator.tick_values(self, utc_vmin, utc_vmax)
+        return list(timestamp2gps(np.asarray(ticks, float)))
 
 
 class CalendarTimeFormatter(Formatter):
     offset_string: str = ""
     range_separator = "~"
+    _offset_prefixes_cache: tuple = (None, ())
+    _minute_label_cache: tuple = (None, "")
 
     def __init__(self, force_offset_string: Optional[str]=None, *args, **kwargs):
         Formatter.__init__(self, *args, **kwargs)
@@ -351,15 +454,47 @@ class CalendarTimeFormatter(Formatter):
                                 utimes_str = [_[:-3] for _ in utimes_str]
         return utimes_str
 
+    def _offset_prefixes(self) -> tuple:
+        """
+        the prefixes to remove from the dynamic ticker,
+        parsed once for each new offset_string (i.e. once per redraw, not per mouse move)
+        """
+        offset_string = self.offset_string
+        cached_offset_string, prefixes = self._offset_prefixes_cache
+        if cached_offset_string is offset_string:
+            return prefixes
+
+        if self.range_separator in offset_string:
+            prefixes = tuple(offset_string.split(self.range_separator))
+        elif offset_string:
+            prefixes = (offset_string,)
+        else:
+            prefixes = ()
+
+        self._offset_prefixes_cache = (offset_string, prefixes)
+        return prefixes
+
     def __call__(self, timevalue, pos=None):
         # format the dynamic ticker on top of the window
-        ans = str(UTCFromTimestamp(timevalue))
-        if self.range_separator in self.offset_string:
-            beg, end = self.offset_string.split(self.range_separator)
-            ans = ans.split(beg)[-1].split(end)[-1]
-
-        else:
-            ans = ans.split(self.offset_string)[-1]
+        # called on every mouse move => avoid building a UTC object and strftime
+        # split the time into integer microseconds (same rounding as datetime.fromtimestamp)
+        integer_part = int(timevalue)
+        microseconds = integer_part * 1000000 + int(round((timevalue - integer_part) * 1e6))
+        minutes, microseconds = divmod(microseconds, 60000000)
+        seconds, microseconds = divmod(microseconds, 1000000)
+
+        prefixes = self._offset_prefixes()
+        cached_minutes, minute_label = self._minute_label_cache
+        if cached_minutes != minutes:
+            # the label up to the minutes is the same as long as the cursor stays in the same minute
+            d = datetime.datetime.fromtimestamp(minutes * 60, tz=UTCTZINFO)
+            minute_label = f"{d.year:04d}-{d.month:02d}-{d.day:02d}T{d.hour:02d}:{d.minute:02d}:"
+            self._minute_label_cache = (minutes, minute_label)
+
+        ans = f"{minute_label}{seconds:02d}.{microseconds:06d}Z"
+        for prefix in prefixes:
+            if ans.startswith(prefix):
+                return ans[len(prefix):]
         return ans
 
 
@@ -369,7 +504,7 @@ class JuldayTimeFormatter(CalendarTimeFormatter):
         self.set_locs(timevalues)
         utimes = [UTCFromTimestamp(timevalue) for timevalue in timevalues]
         time_range = timevalues[-1] - timevalues[0]
-        utimes_str = [f"{_.year:04d}-{_.julday:03d}T{_.hour:02d}:{_.minute:02d}:{_.second:02d}.{_.microsecond*1e6:06.0f}Z" for _ in utimes]
+        utimes_str = [f"{_.year:04d}-{_.julday:03d}T{_.hour:02d}:{_.minute:02d}:{_.second:02d}.{_.microsecond:06d}Z" for _ in utimes]
         self.offset_string = ""
 
         # ===== strip the left side of the tick labels
@@ -445,6 +580,57 @@ class JuldayTimeFormatter(CalendarTimeFormatter):
         return utimes_str
 
 
+class GPSCalendarTimeFormatter(CalendarTimeFormatter):
+    """
+    for data in seconds since the GPS_EPOCH, labels in UTC calendar dates
+    """
+    def format_ticks(self, gpsvalues):
+        # one vectorized conversion for all the ticks
+        timevalues = gps2timestamp(np.asarray(gpsvalues, float))
+        return CalendarTimeFormatter.format_ticks(self, timevalues)
+
+    def __call__(self, gpsvalue, pos=None):
+        return CalendarTimeFormatter.__call__(self, gps2timestamp(gpsvalue), pos)
+
+
+class GPSWeekFormatter(Formatter):
+    """
+    for data in seconds since the GPS_EPOCH, labels in GPS week / time of week (seconds)
+    """
+    offset_string: str = ""
+
+    def get_offset(self):
+        return self.offset_string
+
+    def format_ticks(self, gpsvalues):
+        gpsvalues = np.asarray(gpsvalues, float)
+        self.set_locs(gpsvalues)
+        if not len(gpsvalues):
+            self.offset_string = ""
+            return []
+
+        weeks = np.floor(gpsvalues / WEEK).astype(int)
+        times_of_week = np.round(gpsvalues - weeks * WEEK, 6)
+        # same number of digits after "." for all ticks
+        ndigit = max([len(f"{_:.6f}".rstrip('0').split('.')[1]) for _ in times_of_week])
+        times_of_week_str = [f"{_:.{ndigit}f}" for _ in times_of_week]
+
+        if (weeks == weeks[0]).all():
+            # week is the same for all ticks; move it to offset_string
+            self.offset_string = f"GPS week {weeks[0]}"
+            return times_of_week_str
+
+        self.offset_string = "GPS week/tow"
+        if (times_of_week == 0.).all():
+            return [f"{week}" for week in weeks]
+        return [f"{week}/{tow}" for week, tow in zip(weeks, times_of_week_str)]
+
+    def __call__(self, gpsvalue, pos=None):
+        # format the dynamic ticker on top of the window
+        week = int(np.floor(gpsvalue / WEEK))
+        return f"{week}/{gpsvalue - week * WEEK:.6f}"
+
+
 class SubSecTimeFormatter(Formatter):
     offset_string: str = r"$^{*}$[s]"
     tick_extension: str = r"$^{*}$"
@@ -554,10 +740,35 @@ def juldaytimetick(ax,  # : axes._subplots.Subplot,
     xy_ticker(
         ax=ax,
         axis=axis,
-        major_locator=TimeLocator(maxticks=major_maxticks) if major else None,
-        minor_locator=TimeLocator(maxticks=minor_maxticks) if minor else None,
+        major_locator=JuldayLocator(maxticks=major_maxticks) if major else None,
+        minor_locator=JuldayLocator(maxticks=minor_maxticks) if minor else None,
         formatter=JuldayTimeFormatter())
 
+
+def gpstimetick(ax,  # : axes._subplots.Subplot,
+             axis: str='x',
+             major: bool=True,
+             minor: bool=True,
+             major_maxticks: int=10,
+             minor_maxticks: int=20,
+             calendar: bool=True):
+    """
+    for data in seconds since the GPS_EPOCH
+    :param calendar: True => ticks and labels at round UTC dates
+                     False => ticks and labels at round GPS weeks / time of week
+    """
+    if calendar:
+        locator_class, formatter = GPSCalendarLocator, GPSCalendarTimeFormatter()
+    else:
+        locator_class, formatter = GPSWeekLocator, GPSWeekFormatter()
+
+    xy_ticker(
+        ax=ax,
+        axis=axis,
+        major_locator=locator_class(maxticks=major_maxticks) if major else None,
+        minor_locator=locator_class(maxticks=minor_maxticks) if minor else None,
+        formatter=formatter)
+
 def millitimetick(
         ax,  # : axes._subplots.Subplot,
         axis: str='x',
@@ -633,13 +844,123 @@ def megafreqtick(
         formatter=formatter)
 
 
+class MinMaxPyramid(object):
+    """
+    min/max decimation pyramid of a time series sorted by time
+    level 0 is the raw series, each next level groups the buckets of the previous level by factor
+    """
+    def __init__(self, t: np.ndarray, y: np.ndarray, factor: int = 4, min_size: int = 256):
+        t = np.asarray(t)
+        y = np.asarray(y)
+        if t.ndim != 1 or t.shape != y.shape:
+            raise ValueError('t and y must be 1d arrays with the same length')
+        if factor < 2:
+            raise ValueError('factor must be at least 2')
+
+        # each level is (bucket start times, bucket minima, bucket maxima)
+        # the raw series is not copied
+        self.levels: list = [(t, y, y)]
+        while len(self.levels[-1][0]) > min_size:
+            bucket_times, lows, highs = self.levels[-1]
+            bucket_starts = np.arange(0, len(bucket_times), factor)
+            self.levels.append((
+                bucket_times[bucket_starts],
+                np.minimum.reduceat(lows, bucket_starts),
+                np.maximum.reduceat(highs, bucket_starts)))
+
+    def get_data(self, tmin: float, tmax: float, max_points: int) -> (np.ndarray, np.ndarray):
+        """
+        get the series between tmin and tmax using at most ~max_points points
+        (one point outside the window is kept on each side so that the line reaches the edges)
+        """
+        for nlevel, (bucket_times, lows, highs) in enumerate(self.levels):
+            b = max(0, np.searchsorted(bucket_times, tmin, side='right') - 1)
+            e = np.searchsorted(bucket_times, tmax, side='right') + 1
+            if nlevel == 0 and e - b <= max_points:
+                # few enough raw samples in view
+                return bucket_times[b:e], lows[b:e]
+
+            if 2 * (e - b) <= max_points or nlevel == len(self.levels) - 1:
+                # draw each bucket as a vertical segment from its minimum to its maximum
+                x = np.repeat(bucket_times[b:e], 2)
+                y = np.column_stack((lows[b:e], highs[b:e])).ravel()
+                return x, y
+
+
+class DecimatedLine(object):
+    """
+    a line that only draws as many points as there are pixels in view,
+    the data is re-decimated each time the x limits of the ax change or the figure is resized
+    """
+    def __init__(self, ax, t: np.ndarray, y: np.ndarray, *args,
+                 factor: int = 4, points_per_pixel: float = 2., **kwargs):
+        self.ax = ax
+        self.pyramid = MinMaxPyramid(t, y, factor=factor)
+        self.points_per_pixel = points_per_pixel
+
+        raw_t, raw_y, _ = self.pyramid.levels[0]
+        if len(raw_t):
+            x, y = self.pyramid.get_data(raw_t[0], raw_t[-1], self.max_points())
+        else:
+            x, y = raw_t, raw_y
+        self.line, = ax.plot(x, y, *args, **kwargs)
+        self.callback_id = ax.callbacks.connect('xlim_changed', self.update)
+        # the number of pixels in view changes with the size of the figure
+        self.resize_callback_id = ax.figure.canvas.mpl_connect('resize_event', self.update)
+
+    def max_points(self) -> int:
+        return max(2, int(self.ax.bbox.width * self.points_per_pixel))
+
+    def update(self, event=None):
+        xmin, xmax = sorted(self.ax.get_xlim())
+        x, y = self.pyramid.get_data(xmin, xmax, self.max_points())
+        self.line.set_data(x, y)
+
+    def remove(self):
+        self.ax.callbacks.disconnect(self.callback_id)
+        self.ax.figure.canvas.mpl_disconnect(self.resize_callback_id)
+        self.line.remove()
+
+
+def decimatedplot(
+        ax,  # : axes._subplots.Subplot,
+        t: np.ndarray,
+        y: np.ndarray,
+        *args,
+        factor: int = 4,
+        points_per_pixel: float = 2.,
+        time_ticks: bool = True,
+        **kwargs) -> DecimatedLine:
+    """
+    plot a huge time series (timestamps t sorted) with min/max decimation
+    :param ax: the ax to plot in
+    :param t: timestamps, sorted
+    :param y: values
+    :param args: passed to ax.plot
+    :param factor: decimation factor between two levels of the pyramid
+    :param points_per_pixel: number of points to draw per pixel of the ax width
+    :param time_ticks: set the TimeLocator and CalendarTimeFormatter on the x axis
+    :param kwargs: passed to ax.plot
+    :return decimated_line: keep a reference to it, its line is in decimated_line.line
+    """
+    decimated_line = DecimatedLine(
+        ax, t, y, *args,
+        factor=factor,
+        points_per_pixel=points_per_pixel,
+        **kwargs)
+
+    if time_ticks:
+        timetick(ax, 'x')
+    return decimated_line
+
+
 if __name__ == '__main__':
     import matplotlib.pyplot as plt
 
     start = UTC(2016, 1, 1, 12, 1, 9, 998500)
     end = UTC(2018, 1, 1, 12, 1, 10, 5000)
-    t = np.linspace(start.timestamp, end.timestamp, 100000)
-    plt.plot(t, t, 'k+')
+    t = np.linspace(start.timestamp, end.timestamp, 10000000)
+    decimated_line = decimatedplot(plt.gca(), t, t, 'k+')
 
     timetick(plt.gca(), 'x')
     #microtimetick(plt.gca(), 'y')
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import sys
 
-from typing import Union
+from typing import Union, NamedTuple
+from functools import lru_cache
+import calendar
 import datetime
+import math
 import numpy as np
+from tempoo.civil import julday_from_day, calendar_from_days, add_months_to_date, \
+    add_months, add_years, add_weeks, add_days
 
 MINUTE = 60.
 HOUR = 60. * MINUTE
@@ -56,6 +61,16 @@ class UTC(datetime.datetime):
                 self.hour, self.minute, self.second,
                 self.microsecond)
 
+    def __reduce__(self):
+        # compact pickle : the class and a single integer of microseconds since 1970-01-01
+        # the subclass is preserved without going through its __new__
+        # (the bytes branches of the constructors are kept to load the former pickles)
+        return _utc_from_microseconds, (self.__class__, utc2microseconds(self))
+
+    def __reduce_ex__(self, protocol):
+        # datetime.datetime.__reduce_ex__ would be used instead of __reduce__
+        return self.__reduce__()
+
     # def __setstate__(self, state):
     #     NO : cannot init self since the initation is done in __new__
     #     year, month, day, hour, minute, second, microsecond = state
@@ -89,11 +104,14 @@ class UTC(datetime.datetime):
     @property
     def weekday(self):
         # 0 = Monday
+        # not from tempoo.civil.calendar_table : datetime.weekday is computed in C,
+        # about 3 times faster than toordinal + table lookup
         return datetime.datetime.weekday(self)
 
     @property
     def julday(self):
-        return datetime.datetime.timetuple(self).tm_yday
+        # table lookup, see tempoo.civil.calendar_table
+        return julday_from_day(datetime.datetime.toordinal(self) - 719163)
         # old
         # timedelta = self.timestamp - self.flooryear.timestamp
         # julday = int(np.floor(timedelta / DAY)) + 1
@@ -113,17 +131,17 @@ class UTC(datetime.datetime):
                    hour=0, minute=0, second=0, microsecond=0)
 
     @property
-    def decimal_year(self):
-        """WARNING: microsecond accuracy may be lost"""
-        timestamp = self.timestamp
-        flooryear = self.flooryear
-        flooryear_timestamp = flooryear.timestamp
-        ceilyear_timestamp = self.ceilyear.timestamp
-        d1 = np.float128(timestamp - flooryear_timestamp)
-        d2 = np.float128(ceilyear_timestamp - flooryear_timestamp)
-        decimal_year = flooryear.year + d1 / d2
-        return decimal_year
-    
+    def decimal_year(self) -> float:
+        """
+        year + fraction of the year elapsed, computed from integer microseconds
+        float64 resolution : about 7 microseconds for the years 1024-2047, see tempoo.civil.microseconds2decimal_years
+        """
+        year = self.year
+        elapsed = datetime.datetime.__sub__(self, datetime.datetime(year, 1, 1, tzinfo=UTCTZINFO))
+        elapsed = (elapsed.days * 86400 + elapsed.seconds) * 1000000 + elapsed.microseconds
+        year_length = (366 if calendar.isleap(year) else 365) * 86400000000
+        return year + elapsed / year_length
+
     @property
     def floormonth(self):
         return UTC(year=self.year, month=self.month, day=1,
@@ -200,6 +218,20 @@ class UTC(datetime.datetime):
             return fd
         return UTCFromTimestamp(self.timestamp + WEEK).floorweek
 
+    def add_months(self, months: int, end_of_month: str = 'clip') -> UTC:
+        """calendar months, see tempoo.civil.add_months for the end_of_month rules (clip, overflow, raise)"""
+        year, month, day = add_months_to_date(self.year, self.month, self.day, months, end_of_month)
+        return UTC(year, month, day, self.hour, self.minute, self.second, self.microsecond)
+
+    def add_years(self, years: int, end_of_month: str = 'clip') -> UTC:
+        return self.add_months(12 * years, end_of_month=end_of_month)
+
+    def add_weeks(self, weeks: int) -> UTC:
+        return self + datetime.timedelta(weeks=weeks)
+
+    def add_days(self, days: int) -> UTC:
+        return self + datetime.timedelta(days=days)
+
     def _other_to_timedelta(self, other: Union[datetime.timedelta, float, int, UTC]) -> UTC:
 
         if isinstance(other, datetime.timedelta):
@@ -252,6 +284,75 @@ class UTC(datetime.datetime):
             microsecond=new.microsecond)
 
 
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=UTCTZINFO)
+
+
+def utc2microseconds(utc: datetime.datetime) -> int:
+    """exact number of microseconds since 1970-01-01 of an aware datetime"""
+    delta = datetime.datetime.__sub__(utc, EPOCH)
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _utc_from_microseconds(cls, microseconds: int) -> UTC:
+    """inverse of utc2microseconds, builds an instance of cls (UTC or subclass) without calling cls.__new__"""
+    seconds, microsecond = divmod(int(microseconds), 1000000)
+    days, seconds = divmod(seconds, 86400)
+    hour, seconds = divmod(seconds, 3600)
+    minute, second = divmod(seconds, 60)
+    date = datetime.date.fromordinal(days + 719163)
+    return datetime.datetime.__new__(
+        cls, date.year, date.month, date.day, hour, minute, second, microsecond, UTCTZINFO)
+
+
+# ======== opt-in cache of UTCFromTimestamp and UTCFromStr
+# UTC objects are immutable => the same object can be returned for repeated inputs
+# (e.g. the start times shared by the records of many channels)
+_utc_cache = None
+
+
+class UTCCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.
+
+
+def _cached_utc(cls, value):
+    return cls._from_value(value)
+
+
+def enable_utc_cache(maxsize: int = 4096):
+    """
+    cache the objects built by UTCFromTimestamp and UTCFromStr, least recently used first out
+    the cache is thread safe (functools.lru_cache), calling this function again resets it
+    :param maxsize: maximum number of objects kept
+    """
+    global _utc_cache
+    if maxsize is None or maxsize <= 0:
+        raise ValueError(f'maxsize must be a positive integer, got {maxsize}')
+    # typed : 1 and 1.0 give the same time, but keep the exact input type of the uncached path
+    _utc_cache = lru_cache(maxsize=maxsize, typed=True)(_cached_utc)
+
+
+def disable_utc_cache():
+    """back to one new object per call, the cached objects are released"""
+    global _utc_cache
+    _utc_cache = None
+
+
+def utc_cache_info() -> Union[None, UTCCacheInfo]:
+    """hits, misses, maxsize, currsize and hit_rate of the cache, None if disabled"""
+    cache = _utc_cache
+    if cache is None:
+        return None
+    return UTCCacheInfo(*cache.cache_info())
+
+
 class UTCFromJulday(UTC):
     def __new__(cls, year=1970, julday=1,
                 hour=0, minute=0, second=0, microsecond=0):
@@ -265,27 +366,20 @@ class UTCFromJulday(UTC):
         if not isinstance(julday, int) and not isinstance(julday, np.int64):
             raise TypeError(type(julday))
 
-        first_day_of_year_same_clock = UTC(
-            year, month=1, day=1,
-            hour=hour, minute=minute,
-            second=second, microsecond=microsecond)
-
-        end_of_year = UTC(year+1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_julday_of_year = (end_of_year - 12. * HOUR).julday
-
+        last_julday_of_year = 366 if calendar.isleap(year) else 365
         if not 1 <= julday <= last_julday_of_year:
             raise ValueError(
                 f'in year {year}, '
                 f'julday must be between 1 and {last_julday_of_year}, '
                 f'got {julday}')
 
-        utc = (first_day_of_year_same_clock + (julday - 1) * DAY)
+        date = datetime.date.fromordinal(datetime.date(year, 1, 1).toordinal() + int(julday) - 1)
 
         self = super(UTCFromJulday, cls).__new__(
             cls,
-            year=utc.year, month=utc.month, day=utc.day,
-            hour=utc.hour, minute=utc.minute, second=utc.second,
-            microsecond=utc.microsecond)
+            year=date.year, month=date.month, day=date.day,
+            hour=hour, minute=minute, second=second,
+            microsecond=microsecond)
 
         return self
 
@@ -298,6 +392,12 @@ class UTCFromTimestamp(UTC):
             d = datetime.datetime(timestamp, *_args)
             timestamp = d.timestamp()
 
+        if _utc_cache is not None:
+            return _utc_cache(cls, timestamp)
+        return cls._from_value(timestamp)
+
+    @classmethod
+    def _from_value(cls, timestamp):
         # d = datetime.datetime.fromtimestamp(timestamp - HOUR)   # ????
         d = datetime.datetime.fromtimestamp(timestamp, tz=UTCTZINFO)   # ????
         self = UTC.__new__(
@@ -315,6 +415,12 @@ class UTCFromStr(UTC):
             d = UTC(string, *_args)
             string = str(d)
 
+        if _utc_cache is not None:
+            return _utc_cache(cls, string)
+        return cls._from_value(string)
+
+    @classmethod
+    def _from_value(cls, string):
         yyyymtdd, hhmnssnnnnnnZ = string.split('T')
         yyyy, mt, dd = yyyymtdd.split('-')
         hh, mn, ssnnnnnnZ = hhmnssnnnnnnZ.split(':')
@@ -335,7 +441,255 @@ class UTCFromStr(UTC):
 
 class UTCFromDecimalYear(UTCFromTimestamp):
     def __new__(cls, decimal_year: float, *_args):
-        raise Exception('accuracy lost')
+        """
+        inverse of UTC.decimal_year,
+        the round trip error is 4 microseconds at most for the years 1024-2047 (float64 resolution)
+        """
+        if isinstance(decimal_year, (bytes, str)):
+            # pickle support by datetime.datetime
+            d = UTC(decimal_year, *_args)
+            return UTC.__new__(
+                cls, year=d.year, month=d.month, day=d.day,
+                hour=d.hour, minute=d.minute, second=d.second, microsecond=d.microsecond)
+
+        year = math.floor(decimal_year)
+        fraction = decimal_year - year  # exact
+        year_length = (366 if calendar.isleap(year) else 365) * 86400000000
+        year_start = utc2microseconds(datetime.datetime(year, 1, 1, tzinfo=UTCTZINFO))
+        return _utc_from_microseconds(cls, year_start + round(fraction * year_length))
+
+
+# ======== bulk parsing of time strings
+# positions of the separators and digits in str(UTC), i.e. YYYY-MM-DDTHH:MM:SS.ffffffZ
+STR_LENGTH = 27
+_STR_SEPARATORS = {4: b'-', 7: b'-', 10: b'T', 13: b':', 16: b':', 19: b'.', 26: b'Z'}
+_STR_DIGITS = [_ for _ in range(STR_LENGTH - 1) if _ not in _STR_SEPARATORS]
+
+
+def chars2microseconds(chars: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    parse time strings in the format of str(UTC) stored as a (n, 27) array of ascii codes
+    :param chars: uint8 array with one time string per row
+    :return microseconds: int64 array, microseconds since 1970-01-01, 0 where invalid
+    :return valid: boolean array, False for the rows not matching the format or with out of range fields
+    """
+    from tempoo.civil import days_in_month, fields2microseconds
+
+    chars = np.asarray(chars, np.uint8).reshape((-1, STR_LENGTH))
+    digits = chars.astype(np.int64) - ord('0')
+
+    valid = ((digits[:, _STR_DIGITS] >= 0) & (digits[:, _STR_DIGITS] <= 9)).all(axis=1)
+    for position, separator in _STR_SEPARATORS.items():
+        valid &= chars[:, position] == ord(separator)
+
+    def field(start, stop):
+        value = np.zeros(len(chars), np.int64)
+        for position in range(start, stop):
+            value = value * 10 + digits[:, position]
+        return value
+
+    year, month, day = field(0, 4), field(5, 7), field(8, 10)
+    hour, minute, second, microsecond = field(11, 13), field(14, 16), field(17, 19), field(20, 26)
+    valid &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) \
+        & (hour <= 23) & (minute <= 59) & (second <= 59)
+    valid &= day <= days_in_month(year, np.where(valid, month, 1))
+
+    microseconds = fields2microseconds(year, month, day, hour, minute, second, microsecond)
+    return np.where(valid, microseconds, 0), valid
+
+
+def str2microseconds(strings) -> np.ndarray:
+    """
+    vectorized UTCFromStr
+    strings in the format of str(UTC) are parsed with numpy, the others one by one by UTCFromStr
+    :param strings: sequence or array of str or bytes
+    :return microseconds: int64 array, microseconds since 1970-01-01
+    """
+    strings = np.asarray(strings)
+    shape, strings = strings.shape, strings.ravel()
+    if strings.dtype.kind == 'U':
+        try:
+            strings = strings.astype(f'S{STR_LENGTH + 1}')
+        except UnicodeEncodeError:
+            strings = strings.astype(object)
+
+    if strings.dtype.kind == 'S':
+        # one more character to detect the strings too long, shorter strings are zero padded
+        chars = strings.astype(f'S{STR_LENGTH + 1}').view(np.uint8).reshape((-1, STR_LENGTH + 1))
+        microseconds, valid = chars2microseconds(np.ascontiguousarray(chars[:, :STR_LENGTH]))
+        valid &= chars[:, STR_LENGTH] == 0
+    else:
+        microseconds = np.zeros(len(strings), np.int64)
+        valid = np.zeros(len(strings), bool)
+
+    for n in np.flatnonzero(~valid):
+        string = strings[n]
+        if isinstance(string, bytes):
+            string = string.decode()
+        microseconds[n] = utc2microseconds(UTCFromStr(string))
+
+    return microseconds.reshape(shape)
+
+
+def str2timestamps(strings) -> np.ndarray:
+    """
+    vectorized UTCFromStr(string).timestamp
+    :param strings: sequence or array of str or bytes
+    :return timestamps: float array
+    """
+    return str2microseconds(strings) / 1e6
+
+
+def julday2microseconds(year, julday, hour=0, minute=0, second=0, microsecond=0) -> np.ndarray:
+    """
+    vectorized UTCFromJulday, e.g. for the record start times of seed headers
+    :param year, julday, hour, minute, second, microsecond: arrays or scalars, broadcasted
+    :return microseconds: int64 array, microseconds since 1970-01-01
+    :raises ValueError: if any field is out of range, with the index of the first invalid item
+    """
+    from tempoo.civil import days_from_civil, is_leap_year, fields2microseconds
+
+    year, julday, hour, minute, second, microsecond = np.broadcast_arrays(*[
+        np.asarray(_, np.int64) for _ in (year, julday, hour, minute, second, microsecond)])
+
+    checks = [
+        ('year', year, (year >= 1) & (year <= 9999)),
+        ('julday', julday, (julday >= 1) & (julday <= 365 + is_leap_year(year))),
+        ('hour', hour, (hour >= 0) & (hour <= 23)),
+        ('minute', minute, (minute >= 0) & (minute <= 59)),
+        ('second', second, (second >= 0) & (second <= 59)),
+        ('microsecond', microsecond, (microsecond >= 0) & (microsecond <= 999999))]
+    for name, values, valid in checks:
+        if not valid.all():
+            n = np.flatnonzero(~valid.ravel())[0]
+            raise ValueError(f'{name} out of range at index {n}, got {values.ravel()[n]}')
+
+    days = days_from_civil(year, 1, 1) + julday - 1
+    return fields2microseconds(1970, 1, 1 + days, hour, minute, second, microsecond)
+
+
+def julday2timestamps(year, julday, hour=0, minute=0, second=0, microsecond=0) -> np.ndarray:
+    """
+    vectorized UTCFromJulday(...).timestamp
+    identical to the scalar path for the years 1685 to 2255 (less than 2 ** 53 microseconds from 1970),
+    1 ulp away at most outside
+    :return timestamps: float array
+    """
+    return julday2microseconds(year, julday, hour, minute, second, microsecond) / 1e6
+
+
+class UTCArray(object):
+    """
+    array of utc times stored as int64 microseconds since 1970-01-01
+    much lighter than a list of UTC objects for storage and inter-process communication :
+    it pickles as one contiguous buffer,
+    passed out-of-band (zero-copy) with pickle protocol 5 and a buffer_callback
+    """
+
+    def __init__(self, microseconds: np.ndarray):
+        self.microseconds = np.ascontiguousarray(microseconds, np.int64)
+
+    @classmethod
+    def from_utcs(cls, utcs: list) -> UTCArray:
+        return cls(np.fromiter((utc2microseconds(utc) for utc in utcs), np.int64, count=len(utcs)))
+
+    @classmethod
+    def from_timestamps(cls, timestamps: np.ndarray) -> UTCArray:
+        from tempoo.civil import timestamps2microseconds
+        return cls(timestamps2microseconds(timestamps))
+
+    @classmethod
+    def from_strings(cls, strings) -> UTCArray:
+        return cls(str2microseconds(strings))
+
+    def __reduce__(self):
+        # numpy arrays use PickleBuffer with protocol 5
+        return self.__class__, (self.microseconds,)
+
+    def __len__(self):
+        return len(self.microseconds)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return _utc_from_microseconds(UTC, self.microseconds[item])
+        return self.__class__(self.microseconds[item])
+
+    def __iter__(self):
+        for microseconds in self.microseconds.tolist():
+            yield _utc_from_microseconds(UTC, microseconds)
+
+    def __eq__(self, other):
+        if isinstance(other, UTCArray):
+            return np.array_equal(self.microseconds, other.microseconds)
+        return NotImplemented
+
+    def __repr__(self):
+        if len(self) > 6:
+            items = [str(utc) for utc in self[:3]] + ['...'] + [str(utc) for utc in self[-3:]]
+        else:
+            items = [str(utc) for utc in self]
+        return f"UTCArray([{', '.join(items)}])"
+
+    def tolist(self) -> list:
+        return list(self)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.microseconds / 1e6
+
+    def add_months(self, months, end_of_month: str = 'clip') -> UTCArray:
+        """months : integer or integer array, see tempoo.civil.add_months"""
+        return self.__class__(add_months(self.microseconds, months, end_of_month=end_of_month))
+
+    def add_years(self, years, end_of_month: str = 'clip') -> UTCArray:
+        return self.__class__(add_years(self.microseconds, years, end_of_month=end_of_month))
+
+    def add_weeks(self, weeks) -> UTCArray:
+        return self.__class__(add_weeks(self.microseconds, weeks))
+
+    def add_days(self, days) -> UTCArray:
+        return self.__class__(add_days(self.microseconds, days))
+
+    # ======== calendar fields, table lookups (see tempoo.civil.calendar_table)
+    def _calendar(self, name: str) -> np.ndarray:
+        return calendar_from_days(self.microseconds // 86400000000, (name,))[0]
+
+    @property
+    def year(self) -> np.ndarray:
+        return self._calendar('year')
+
+    @property
+    def month(self) -> np.ndarray:
+        return self._calendar('month')
+
+    @property
+    def day(self) -> np.ndarray:
+        return self._calendar('day')
+
+    @property
+    def julday(self) -> np.ndarray:
+        return self._calendar('julday')
+
+    @property
+    def weekday(self) -> np.ndarray:
+        # 0 = Monday
+        return self._calendar('weekday')
+
+    @property
+    def hour(self) -> np.ndarray:
+        return self.microseconds % 86400000000 // 3600000000
+
+    @property
+    def minute(self) -> np.ndarray:
+        return self.microseconds % 3600000000 // 60000000
+
+    @property
+    def second(self) -> np.ndarray:
+        return self.microseconds % 60000000 // 1000000
+
+    @property
+    def microsecond(self) -> np.ndarray:
+        return self.microseconds % 1000000
 
 
 def years_between(t1: UTC, t2: UTC) -> list:
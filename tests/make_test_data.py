@@ -1,24 +1,110 @@
+"""
+reference data for the tests, computed with the standard library datetime only (no obspy)
+each row : timestamp string year month day julday weekday hour minute second microsecond
+e.g. 635058.118249 1970-01-08T08:24:18.118249Z 1970 1 8 8 3 8 24 18 118249
+weekday : 0 = monday
+
+usage :
+    python make_test_data.py                       # rewrite data_test.txt (10000 rows 1970-2030)
+    python make_test_data.py -n 1000000 --edge-cases --year-min 1600 --year-max 2400 -o big.txt
+"""
+import argparse
+import datetime
 import numpy as np
-try:
-    from obspy.core import UTCDateTime as ut
-except ImportError:
-    raise ImportError('obspy not installed')
 
+EPOCH = datetime.datetime(1970, 1, 1)
+ORACLE_FIELDS = ['year', 'month', 'day', 'julday', 'weekday', 'hour', 'minute', 'second', 'microsecond']
+
+
+def microseconds_of(year, month=1, day=1, hour=0, minute=0, second=0, microsecond=0) -> int:
+    """exact microseconds since 1970-01-01"""
+    delta = datetime.datetime(year, month, day, hour, minute, second, microsecond) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def random_microseconds(n: int, year_min: int = 1970, year_max: int = 2030, seed: int = None) -> np.ndarray:
+    """uniform random times (integer microseconds) between january 1st of year_min and of year_max"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(microseconds_of(year_min), microseconds_of(year_max), n, dtype=np.int64)
+
+
+def edge_case_microseconds(years: list = (1600, 1700, 1800, 1900, 1904, 1969, 1970, 1972,
+                                          2000, 2024, 2038, 2100, 2400)) -> np.ndarray:
+    """
+    times around the boundaries of years, months and days :
+    leap days, century years (2000 is leap, 1900 and 2100 are not), before 1970 and far future
+    """
+    times = []
+    for year in years:
+        dates = [(year, 1, 1), (year, 2, 28), (year, 3, 1), (year, 12, 31)]
+        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+            dates.append((year, 2, 29))
+        for date in dates:
+            midnight = microseconds_of(*date)
+            times.extend([midnight - 1, midnight, midnight + 1,
+                          midnight + 43200 * 1000000 + 500000,
+                          midnight + 86400 * 1000000 - 1])
+    # epoch, 32 bits timestamps overflow
+    times.extend([-1, 0, 1, 2 ** 31 * 1000000 - 1, 2 ** 31 * 1000000])
+    return np.unique(np.asarray(times, np.int64))
+
+
+def timestamp_string(microseconds: int) -> str:
+    """exact decimal writing of a timestamp in seconds with 6 decimals"""
+    sign = "-" if microseconds < 0 else ""
+    seconds, microsecond = divmod(abs(microseconds), 1000000)
+    return f"{sign}{seconds}.{microsecond:06d}"
+
+
+def oracle(microseconds: np.ndarray) -> dict:
+    """
+    reference values computed one by one with datetime
+    :param microseconds: int64 array, times in microseconds since 1970-01-01
+    :return columns: dict of arrays, microseconds, timestamps (float), strings (str(UTC) format)
+        and the fields year, month, day, julday, weekday (0 = monday), hour, minute, second, microsecond
+    """
+    microseconds = np.asarray(microseconds, np.int64)
+    rows = []
+    strings = []
+    for us in microseconds.tolist():
+        d = EPOCH + datetime.timedelta(microseconds=us)
+        year, month, day, hour, minute, second, weekday, julday, _ = d.timetuple()
+        rows.append((year, month, day, julday, weekday, hour, minute, second, d.microsecond))
+        strings.append(d.isoformat(timespec='microseconds') + "Z")
+
+    fields = np.asarray(rows, np.int64).reshape((-1, len(ORACLE_FIELDS)))
+    columns = {name: fields[:, k] for k, name in enumerate(ORACLE_FIELDS)}
+    columns['microseconds'] = microseconds
+    # exact division of integers, correctly rounded (unlike int64 -> float64 then / 1e6)
+    columns['timestamps'] = np.asarray([us / 1000000 for us in microseconds.tolist()], float)
+    columns['strings'] = np.asarray(strings, str)
+    return columns
 
-start = ut(1970, 1, 1)
-end = ut(2030, 1, 1)
 
-time_values = np.round(np.sort(np.random.rand(10000)) * (end - start) + start.timestamp, 6)
+def write_test_data(filename: str, microseconds: np.ndarray):
+    """write the reference rows, sorted by time, in the format of data_test.txt"""
+    microseconds = np.sort(np.asarray(microseconds, np.int64))
+    columns = oracle(microseconds)
+    with open(filename, 'w') as fid:
+        fid.write("".join([
+            f"{timestamp_string(us)} {string} {year} {month} {day} {julday} {weekday} "
+            f"{hour} {minute} {second} {microsecond}\n"
+            for us, string, year, month, day, julday, weekday, hour, minute, second, microsecond in zip(
+                microseconds.tolist(), columns['strings'].tolist(),
+                *[columns[name].tolist() for name in ORACLE_FIELDS])]))
 
-s = ""
-with open('data_test.txt', 'w') as fid:
-    for t in time_values:
-        tt = ut(t)
 
-        fid.write(
-            f'{t:.6f} {str(tt)} '\
-            f'{tt.year} {tt.month} '\
-            f'{tt.day} {tt.julday} {tt.weekday} '\
-            f'{tt.hour} {tt.minute} '\
-            f'{tt.second} {tt.microsecond}\n')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=10000, help='number of random rows')
+    parser.add_argument('--year-min', type=int, default=1970)
+    parser.add_argument('--year-max', type=int, default=2030)
+    parser.add_argument('--edge-cases', action='store_true', help='add the edge cases to the random rows')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-o', dest='output', default='data_test.txt')
+    args = parser.parse_args()
 
+    microseconds = random_microseconds(args.n, args.year_min, args.year_max, seed=args.seed)
+    if args.edge_cases:
+        microseconds = np.concatenate((microseconds, edge_case_microseconds()))
+    write_test_data(args.output, microseconds)
@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.__main__ import iter_benchmarks
+
+
+def _smallest_size(suite_class, param) -> bool:
+    """
+    the sizes of the data (numeric params) are only checked at the smallest one,
+    e.g. the 10M joins are for python -m benchmarks, the other params (modes, units) are all run
+    """
+    params = getattr(suite_class, 'params', [None])
+    if not all(isinstance(p, (int, float)) and not isinstance(p, bool) for p in params):
+        return True
+    return param == min(params)
+
+
+def test_benchmarks_run_once():
+    # the benchmarks are not timed here, only checked to run
+    names = []
+    for name, suite_class, method_name, param in iter_benchmarks():
+        if not _smallest_size(suite_class, param):
+            continue
+        suite = suite_class()
+        args = () if param is None else (param,)
+        if hasattr(suite, 'setup'):
+            suite.setup(*args)
+        try:
+            getattr(suite, method_name)(*args)
+        finally:
+            if hasattr(suite, 'teardown'):
+                suite.teardown(*args)
+        names.append(name)
+    assert len(names)
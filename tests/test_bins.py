@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from tempoo.bins import calendar_bins, calendar_floor, calendar_bin_ids, CalendarBinAggregator, CALENDAR_BIN_UNITS
+from tempoo.utc import UTC, UTCFromTimestamp, UTCArray
+
+FLOORS = {'minute': 'floorminute', 'hour': 'floorhour', 'day': 'floorday',
+          'week': 'floorweek', 'month': 'floormonth', 'year': 'flooryear'}
+
+
+def test_calendar_floor_like_utc():
+    timestamps = np.concatenate((
+        np.random.RandomState(0).uniform(-3e9, 6e9, 2000),
+        [UTC(2024, 2, 29, 23, 59, 59, 999999).timestamp, UTC(2000, 1, 1).timestamp, 0., -1e-6]))
+    utcs = [UTCFromTimestamp(t) for t in timestamps]
+    microseconds = UTCArray.from_utcs(utcs).microseconds
+    for unit, name in FLOORS.items():
+        expected = UTCArray.from_utcs([getattr(utc, name) for utc in utcs])
+        assert (calendar_floor(timestamps, unit) == expected.timestamps).all(), unit
+        assert (calendar_floor(microseconds, unit) == expected.microseconds).all(), unit
+
+    with pytest.raises(ValueError):
+        calendar_floor(timestamps, 'fortnight')
+
+
+def test_calendar_bins():
+    t0 = UTC(2024, 1, 30, 12).timestamp
+    timestamps = np.asarray([t0, t0 + 86400., t0 + 3 * 86400., t0 + 3 * 86400. + 1., t0 - 40 * 86400.])
+    values = np.asarray([1., 2., 3., 4., 5.])
+
+    bins = calendar_bins(timestamps, 'month', values=values)
+    assert bins.unit == 'month'
+    assert [str(UTCFromTimestamp(t)) for t in bins.edges] == [
+        '2023-12-01T00:00:00.000000Z', '2024-01-01T00:00:00.000000Z',
+        '2024-02-01T00:00:00.000000Z', '2024-03-01T00:00:00.000000Z']
+    assert bins.counts.tolist() == [1, 2, 2]
+    assert bins.sums.tolist() == [5., 3., 7.]
+    assert bins.means.tolist() == [5., 1.5, 3.5]
+
+    bins = calendar_bins(timestamps[:4], 'day')
+    assert bins.counts.tolist() == [1, 1, 0, 2] and bins.sums is None
+    assert len(bins.edges) == 5 and bins.starts[0] == UTC(2024, 1, 30).timestamp
+    with pytest.raises(ValueError):
+        bins.means
+    assert np.isnan(calendar_bins(timestamps[:4], 'day', values=values[:4]).means[2])
+
+    empty = calendar_bins(np.zeros(0), 'day')
+    assert len(empty.edges) == 0 and len(empty.counts) == 0
+
+
+def test_calendar_bins_streaming():
+    rng = np.random.RandomState(1)
+    timestamps = rng.uniform(1.5e9, 1.7e9, 20000)
+    values = rng.normal(size=20000)
+    microseconds = UTCArray.from_timestamps(timestamps).microseconds
+
+    for unit in CALENDAR_BIN_UNITS[2:]:
+        expected = calendar_bins(timestamps, unit, values)
+        # counts by brute force
+        ids = calendar_bin_ids(timestamps, unit)
+        assert (expected.counts == np.bincount(ids - ids.min())).all()
+        assert expected.counts.sum() == len(timestamps)
+
+        # chunks in any order, timestamps or microseconds
+        chunked = calendar_bins(timestamps, unit, values, chunk_size=999)
+        assert (chunked.edges == expected.edges).all() and (chunked.counts == expected.counts).all()
+        assert np.allclose(chunked.sums, expected.sums)
+
+        aggregator = CalendarBinAggregator(unit)
+        order = np.argsort(-timestamps)
+        for chunk in np.array_split(order, 7):
+            aggregator.add(microseconds[chunk], values[chunk])
+        result = aggregator.result()
+        assert (result.edges == UTCArray.from_timestamps(expected.edges).microseconds).all()
+        assert (result.counts == expected.counts).all() and np.allclose(result.sums, expected.sums)
+
+    aggregator = CalendarBinAggregator('day')
+    aggregator.add(timestamps[:10])
+    with pytest.raises(TypeError):
+        aggregator.add(microseconds[:10])
+    with pytest.raises(ValueError):
+        aggregator.add(timestamps[:10], values[:10])
+
+    # a failed add leaves the aggregator unchanged
+    aggregator = CalendarBinAggregator('day')
+    with pytest.raises(ValueError):
+        aggregator.add(timestamps[:10], values[:9])
+    assert aggregator.microseconds is None and aggregator.result().counts.tolist() == []
+    aggregator.add(timestamps[:10])
+    counts = aggregator.result().counts
+    with pytest.raises(ValueError):
+        aggregator.add(timestamps[10:20], values[10:20])
+    with pytest.raises(TypeError):
+        aggregator.add(microseconds[10:20])
+    result = aggregator.result()
+    assert (result.counts == counts).all() and result.counts.sum() == 10
+
+
+def test_calendar_bins_memmap(tmpdir):
+    timestamps = np.random.RandomState(2).uniform(1.5e9, 1.7e9, 10000)
+    filename = str(tmpdir.join('timestamps.npy'))
+    np.save(filename, timestamps)
+    bins = calendar_bins(np.load(filename, mmap_mode='r'), 'week', chunk_size=1024)
+    expected = calendar_bins(timestamps, 'week')
+    assert (bins.counts == expected.counts).all() and (bins.edges == expected.edges).all()
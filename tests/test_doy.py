@@ -0,0 +1,49 @@
+import datetime
+import io
+import numpy as np
+import pytest
+from tempoo.doy import doy_table, write_doy, main, WEEKDAYS, MONTHS
+
+
+def test_doy_table():
+    table = doy_table(1999, 2001)
+    assert len(table) == 365 + 366 + 365
+    for row in table[::7]:
+        date = datetime.datetime(int(row['year']), 1, 1, tzinfo=datetime.timezone.utc) \
+            + datetime.timedelta(days=int(row['julday']) - 1)
+        assert (date.month, date.day, date.weekday()) == (row['month'], row['day'], row['weekday'])
+        assert date.timestamp() == row['timestamp']
+
+    with pytest.raises(ValueError):
+        doy_table(2001, 1999)
+
+
+def test_write_doy():
+    table = doy_table(2024)
+    fid = io.BytesIO()
+    write_doy(table, fid, format="text")
+    lines = fid.getvalue().decode().splitlines()
+    assert len(lines) == 366
+    assert lines[0] == "2024 001 mon 1 jan 1704067200"
+    assert lines[-1] == "2024 366 tue 31 dec 1735603200"
+
+    fid = io.BytesIO()
+    write_doy(table, fid, format="csv")
+    lines = fid.getvalue().decode().splitlines()
+    assert lines[0] == "year,julday,weekday,day,month,timestamp"
+    assert lines[60] == "2024,060,thu,29,feb,1709164800"
+
+    fid = io.BytesIO()
+    write_doy(table, fid, format="npy")
+    fid.seek(0)
+    assert (np.load(fid) == table).all()
+
+
+def test_doy_main(tmp_path, capsysbinary):
+    main(["2023"])
+    assert capsysbinary.readouterr().out.decode().splitlines()[0] == \
+        f"2023 001 {WEEKDAYS[6]} 1 {MONTHS[0]} 1672531200"
+
+    output = str(tmp_path / "doy.npy")
+    main(["2020", "2023", "--format", "npy", "-o", output])
+    assert (np.load(output) == doy_table(2020, 2023)).all()
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from tempoo.gaps import detect_gaps, record_ends, coverage, window_coverage, GapDetector
+from tempoo.intervals import merge_intervals
+
+
+def _random_records(n: int, seed: int = 0) -> (np.ndarray, np.ndarray):
+    # contiguous records of 60 s with a few gaps and overlaps
+    rng = np.random.RandomState(seed)
+    starts = np.arange(n) * 60. + 1.6e9
+    jitter = rng.choice([0., 0., 0., 0., 2.5, -1.5, 30.], n)
+    jitter[0] = 0.
+    starts = starts + np.cumsum(jitter)
+    return starts, starts + 60.
+
+
+def _loop_reference(starts, ends, tolerance=0.):
+    # one record after the other, like the former python loops
+    gaps, overlaps = [], []
+    order = np.argsort(starts, kind="stable")
+    max_end = None
+    for i in order:
+        if max_end is not None:
+            if starts[i] - max_end > tolerance:
+                gaps.append((max_end, starts[i], i))
+            elif max_end - starts[i] > tolerance:
+                overlaps.append((starts[i], min(max_end, ends[i]), i))
+        max_end = ends[i] if max_end is None else max(max_end, ends[i])
+    return gaps, overlaps
+
+
+def test_detect_gaps():
+    starts, ends = _random_records(2000)
+    result = detect_gaps(starts, ends)
+    gaps, overlaps = _loop_reference(starts, ends)
+    assert len(gaps) and len(overlaps)
+    assert list(zip(result.gap_starts, result.gap_ends, result.gap_records)) == gaps
+    assert list(zip(result.overlap_starts, result.overlap_ends, result.overlap_records)) == overlaps
+    assert (result.gap_durations > 0).all() and (result.overlap_durations > 0).all()
+
+    # npts and dt, shuffled input, tolerance
+    npts = np.full(len(starts), 6000)
+    order = np.random.RandomState(1).permutation(len(starts))
+    shuffled = detect_gaps(starts[order], npts=npts, dt=0.01, tolerance=2.)
+    gaps, overlaps = _loop_reference(starts[order], record_ends(starts[order], npts, 0.01), tolerance=2.)
+    assert list(zip(shuffled.gap_starts, shuffled.gap_ends, shuffled.gap_records)) == gaps
+    assert list(zip(shuffled.overlap_starts, shuffled.overlap_ends, shuffled.overlap_records)) == overlaps
+    assert (shuffled.gap_durations > 2.).all() and len(shuffled.overlap_starts) == 0
+
+    # a record inside the previous one, contiguous records
+    result = detect_gaps([0., 1., 5., 10.], [10., 2., 12., 13.])
+    assert result.gap_starts.tolist() == [] and result.overlap_records.tolist() == [1, 2, 3]
+    assert result.overlap_ends.tolist() == [2., 10., 12.]
+    assert len(detect_gaps([0., 1.], [1., 2.]).gap_starts) == 0
+
+    with pytest.raises(ValueError):
+        detect_gaps(starts)
+    with pytest.raises(ValueError):
+        detect_gaps(starts, ends[:-1])
+
+
+def test_gap_detector_streaming():
+    starts, ends = _random_records(5000, seed=2)
+    window_starts, window_ends, expected = window_coverage(
+        starts, ends, starts[0], ends[-1], winlen=3600., winstep=1800.)
+    reference = detect_gaps(starts, ends)
+
+    detector = GapDetector(window_starts=window_starts, window_ends=window_ends)
+    chunks = [detector.add(starts[i:i + 333], ends[i:i + 333]) for i in range(0, len(starts), 333)]
+    for name in reference._fields:
+        assert (np.concatenate([getattr(chunk, name) for chunk in chunks]) == getattr(reference, name)).all()
+    assert np.allclose(detector.coverage, expected)
+
+    with pytest.raises(ValueError):
+        detector.add(starts[:1], ends[:1])
+    with pytest.raises(ValueError):
+        GapDetector().coverage
+
+    # windows in any order, nested or beyond the records
+    order = np.random.RandomState(3).permutation(len(window_starts))
+    window_starts = np.concatenate((window_starts[order], [starts[0] - 7200., starts[0], ends[-1] + 1.]))
+    window_ends = np.concatenate((window_ends[order], [ends[-1] + 7200., starts[0] + 60., ends[-1] + 2.]))
+    detector = GapDetector(window_starts=window_starts, window_ends=window_ends)
+    for i in range(0, len(starts), 333):
+        detector.add(starts[i:i + 333], ends[i:i + 333])
+    assert np.allclose(detector.coverage, coverage(starts, ends, window_starts, window_ends))
+
+
+def test_coverage():
+    starts, ends = _random_records(500, seed=3)
+    window_starts = np.arange(starts[0] - 3600., ends[-1] + 3600., 600.)
+    window_ends = window_starts + 1200.
+    percentages = coverage(starts, ends, window_starts, window_ends)
+
+    merged_starts, merged_ends = merge_intervals(starts, ends)
+    expected = [
+        100. * np.clip(np.minimum(merged_ends, we) - np.maximum(merged_starts, ws), 0., None).sum() / (we - ws)
+        for ws, we in zip(window_starts, window_ends)]
+    assert np.allclose(percentages, expected)
+    assert percentages[0] == 0. and percentages[-1] == 0. and (percentages <= 100.).all()
+    assert coverage(starts[:0], ends[:0], window_starts, window_ends).tolist() == [0.] * len(window_starts)
@@ -1,5 +1,8 @@
-from tempoo.gps import gps2utc
-from tempoo.utc import UTC, UTCFromTimestamp
+import warnings
+import numpy as np
+import pytest
+from tempoo.gps import gps2utc, gps2timestamp, timestamp2gps, cumulative_leap_seconds, GPS_EPOCH
+from tempoo.utc import UTC
 
 
 def test_gps_1988():
@@ -18,3 +21,57 @@ def test_gps_2023():
     date_utc = gps2utc(number_of_seconds_since_gps_epoch)
     assert date_gps.timestamp - date_utc.timestamp == +18.0
 
+
+
+def test_gps_vectorized():
+    number_of_seconds_since_gps_epoch = np.linspace(1e6, 1.4e9, 10000)
+    timestamps = gps2timestamp(number_of_seconds_since_gps_epoch)
+    for gps_seconds, timestamp in zip(number_of_seconds_since_gps_epoch[::100], timestamps[::100]):
+        assert gps2timestamp(gps_seconds) == timestamp
+
+    # inverse
+    assert np.abs(timestamp2gps(timestamps) - number_of_seconds_since_gps_epoch).max() < 1e-6
+
+
+@pytest.mark.parametrize('boundary, before, after', [
+    (UTC(2012, 7, 1), 15., 16.),
+    (UTC(2017, 1, 1), 17., 18.)])
+def test_gps_leap_second_boundaries(boundary, before, after):
+    # GPS - UTC just before and at the leap second dates
+    for utc, offset in [(boundary - 1., before), (boundary - 1e-6, before), (boundary, after)]:
+        assert cumulative_leap_seconds(utc.timestamp) == offset
+        gps_seconds = timestamp2gps(utc.timestamp)
+        assert gps_seconds == utc.timestamp - GPS_EPOCH.timestamp + offset
+        assert gps2timestamp(gps_seconds) == utc.timestamp
+        assert gps2utc(gps_seconds) == utc
+
+    utcs = np.asarray([(boundary - 1.).timestamp, boundary.timestamp])
+    assert (timestamp2gps(utcs) - utcs + GPS_EPOCH.timestamp).tolist() == [before, after]
+    assert (gps2timestamp(timestamp2gps(utcs)) == utcs).all()
+
+
+def test_gps_after_leap_second_table(monkeypatch):
+    import tempoo.gps
+
+    # the last known correction is used, with a warning once per process
+    monkeypatch.setattr(tempoo.gps, '_validity_end_warned', False)
+    timestamp = UTC(2030, 1, 1).timestamp
+    with pytest.warns(UserWarning, match="not announced"):
+        assert cumulative_leap_seconds(timestamp) == 18.
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert gps2timestamp(timestamp2gps(timestamp)) == timestamp
+
+        # the GPS axes do not fail (nor warn again) on recent data
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from tempoo.timetick import gpstimetick
+
+        fig, ax = plt.subplots()
+        ax.plot(timestamp2gps(np.asarray([UTC(2024, 6, 1).timestamp, timestamp])), [0., 1.])
+        gpstimetick(ax, 'x')
+        fig.canvas.draw()
+        labels = [label.get_text() for label in ax.get_xticklabels()]
+    assert "2028" in labels and "2030" in labels
+    plt.close(fig)
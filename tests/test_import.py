@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_tempoo_does_not_import_matplotlib():
+    # the lazy imports keep "import tempoo" cheap : checked on the modules imported, not on a timing
+    code = \
+        "import sys, tempoo\n" \
+        "tempoo.UTC, tempoo.UTCArray, tempoo.Instant\n" \
+        "assert not [name for name in sys.modules if name.split('.')[0] == 'matplotlib'], sorted(sys.modules)\n"
+    subprocess.run([sys.executable, '-c', code], cwd=PACKAGE_DIR, check=True)
+
+
+def test_lazy_timetick():
+    code = \
+        "import sys, tempoo\n" \
+        "assert 'matplotlib' not in sys.modules\n" \
+        "from tempoo import timetick\n" \
+        "from tempoo.timetick import timetick as expected\n" \
+        "assert timetick is expected\n" \
+        "assert 'matplotlib' in sys.modules\n"
+    subprocess.run([sys.executable, '-c', code], cwd=PACKAGE_DIR, check=True)
+
+
+def test_lazy_timetick_after_submodule_import():
+    # the submodule tempoo.timetick has the name of the function
+    code = \
+        "import tempoo.timetick\n" \
+        "import tempoo\n" \
+        "assert callable(tempoo.timetick)\n" \
+        "assert tempoo.timetick is tempoo.timetick.__globals__['timetick']\n" \
+        "from tempoo import timetick\n" \
+        "assert timetick is sys.modules['tempoo.timetick'].timetick\n"
+    subprocess.run([sys.executable, '-c', "import sys\n" + code], cwd=PACKAGE_DIR, check=True)
@@ -0,0 +1,106 @@
+import datetime
+import pickle
+import numpy as np
+import pytest
+from tempoo.instant import Instant
+from tempoo.utc import UTC, UTCFromTimestamp
+
+NAMES = [
+    'timestamp', 'year', 'month', 'day', 'julday', 'weekday',
+    'hour', 'minute', 'second', 'microsecond', 'decimal_year']
+FLOOR_CEIL_NAMES = [
+    'flooryear', 'ceilyear', 'floormonth', 'ceilmonth', 'floorweek', 'ceilweek',
+    'floorday', 'ceilday', 'floorhour', 'ceilhour', 'floorminute', 'ceilminute']
+
+UTCS = [
+    UTC(2016, 3, 5, 12, 30, 15, 123456),
+    UTC(2016, 2, 29, 23, 59, 59, 999999),
+    UTC(2000, 1, 1),
+    UTC(1969, 12, 31, 23, 59, 59, 999999),
+    UTC(2023, 12, 31, 12),
+    UTC(1850, 7, 14, 6, 30),  # outside the calendar table
+    UTC(2300, 2, 28, 1, 2, 3, 4)]
+
+
+def test_instant_fields_like_utc():
+    for utc in UTCS:
+        instant = Instant.from_utc(utc)
+        for name in NAMES:
+            assert getattr(instant, name) == getattr(utc, name), (utc, name)
+        for name in ['ymd', 'ymdhmsms', 'yjh', 'yjhmsms', '__str__']:
+            assert getattr(instant, name)() == getattr(utc, name)(), (utc, name)
+        for name in FLOOR_CEIL_NAMES:
+            assert getattr(instant, name).to_utc() == getattr(utc, name), (utc, name)
+
+
+def test_instant_conversions():
+    for utc in UTCS:
+        instant = Instant.from_utc(utc)
+        assert instant.to_utc() == utc and type(instant.to_utc()) is UTC
+        assert Instant.from_str(str(utc)) == instant
+        assert Instant.from_timestamp(utc.timestamp) == instant
+        assert float(instant) == utc.timestamp
+
+    for timestamp in np.random.RandomState(0).uniform(-1e9, 3e9, 1000).tolist():
+        assert Instant.from_timestamp(timestamp).to_utc() == UTCFromTimestamp(timestamp)
+
+
+def test_instant_arithmetic():
+    utc = UTCS[0]
+    instant = Instant.from_utc(utc)
+    for other in [3600.5, 7, -86400.25, datetime.timedelta(days=3, microseconds=5)]:
+        assert (instant + other).to_utc() == utc + other
+        assert (instant - other).to_utc() == utc - other
+    other = UTC(1970, 1, 2)
+    assert (instant - Instant.from_utc(other)).to_utc() == utc - other
+    assert (instant + Instant.from_utc(other)).to_utc() == utc + other
+    with pytest.raises(TypeError):
+        instant + "1"
+
+
+def test_instant_immutable_hashable_picklable():
+    instant = Instant(1234567)
+    assert not hasattr(instant, '__dict__')
+    with pytest.raises(AttributeError):
+        instant._us = 0
+    with pytest.raises(AttributeError):
+        instant.year = 0
+
+    assert {Instant(1234567): 1}[instant] == 1
+    assert sorted([Instant(3), Instant(1), Instant(2)]) == [Instant(1), Instant(2), Instant(3)]
+    assert Instant(1) != Instant(2) and Instant(1) < Instant(2) <= Instant(2)
+
+    loaded = pickle.loads(pickle.dumps(instant))
+    assert loaded == instant and type(loaded) is Instant
+    assert repr(instant) == "Instant(1970-01-01T00:00:01.234567Z)"
+
+
+class _SubInstant(Instant):
+    __slots__ = ()
+
+
+def test_instant_constructor_and_subclass():
+    # integers are microseconds, floats are timestamps (no silent truncation)
+    assert Instant(np.int64(1500000)) == Instant(1500000)
+    assert Instant(1.5) == Instant.from_timestamp(1.5) == Instant(1500000)
+    with pytest.raises(TypeError):
+        Instant("1500000")
+
+    # the results of the arithmetic, floor, ceil, offsets and constructors keep the subclass
+    instant = _SubInstant.from_utc(UTCS[0])
+    assert type(instant) is _SubInstant
+    for result in [instant + 1., instant - datetime.timedelta(days=1), instant.floorday, instant.ceilmonth,
+                   instant.add_months(1), instant.add_days(2), _SubInstant.from_timestamp(1.5),
+                   _SubInstant.from_str(str(UTCS[0])), pickle.loads(pickle.dumps(instant))]:
+        assert type(result) is _SubInstant
+
+
+def test_instant_calendar_offsets():
+    for utc in UTCS:
+        instant = Instant.from_utc(utc)
+        for months in [-25, -1, 1, 11, 12, 13]:
+            for end_of_month in ['clip', 'overflow']:
+                assert instant.add_months(months, end_of_month).to_utc() == utc.add_months(months, end_of_month)
+                assert instant.add_years(months, end_of_month).to_utc() == utc.add_years(months, end_of_month)
+            assert instant.add_weeks(months).to_utc() == utc.add_weeks(months)
+            assert instant.add_days(months).to_utc() == utc.add_days(months)
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from tempoo.intervals import IntervalIndex, merge_intervals, union_intervals, intersect_intervals, gap_intervals
+
+
+def _random_intervals(rng, n, dtype):
+    starts = rng.uniform(0., 100., n).astype(dtype)
+    ends = starts + rng.exponential(10., n).astype(dtype)
+    return starts, ends
+
+
+def _coverage(starts, ends, grid):
+    return ((grid[:, np.newaxis] >= starts) & (grid[:, np.newaxis] <= ends)).any(axis=1)
+
+
+@pytest.mark.parametrize('dtype', [float, np.int64])
+def test_interval_index(dtype):
+    rng = np.random.RandomState(0)
+    starts, ends = _random_intervals(rng, 200, dtype)
+    index = IntervalIndex(starts, ends)
+
+    t1 = rng.uniform(-10., 120., 50).astype(dtype)
+    t2 = t1 + rng.uniform(0., 5., 50).astype(dtype)
+    queries, intervals = index.overlap(t1, t2)
+    expected = {(q, n) for q in range(len(t1)) for n in range(len(starts))
+                if starts[n] <= t2[q] and ends[n] >= t1[q]}
+    assert set(zip(queries.tolist(), intervals.tolist())) == expected
+
+    queries, intervals = index.stab(t1)
+    assert set(zip(queries.tolist(), intervals.tolist())) == \
+        {(q, n) for q in range(len(t1)) for n in range(len(starts)) if starts[n] <= t1[q] <= ends[n]}
+    assert index.active(t1[0]).tolist() == [n for n in range(len(starts)) if starts[n] <= t1[0] <= ends[n]]
+
+    assert len(IntervalIndex([], []).stab(1.)[0]) == 0
+    with pytest.raises(ValueError):
+        IntervalIndex([1., 2.], [0., 3.])
+
+
+
+def test_interval_index_long_interval():
+    # one interval spanning all the others must not make them candidates of every query
+    rng = np.random.RandomState(0)
+    starts = np.sort(rng.uniform(0., 1e6, 10000))
+    ends = starts + rng.exponential(10., 10000)
+    ends[0] = 1e6
+    index = IntervalIndex(starts, ends)
+    times = rng.uniform(0., 1e6, 100)
+    queries, intervals = index.stab(times)
+    assert set(zip(queries.tolist(), intervals.tolist())) == \
+        {(q, n) for q, time in enumerate(times) for n in np.flatnonzero((starts <= time) & (ends >= time))}
+    assert (np.diff(queries) >= 0).all()
+
+    # same pairs when the candidates are expanded by small chunks
+    chunked = index.overlap(times, times + 100., chunk_size=10)
+    expected = index.overlap(times, times + 100.)
+    assert chunked[0].tolist() == expected[0].tolist()
+    assert sorted(zip(*[column.tolist() for column in chunked])) == \
+        sorted(zip(*[column.tolist() for column in expected]))
+
+def test_merge_intervals():
+    starts, ends = merge_intervals([5., 0., 1., 10., 3.], [6., 2., 3., 11., 4.])
+    assert starts.tolist() == [0., 5., 10.] and ends.tolist() == [4., 6., 11.]
+
+    starts, ends, groups = merge_intervals(
+        [0., 1., 0., 5.], [2., 3., 1., 6.], groups=[2, 2, 1, 1])
+    assert starts.tolist() == [0., 5., 0.]
+    assert ends.tolist() == [1., 6., 3.]
+    assert groups.tolist() == [1, 1, 2]
+
+
+def test_gap_intervals():
+    starts, ends = gap_intervals([5., 0., 1., 10.], [6., 2., 3., 11.], tmin=-1., tmax=20.)
+    assert starts.tolist() == [-1., 3., 6., 11.] and ends.tolist() == [0., 5., 10., 20.]
+
+    starts, ends, groups = gap_intervals(
+        [0., 5., 0.], [1., 6., 3.], groups=["a", "a", "b"], tmax=10.)
+    assert starts.tolist() == [1., 6., 3.]
+    assert ends.tolist() == [5., 10., 10.]
+    assert groups.tolist() == ["a", "a", "b"]
+
+
+@pytest.mark.parametrize('dtype', [float, np.int64])
+def test_union_intersection(dtype):
+    rng = np.random.RandomState(1)
+    starts1, ends1 = _random_intervals(rng, 30, dtype)
+    starts2, ends2 = _random_intervals(rng, 30, dtype)
+    grid = np.linspace(-5., 150., 10001)
+
+    starts, ends = union_intervals(starts1, ends1, starts2, ends2)
+    assert starts.dtype == dtype and (starts[1:] > ends[:-1]).all()
+    assert (_coverage(starts, ends, grid) == (_coverage(starts1, ends1, grid) | _coverage(starts2, ends2, grid))).all()
+
+    starts, ends = intersect_intervals(starts1, ends1, starts2, ends2)
+    assert (starts[1:] >= ends[:-1]).all()
+    assert (_coverage(starts, ends, grid) == (_coverage(starts1, ends1, grid) & _coverage(starts2, ends2, grid))).all()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from tempoo.join import asof_join, asof_pairs
+
+
+def _loop_reference(left, right, direction, tolerance=None):
+    matches = []
+    for t in left.tolist():
+        candidates = []
+        for j, r in enumerate(right.tolist()):
+            if direction == 'backward' and r <= t:
+                candidates.append((t - r, -j, j))  # closest, then last
+            elif direction == 'forward' and r >= t:
+                candidates.append((r - t, j, j))  # closest, then first
+            elif direction == 'nearest':
+                candidates.append((abs(r - t), r > t, -j if r < t else j, j))  # closest, then earlier
+        match = min(candidates)[-1] if candidates else -1
+        if match >= 0 and tolerance is not None and abs(right[match] - t) > tolerance:
+            match = -1
+        matches.append(match)
+    return matches
+
+
+def test_asof_join():
+    rng = np.random.RandomState(0)
+    # integers => exact ties and equal right times
+    right = np.sort(rng.randint(0, 100, 60))
+    left = rng.randint(-10, 110, 200)
+    for kind in [int, float]:
+        for direction in ['backward', 'forward', 'nearest']:
+            for tolerance in [None, 0, 3]:
+                matches = asof_join(left.astype(kind), right.astype(kind), direction, tolerance)
+                assert matches.dtype == np.int64
+                assert matches.tolist() == _loop_reference(left, right, direction, tolerance), \
+                    (kind, direction, tolerance)
+
+    # pairs, empty and scalar inputs
+    left_indices, right_indices = asof_pairs(left, right, 'forward', tolerance=1)
+    matches = asof_join(left, right, 'forward', tolerance=1)
+    assert (matches[left_indices] == right_indices).all() and (np.delete(matches, left_indices) == -1).all()
+    for direction in ['backward', 'forward', 'nearest']:
+        assert asof_join(left, right[:0], direction).tolist() == [-1] * len(left)
+        assert asof_join(left[:0], right, direction).tolist() == []
+    assert asof_join(50.5, [10., 50., 51.], 'nearest') == 1  # tie => earlier
+    assert asof_join(50.7, [10., 50., 51.], 'nearest') == 2
+
+
+def test_asof_join_errors():
+    with pytest.raises(ValueError):
+        asof_join([1., 2.], [2., 1.])
+    with pytest.raises(ValueError):
+        asof_join([1., 2.], [1., 2.], direction='closest')
+    with pytest.raises(TypeError):
+        asof_join(np.asarray([1, 2]), np.asarray([1., 2.]))
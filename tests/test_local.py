@@ -0,0 +1,143 @@
+import datetime
+import numpy as np
+import pytest
+import pytz
+from tempoo.local import PARIS_TIME_ZONE, \
+    timestamps2french_fields, timestamps2french_utcoffsets, french_fields2timestamps
+
+FIELDS = ['year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond']
+# utc instants of the dst transitions of Paris and a few microseconds around them
+TRANSITIONS = np.asarray([
+    (transition - datetime.datetime(1970, 1, 1)).total_seconds()
+    for transition in PARIS_TIME_ZONE._utc_transition_times[1:]])
+
+
+def test_timestamps2french():
+    timestamps = np.concatenate((
+        np.random.RandomState(0).uniform(-2.5e9, 3e9, 10000),
+        TRANSITIONS, TRANSITIONS - 1e-6, TRANSITIONS + 0.5))
+
+    fields = timestamps2french_fields(timestamps)
+    utcoffsets = timestamps2french_utcoffsets(timestamps)
+    for n, timestamp in enumerate(timestamps):
+        expected = datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc).astimezone(PARIS_TIME_ZONE)
+        assert [int(field[n]) for field in fields] == [getattr(expected, field) for field in FIELDS]
+        assert utcoffsets[n] == expected.utcoffset().total_seconds()
+
+
+@pytest.mark.parametrize('is_dst', [False, True])
+def test_french_fields2timestamps(is_dst):
+    # wall clock times every 10 minutes around each transition : ambiguous and non-existent times
+    walls = [transition + datetime.timedelta(minutes=minutes)
+             for transition in PARIS_TIME_ZONE._utc_transition_times[1:]
+             for minutes in range(-150, 151, 10)]
+    walls += [datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=int(_))
+              for _ in np.random.RandomState(1).uniform(-2.5e9, 3e9, 10000)]
+
+    timestamps = french_fields2timestamps(
+        *[np.asarray([getattr(wall, field) for wall in walls]) for field in FIELDS],
+        is_dst=is_dst)
+
+    for wall, timestamp in zip(walls, timestamps):
+        assert timestamp == PARIS_TIME_ZONE.localize(wall, is_dst=is_dst).timestamp()
+
+
+def test_french_fields2timestamps_errors():
+    with pytest.raises(pytz.exceptions.AmbiguousTimeError):
+        french_fields2timestamps([2023, 2023], [7, 10], [1, 29], [0, 2], [0, 30], is_dst=None)
+
+    with pytest.raises(pytz.exceptions.NonExistentTimeError):
+        french_fields2timestamps([2023, 2023], [7, 3], [1, 26], [0, 2], [0, 30], is_dst=None)
+
+
+@pytest.mark.parametrize('zone', ['America/New_York', 'Australia/Lord_Howe', 'America/Sao_Paulo', 'Asia/Kolkata', 'UTC'])
+def test_local_conversions(zone):
+    from tempoo.local import timestamps2local_fields, local_fields2timestamps
+
+    tz = pytz.timezone(zone)
+    rng = np.random.RandomState(0)
+    timestamps = rng.uniform(-2e9, 2.2e9, 2000)
+    fields = timestamps2local_fields(timestamps, zone=zone)
+    for n, timestamp in enumerate(timestamps):
+        expected = datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc).astimezone(tz)
+        assert [int(field[n]) for field in fields] == [getattr(expected, field) for field in FIELDS]
+
+    walls = [datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=int(_))
+             for _ in rng.uniform(-2e9, 2.2e9, 2000)]
+    walls += [transition + datetime.timedelta(minutes=minutes)
+              for transition in getattr(tz, '_utc_transition_times', [])[1:]
+              for minutes in range(-180, 181, 30)]
+    timestamps = local_fields2timestamps(
+        *[np.asarray([getattr(wall, field) for wall in walls]) for field in FIELDS],
+        zone=zone)
+    for wall, timestamp in zip(walls, timestamps):
+        assert timestamp == tz.localize(wall).timestamp()
+
+
+def test_timezone_table_cache():
+    from tempoo.local import timezone_table
+    assert timezone_table('Europe/Paris') is timezone_table('Europe/Paris')
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        timezone_table('Mars/Olympus_Mons')
+
+
+def test_timestamp2utc():
+    from tempoo.local import timestamp2utc
+    assert timestamp2utc(0.) == datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    assert timestamp2utc(1e9).hour == 1
+
+
+@pytest.mark.parametrize('unit', ['day', 'week', 'month', 'year'])
+@pytest.mark.parametrize('zone', ['Europe/Paris', 'America/Sao_Paulo', 'Australia/Lord_Howe'])
+def test_local_floor_ceil(unit, zone):
+    from tempoo.local import local_floor, local_ceil
+
+    tz = pytz.timezone(zone)
+    timestamps = np.random.RandomState(0).uniform(0., 2e9, 500)
+    floors = local_floor(timestamps, unit, zone=zone)
+    ceils = local_ceil(timestamps, unit, zone=zone)
+    assert (floors <= timestamps).all() and (timestamps < ceils).all()
+
+    for timestamp, floor, ceil in zip(timestamps, floors, ceils):
+        date = datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc).astimezone(tz).date()
+        if unit == 'week':
+            date -= datetime.timedelta(days=date.weekday())
+        elif unit == 'month':
+            date = date.replace(day=1)
+        elif unit == 'year':
+            date = date.replace(month=1, day=1)
+        # the period starts at its first instant, the local midnight may fall in a dst gap
+        assert datetime.datetime.fromtimestamp(floor, tz=datetime.timezone.utc).astimezone(tz).date() == date
+        assert datetime.datetime.fromtimestamp(floor - 1e-6, tz=datetime.timezone.utc).astimezone(tz).date() < date
+        assert local_floor(np.asarray([ceil]), unit, zone=zone)[0] == ceil
+
+    assert (local_ceil(floors, unit, zone=zone) == floors).all()
+
+
+def test_local_between():
+    from tempoo.utc import UTC
+    from tempoo.local import local_between
+
+    # local days last 23 or 25 hours on dst transitions
+    days = local_between(UTC(2023, 3, 24), UTC(2023, 3, 28), 'day', zone='Europe/Paris')
+    assert (np.diff(days) / 3600.).tolist() == [24., 23., 24.]
+    days = local_between(UTC(2023, 10, 27), UTC(2023, 10, 31), 'day', zone='Europe/Paris')
+    assert (np.diff(days) / 3600.).tolist() == [24., 25., 24.]
+
+    # bounds included
+    months = local_between(UTC(2022, 12, 31, 23), UTC(2023, 3, 31, 22), 'month', zone='Europe/Paris')
+    assert months.tolist() == [
+        UTC(2022, 12, 31, 23).timestamp, UTC(2023, 1, 31, 23).timestamp,
+        UTC(2023, 2, 28, 23).timestamp, UTC(2023, 3, 31, 22).timestamp]
+
+    weeks = local_between(UTC(2023, 1, 1), UTC(2023, 2, 1), 'week', zone='Europe/Paris', step=2)
+    assert weeks.tolist() == [UTC(2023, 1, 1, 23).timestamp, UTC(2023, 1, 15, 23).timestamp,
+                              UTC(2023, 1, 29, 23).timestamp]
+
+    # midnight does not exist in Sao Paulo on 2018-11-04, the day starts at 01:00
+    days = local_between(UTC(2018, 11, 3), UTC(2018, 11, 6), 'day', zone='America/Sao_Paulo')
+    assert days.tolist() == [UTC(2018, 11, 3, 3).timestamp, UTC(2018, 11, 4, 3).timestamp,
+                             UTC(2018, 11, 5, 2).timestamp]
+
+    with pytest.raises(ValueError):
+        local_between(UTC(2023, 1, 1), UTC(2023, 2, 1), 'fortnight', zone='Europe/Paris')
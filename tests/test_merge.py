@@ -0,0 +1,88 @@
+import asyncio
+import numpy as np
+import pytest
+from tempoo.merge import merge_streams, amerge_streams, merge_all, _iter_chunks
+from tempoo.utc import UTCFromTimestamp, UTCArray
+
+
+def _random_streams(nstreams: int, seed: int = 0) -> list:
+    rng = np.random.RandomState(seed)
+    # integer seconds => many equal times between the streams
+    return [np.sort(rng.randint(0, 1000, rng.randint(0, 500))).astype(float) for _ in range(nstreams)]
+
+
+def _expected(streams: list):
+    times = np.concatenate(streams)
+    stream_ids = np.concatenate([np.full(len(s), n) for n, s in enumerate(streams)])
+    indices = np.concatenate([np.arange(len(s)) for s in streams])
+    order = np.lexsort((stream_ids, times))  # ties ordered by stream
+    return times[order], stream_ids[order], indices[order]
+
+
+def test_merge_streams():
+    streams = _random_streams(30)
+    expected = _expected(streams)
+    for chunk_size in [1, 7, 100, 100000]:
+        chunks = list(merge_streams(streams, chunk_size=chunk_size))
+        merged = merge_all(streams, chunk_size=chunk_size)
+        for column, values in zip(merged, expected):
+            assert (column == values).all(), chunk_size
+        # the chunks are sorted one after the other
+        assert all(c1.times[-1] <= c2.times[0] for c1, c2 in zip(chunks[:-1], chunks[1:]))
+
+    # iterables of chunks of various sizes, with empty chunks
+    chunked = [[s[:3], s[3:3], list(s[3:50]), s[50:]] for s in streams]
+    merged = merge_all(chunked, chunk_size=64)
+    for column, values in zip(merged, expected):
+        assert (column == values).all()
+
+
+def test_merge_streams_types():
+    streams = _random_streams(5, seed=1)
+    expected_times, expected_streams, expected_indices = _expected(streams)
+    microseconds = [(s * 1e6).astype(np.int64) for s in streams]
+
+    # iterators of single UTC, int64 arrays, UTCArray, generator of floats
+    inputs = [
+        (UTCFromTimestamp(t) for t in streams[0]),
+        microseconds[1],
+        UTCArray(microseconds[2]),
+        iter(streams[3].tolist()),
+        [streams[4]]]
+    merged = merge_all(inputs, chunk_size=16)
+    assert merged.times.dtype == np.int64
+    assert (merged.times == (expected_times * 1e6).astype(np.int64)).all()
+    assert (merged.streams == expected_streams).all() and (merged.indices == expected_indices).all()
+
+    # a UTCArray is sliced into int64 chunks
+    chunks = list(_iter_chunks(UTCArray(microseconds[2]), 16))
+    assert all(isinstance(chunk, np.ndarray) and chunk.dtype == np.int64 for chunk in chunks)
+    assert [len(chunk) for chunk in chunks[:-1]] == [16] * (len(chunks) - 1)
+    assert (np.concatenate(chunks) == microseconds[2]).all()
+
+    merged = merge_all(microseconds, microseconds=False)
+    assert merged.times.dtype == float and (merged.times == expected_times).all()
+
+    assert len(merge_all([[], np.zeros(0)]).times) == 0
+    with pytest.raises(ValueError):
+        merge_all([[3., 2.]])
+    with pytest.raises(ValueError):
+        merge_all([[[1., 3.], [2.]]])
+
+
+def test_amerge_streams():
+    streams = _random_streams(10, seed=2)
+    expected = _expected(streams)
+
+    async def feed(stream):
+        for t in stream:
+            await asyncio.sleep(0)
+            yield t
+
+    async def run():
+        inputs = [feed(s) for s in streams[:5]] + streams[5:]
+        return [chunk async for chunk in amerge_streams(inputs, chunk_size=10)]
+
+    chunks = asyncio.run(run())
+    for n, values in enumerate(expected):
+        assert (np.concatenate([chunk[n] for chunk in chunks]) == values).all()
@@ -0,0 +1,142 @@
+import os
+import pickle
+from fractions import Fraction
+import numpy as np
+import pytest
+from tempoo.utc import UTC, UTCFromTimestamp, UTCFromStr, UTCFromJulday, UTCFromDecimalYear, UTCArray, \
+    str2microseconds, julday2microseconds, utc2microseconds
+from tempoo.civil import MICROSECONDS_PER_DAY, microseconds2fields, fields2microseconds, \
+    julday_from_civil, weekday_from_days, timestamps2microseconds, microseconds2timestamps, \
+    microseconds2decimal_years, decimal_years2microseconds, days_from_civil, is_leap_year, \
+    calendar_from_days, calendar_table, CALENDAR_TABLE_YEARS
+from tempoo.instant import Instant
+from make_test_data import oracle, random_microseconds, edge_case_microseconds
+
+# property tests against the datetime oracle of make_test_data.py, the sizes can be scaled up, e.g.
+# TEMPOO_ORACLE_SAMPLES=5000000 TEMPOO_ORACLE_SCALAR_SAMPLES=100000 python -m pytest tests/test_oracle.py
+NSAMPLES = int(os.environ.get("TEMPOO_ORACLE_SAMPLES", 100000))  # vectorized paths
+NSCALAR = int(os.environ.get("TEMPOO_ORACLE_SCALAR_SAMPLES", 2000))  # scalar api, one object at a time
+SEED = int(os.environ.get("TEMPOO_ORACLE_SEED", 0))
+YEAR_MIN, YEAR_MAX = 1600, 2400
+
+# below 2 ** 33 seconds from 1970, the float timestamps have a sub-microsecond resolution
+EXACT_TIMESTAMPS = 2 ** 33 * 1000000
+
+
+@pytest.fixture(scope="module")
+def reference() -> dict:
+    microseconds = np.concatenate((
+        edge_case_microseconds(),
+        random_microseconds(NSAMPLES, YEAR_MIN, YEAR_MAX, seed=SEED)))
+    return oracle(microseconds)
+
+
+@pytest.fixture(scope="module")
+def scalar_reference(reference) -> dict:
+    nedges = len(edge_case_microseconds())
+    return {key: value[:nedges + NSCALAR] for key, value in reference.items()}
+
+
+def test_oracle_vectorized_fields(reference):
+    microseconds = reference['microseconds']
+    year, month, day, hour, minute, second, microsecond = microseconds2fields(microseconds)
+    for name, values in zip(['year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond'],
+                            [year, month, day, hour, minute, second, microsecond]):
+        assert (values == reference[name]).all(), name
+
+    assert (fields2microseconds(year, month, day, hour, minute, second, microsecond) == microseconds).all()
+    assert (julday_from_civil(year, month, day) == reference['julday']).all()
+    assert (weekday_from_days(microseconds // MICROSECONDS_PER_DAY) == reference['weekday']).all()
+    assert (julday2microseconds(
+        year, reference['julday'], hour, minute, second, microsecond) == microseconds).all()
+
+
+def test_oracle_calendar_table(reference):
+    microseconds = reference['microseconds']
+    names = ['year', 'month', 'day', 'julday', 'weekday']
+
+    # the reference covers the years inside and outside the table
+    inside = (reference['year'] >= CALENDAR_TABLE_YEARS[0]) & (reference['year'] <= CALENDAR_TABLE_YEARS[1])
+    assert inside.any() and not inside.all()
+    for name, values in zip(names, calendar_from_days(microseconds // MICROSECONDS_PER_DAY)):
+        assert values.dtype == np.int64 and (values == reference[name]).all(), name
+    for name, values in zip(names, calendar_from_days(microseconds[inside] // MICROSECONDS_PER_DAY)):
+        # compact table, int64 results
+        assert getattr(calendar_table(), name).itemsize <= 2, name
+        assert values.dtype == np.int64 and (values == reference[name][inside]).all(), name
+
+    array = UTCArray(microseconds)
+    for name in names + ['hour', 'minute', 'second', 'microsecond']:
+        assert (getattr(array, name) == reference[name]).all(), name
+
+
+def test_oracle_vectorized_strings(reference):
+    assert (str2microseconds(reference['strings']) == reference['microseconds']).all()
+    assert (UTCArray.from_strings(reference['strings']).microseconds == reference['microseconds']).all()
+
+
+def test_oracle_vectorized_timestamps(reference):
+    microseconds = reference['microseconds']
+    timestamps = reference['timestamps']
+    exact = np.abs(microseconds) < EXACT_TIMESTAMPS
+
+    # int64 -> float64 -> / 1e6 rounds twice, 1 ulp away at most
+    converted = microseconds2timestamps(microseconds)
+    assert (converted[exact] == timestamps[exact]).all()
+    assert (np.abs(converted - timestamps) <= np.spacing(np.abs(timestamps))).all()
+
+    assert (timestamps2microseconds(timestamps[exact]) == microseconds[exact]).all()
+
+
+def test_oracle_vectorized_decimal_years(reference):
+    microseconds = reference['microseconds']
+    year = reference['year']
+    year_start = days_from_civil(year, 1, 1) * MICROSECONDS_PER_DAY
+    year_length = (365 + is_leap_year(year)) * MICROSECONDS_PER_DAY
+
+    # one rounding more than the correctly rounded value
+    decimal_years = microseconds2decimal_years(microseconds)
+    expected = np.asarray([
+        float(y + Fraction(elapsed, length)) for y, elapsed, length in
+        zip(year.tolist(), (microseconds - year_start).tolist(), year_length.tolist())])
+    assert (np.abs(decimal_years - expected) <= np.spacing(expected)).all()
+
+    # round trip, bounded by the resolution of the decimal years
+    error = decimal_years2microseconds(decimal_years) - microseconds
+    assert (np.abs(error) <= np.spacing(decimal_years) * year_length / 2. + 0.5).all()
+
+
+def test_oracle_scalar(scalar_reference):
+    ref = scalar_reference
+    for n, microseconds in enumerate(ref['microseconds'].tolist()):
+        year, month, day, julday, weekday, hour, minute, second, microsecond = \
+            [int(ref[name][n]) for name in
+             ['year', 'month', 'day', 'julday', 'weekday', 'hour', 'minute', 'second', 'microsecond']]
+        timestamp = float(ref['timestamps'][n])
+        string = str(ref['strings'][n])
+
+        utc = UTC(year, month, day, hour, minute, second, microsecond)
+        assert utc.timestamp == timestamp
+        assert str(utc) == string
+        assert (utc.julday, utc.weekday) == (julday, weekday)
+        assert utc2microseconds(utc) == microseconds
+
+        assert UTCFromStr(string) == utc
+        assert UTCFromJulday(year, julday, hour, minute, second, microsecond) == utc
+        if abs(microseconds) < EXACT_TIMESTAMPS:
+            assert UTCFromTimestamp(timestamp) == utc
+
+        decimal_year = utc.decimal_year
+        assert decimal_year == microseconds2decimal_years(microseconds)
+        assert utc2microseconds(UTCFromDecimalYear(decimal_year)) == decimal_years2microseconds(decimal_year)
+
+        loaded = pickle.loads(pickle.dumps(utc))
+        assert loaded == utc and type(loaded) is UTC
+
+        instant = Instant(microseconds)
+        assert (instant.year, instant.month, instant.day, instant.julday, instant.weekday) == \
+            (year, month, day, julday, weekday)
+        assert (instant.hour, instant.minute, instant.second, instant.microsecond) == \
+            (hour, minute, second, microsecond)
+        assert str(instant) == string and instant.to_utc() == utc and Instant.from_utc(utc) == instant
+        assert instant.timestamp == timestamp and instant.decimal_year == decimal_year
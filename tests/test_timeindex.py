@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from tempoo.timeindex import TimeIndex, partial_str2microseconds
+from tempoo.utc import UTC, UTCFromStr, UTCArray, utc2microseconds
+
+
+def test_partial_str2microseconds():
+    def bounds(string):
+        return [str(utc) for utc in UTCArray(np.asarray(partial_str2microseconds(string)))]
+
+    assert bounds("2024") == ['2024-01-01T00:00:00.000000Z', '2025-01-01T00:00:00.000000Z']
+    assert bounds("2024-02") == ['2024-02-01T00:00:00.000000Z', '2024-03-01T00:00:00.000000Z']
+    assert bounds("2024-12") == ['2024-12-01T00:00:00.000000Z', '2025-01-01T00:00:00.000000Z']
+    assert bounds("2024-02-29") == ['2024-02-29T00:00:00.000000Z', '2024-03-01T00:00:00.000000Z']
+    assert bounds("2024-02-29T23") == ['2024-02-29T23:00:00.000000Z', '2024-03-01T00:00:00.000000Z']
+    assert bounds("2024-02-29T23:59") == ['2024-02-29T23:59:00.000000Z', '2024-03-01T00:00:00.000000Z']
+    assert bounds("2024-02-29T23:59:59Z") == ['2024-02-29T23:59:59.000000Z', '2024-03-01T00:00:00.000000Z']
+    assert bounds("2024-02-29T23:59:59.5") == ['2024-02-29T23:59:59.500000Z', '2024-02-29T23:59:59.600000Z']
+    string = "2024-02-29T23:59:59.123456Z"
+    assert partial_str2microseconds(string)[0] == utc2microseconds(UTCFromStr(string))
+    assert bounds(string)[1] == '2024-02-29T23:59:59.123457Z'
+
+    for string in ["2024-2", "2023-02-29", "2024-13", "24-01-01", "2024-01-01 12", "2024-01-01T25"]:
+        with pytest.raises(ValueError):
+            partial_str2microseconds(string)
+
+
+def test_time_index():
+    timestamps = np.arange(UTC(2021, 1, 1).timestamp, UTC(2022, 1, 1).timestamp, 3600.)
+    amplitude = np.arange(len(timestamps), dtype=float)
+    xyz = np.zeros((len(timestamps), 3))
+    for times in [timestamps, UTCArray.from_timestamps(timestamps).microseconds]:
+        index = TimeIndex(times, amplitude=amplitude, xyz=xyz)
+        assert len(index) == 8760 and "2021-01-01T00:00:00.000000Z" in repr(index)
+
+        march = index["2021-03"]
+        assert len(march) == 31 * 24
+        assert str(march.utcs()[0]) == '2021-03-01T00:00:00.000000Z'
+        assert str(march.utcs()[-1]) == '2021-03-31T23:00:00.000000Z'
+        # zero-copy
+        assert np.shares_memory(march.times, times)
+        assert np.shares_memory(march.columns['amplitude'], amplitude)
+        assert march.columns['xyz'].shape == (31 * 24, 3) and np.shares_memory(march.columns['xyz'], xyz)
+
+        assert len(index["2021-03-05T12":"2021-03-06"]) == 12 + 24
+        assert len(index["2021-03-05T12:00:00.000000Z"]) == 1
+        assert len(index["2021-03-05T12:30"]) == 0
+
+        # UTC and timestamps : bounds included
+        sub = index[UTC(2021, 3, 5):UTC(2021, 3, 6).timestamp]
+        assert len(sub) == 25
+        assert index.slice_indices(UTC(2021, 3, 5), UTC(2021, 3, 6)) == slice(1512, 1537)
+        assert len(index[:"2021-01-01"]) == 24 and len(index["2021-12-31":]) == 24
+        assert len(index["2021-03-06":"2021-03-05"]) == 0 and len(index["2020"]) == 0
+        assert len(index.between()) == len(index) and len(index.iloc(slice(10, 20))) == 10
+
+        with pytest.raises(TypeError):
+            index[3]
+        with pytest.raises(ValueError):
+            index["2021-01":"2021-02":2]
+
+
+def test_time_index_errors():
+    with pytest.raises(ValueError):
+        TimeIndex([2., 1.])
+    with pytest.raises(ValueError):
+        TimeIndex([1., 2.], amplitude=[1.])
+    with pytest.raises(TypeError):
+        TimeIndex(np.asarray(['2021'], str))
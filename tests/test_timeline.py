@@ -0,0 +1,172 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from tempoo.utc import UTC
+from tempoo.timeline import parse_timeline_line, TimelineReader, TimelineViewer
+
+LINES = [
+    "# linenumber,r/g/b,start,end,title\n",
+    "1,255/0/0,2023-01-01T00:00:00.000000Z,2023-01-02T12:00:00.000000Z,first\n",
+    "2,0/0/255,2023-01-02T00:00:00.000000Z,2023-01-03T00:00:00.000000Z,second\n",
+    "\n",
+    "1,255/0/0,2023-01-04T00:00:00.000000Z,2023-01-05T00:00:00.000000Z,third\n",
+    ]
+
+
+def test_parse_timeline_line():
+    assert parse_timeline_line(LINES[0]) is None
+    assert parse_timeline_line(LINES[3]) is None
+    assert parse_timeline_line(LINES[1]) == \
+        (1, (255, 0, 0), UTC(2023, 1, 1).timestamp, UTC(2023, 1, 2, 12).timestamp, "first")
+    with pytest.raises(ValueError):
+        parse_timeline_line("1,255/0/0,yesterday,2023-01-02T12:00:00.000000Z,first")
+
+
+def test_timeline_reader(tmp_path):
+    filename = str(tmp_path / "timeline.txt")
+    with open(filename, 'w') as fid:
+        fid.writelines(LINES[:4])
+        fid.write(LINES[4][:10])  # incomplete line
+
+    reader = TimelineReader(filename)
+    assert reader.changed()
+    new_timeline, reset = reader.read()
+    assert new_timeline.titles.tolist() == ["first", "second"] and not reset
+    assert not reader.changed()
+
+    # only the appended lines are parsed, the incomplete line is read once finished
+    with open(filename, 'a') as fid:
+        fid.write(LINES[4][10:])
+    new_timeline, reset = reader.read()
+    assert new_timeline.titles.tolist() == ["third"] and not reset
+    assert [row[-1] for row in reader.rows] == ["first", "second", "third"]
+
+    # truncated file => start over
+    with open(filename, 'w') as fid:
+        fid.writelines(LINES[:2])
+    new_timeline, reset = reader.read()
+    assert reset and [row[-1] for row in reader.rows] == ["first"]
+
+    # rewritten in place with more lines (same inode, larger size) => start over too
+    with open(filename, 'r+') as fid:
+        fid.writelines([LINES[0], LINES[2], LINES[4]])
+    new_timeline, reset = reader.read()
+    assert reset and new_timeline.titles.tolist() == ["second", "third"]
+    assert reader.timeline.titles.tolist() == ["second", "third"]
+
+
+def test_timeline_viewer(tmp_path):
+    filename = str(tmp_path / "timeline.txt")
+    with open(filename, 'w') as fid:
+        fid.writelines(LINES[:4])
+
+    fig, ax = plt.subplots()
+    viewer = TimelineViewer(ax, TimelineReader(filename))
+    assert viewer.update()
+    assert len(viewer.collections) == 2 and len(ax.collections) == 2
+    assert not viewer.update()
+
+    with open(filename, 'a') as fid:
+        fid.write(LINES[4])
+    assert viewer.update()
+    # the new segment goes to the existing collection of its color
+    assert len(ax.collections) == 2
+    assert len(viewer.collections[(255, 0, 0)].get_segments()) == 2
+    assert len(viewer.texts) == 3 and viewer.title_rows.tolist() == [0, 1, 2]
+    assert viewer.yticks[1] == "001 first / third"
+    assert viewer.reader.timeline.starts.tolist() == [row[2] for row in viewer.reader.rows]
+
+    # only the titles of the segments starting in the view are written
+    ax.set_xlim(UTC(2023, 1, 1, 12).timestamp, UTC(2023, 1, 3).timestamp)
+    assert viewer.title_rows.tolist() == [1]
+    assert [text.get_text() for text in viewer.texts if text.get_visible()] == ["second"]
+    viewer.max_titles = 1
+    ax.set_xlim(UTC(2022, 12, 31).timestamp, UTC(2023, 1, 5).timestamp)
+    assert viewer.title_rows.tolist() == [0]
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_load_timeline(tmp_path, mmap):
+    from tempoo.timeline import load_timeline
+
+    filename = str(tmp_path / "timeline.txt")
+    with open(filename, 'w') as fid:
+        fid.writelines(LINES)
+
+    timeline = load_timeline(filename, mmap=mmap)
+    assert timeline.rows.tolist() == [2, 3, 5]
+    assert timeline.linenumbers.tolist() == [1, 2, 1]
+    assert timeline.rgb.dtype == np.uint8 and timeline.rgb.tolist() == [[255, 0, 0], [0, 0, 255], [255, 0, 0]]
+    assert timeline.titles.tolist() == ["first", "second", "third"]
+    assert timeline.tolist() == [parse_timeline_line(line) for line in LINES if parse_timeline_line(line)]
+
+    timeline = load_timeline(filename, mmap=mmap, microseconds=True)
+    assert timeline.starts.dtype == np.int64 and timeline.starts[0] == 1672531200000000
+
+    # the malformed rows are reported with their row numbers
+    with open(filename, 'a') as fid:
+        fid.write("3,0/0,2023-01-04T00:00:00.000000Z,2023-01-05T00:00:00.000000Z,bad color\n")
+        fid.write(LINES[1])
+        fid.write("3,0/0/0,2023-01-04T00:00:00.000000Z,2023-02-30T00:00:00.000000Z,bad end\n")
+    with pytest.raises(ValueError, match=r"2 malformed line\(s\)\nrow 6: .*\nrow 8: "):
+        load_timeline(filename, mmap=mmap)
+
+    empty = str(tmp_path / "empty.txt")
+    open(empty, 'w').close()
+    assert len(load_timeline(empty, mmap=mmap).starts) == 0
+
+
+def test_timeline_viewer_active(tmp_path):
+    import time
+    from tempoo.utc import UTCFromTimestamp
+
+    now = time.time()
+    filename = str(tmp_path / "timeline.txt")
+    with open(filename, 'w') as fid:
+        fid.write(f"1,0/0/0,{UTCFromTimestamp(now - 7200.)},{UTCFromTimestamp(now - 3600.)},past\n")
+        fid.write(f"2,0/0/0,{UTCFromTimestamp(now - 3600.)},{UTCFromTimestamp(now + 3600.)},current\n")
+
+    fig, ax = plt.subplots()
+    viewer = TimelineViewer(ax, TimelineReader(filename))
+    viewer.update()
+    assert viewer.active.tolist() == [1]
+    assert viewer.title_rows.tolist() == [0, 1]
+    assert [text.get_fontweight() for text in viewer.texts] == ["normal", "bold"]
+    plt.close(fig)
+
+
+def test_timeline_viewer_appends(tmp_path):
+    from tempoo.utc import UTCFromTimestamp
+
+    rng = np.random.RandomState(0)
+    starts = UTC(2023, 1, 1).timestamp + np.sort(rng.randint(0, 86400 * 30, 1000))
+    ends = starts + rng.randint(0, 86400 * 3, 1000)
+    lines = [f"{n % 10},{n % 3}/0/0,{UTCFromTimestamp(start)},{UTCFromTimestamp(end)},task {n}\n"
+             for n, (start, end) in enumerate(zip(starts, ends))]
+    filename = str(tmp_path / "timeline.txt")
+    open(filename, 'w').close()
+
+    fig, ax = plt.subplots()
+    viewer = TimelineViewer(ax, TimelineReader(filename))
+    for first in range(0, 1000, 150):
+        with open(filename, 'a') as fid:
+            fid.writelines(lines[first:first + 150])
+        assert viewer.update()
+        nrows = min(first + 150, 1000)
+        assert viewer.nrows == nrows and viewer.nindexed <= nrows
+        # indexed rows and rows appended since, together
+        for time in rng.uniform(starts[0], ends[:nrows].max(), 10):
+            expected = np.flatnonzero((starts[:nrows] <= time) & (ends[:nrows] >= time))
+            assert viewer.active_rows(time).tolist() == expected.tolist()
+    assert 0 < viewer.nindexed < 1000  # the last appends are not indexed yet
+
+    assert sum(viewer.nsegments.values()) == 1000
+    for rgb, collection in viewer.collections.items():
+        selection = np.arange(1000) % 3 == rgb[0]
+        segments = np.asarray(collection.get_segments())
+        assert (segments[:, 0, 0] == starts[selection]).all() and (segments[:, 1, 0] == ends[selection]).all()
+    plt.close(fig)
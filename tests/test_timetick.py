@@ -0,0 +1,128 @@
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from tempoo.utc import UTC, UTCFromTimestamp
+from tempoo.timetick import CalendarTimeFormatter
+
+
+def test_calendar_time_formatter_call():
+    start = UTC(2016, 1, 1, 12, 1, 9, 998500).timestamp
+    timevalues = start + np.sort(np.random.RandomState(0).rand(1000)) * 3 * 365 * 24 * 3600.
+
+    formatter = CalendarTimeFormatter()
+    for offset_string in ["2016", "2016-01", "2016-01-01", "2016-01-01T12", "2016~2019", "2016-01~2016-02"]:
+        formatter.offset_string = offset_string
+        for timevalue in timevalues:
+            expected = str(UTCFromTimestamp(timevalue))
+            if expected.startswith(offset_string.split(formatter.range_separator)[0]):
+                expected = expected[len(offset_string.split(formatter.range_separator)[0]):]
+            elif formatter.range_separator in offset_string and \
+                    expected.startswith(offset_string.split(formatter.range_separator)[1]):
+                expected = expected[len(offset_string.split(formatter.range_separator)[1]):]
+            assert formatter(timevalue) == expected
+
+
+def test_calendar_time_formatter_call_no_offset():
+    formatter = CalendarTimeFormatter()
+    formatter.offset_string = ""
+    t = UTC(2016, 1, 1, 12, 1, 9, 998500)
+    assert formatter(t.timestamp) == str(t)
+
+
+def test_calendar_time_formatter_call_after_format_ticks():
+    formatter = CalendarTimeFormatter()
+    timevalues = [UTC(2016, 3, 5, 12, 0, 0).timestamp, UTC(2016, 3, 5, 13, 0, 0).timestamp]
+    formatter.format_ticks(timevalues)
+    assert formatter.offset_string == "2016-03-05"
+    assert formatter(UTC(2016, 3, 5, 12, 30, 0, 201600).timestamp) == "T12:30:00.201600Z"
+
+
+def test_calendar_time_formatter_call_subsecond_offset():
+    formatter = CalendarTimeFormatter()
+    formatter.offset_string = "2016-03-05T12:30:15"
+    assert formatter(UTC(2016, 3, 5, 12, 30, 15, 123456).timestamp) == ".123456Z"
+    formatter.offset_string = "2016-03-05T12:30:15~2016-03-05T12:30:16"
+    assert formatter(UTC(2016, 3, 5, 12, 30, 16, 500).timestamp) == ".000500Z"
+
+
+def test_decimatedplot():
+    import matplotlib.pyplot as plt
+    from tempoo.timetick import decimatedplot, TimeLocator
+
+    t = UTC(2016, 1, 1).timestamp + np.arange(1000000) * 0.01
+    y = np.sin(np.arange(1000000) * 0.001)
+    y[123456] = 10.
+
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    decimated_line = decimatedplot(ax, t, y, 'k')
+    assert isinstance(ax.xaxis.get_major_formatter(), CalendarTimeFormatter)
+    assert isinstance(ax.xaxis.get_major_locator(), TimeLocator)
+
+    ax.set_xlim(t[0], t[-1])
+    xdata, ydata = decimated_line.line.get_data()
+    assert len(xdata) <= decimated_line.max_points() + 4
+    assert ydata.max() == 10.  # the min/max decimation keeps the peaks
+    assert ydata.min() == y.min()
+
+    # zoom in : raw samples
+    ax.set_xlim(t[1000], t[1100])
+    xdata, ydata = decimated_line.line.get_data()
+    assert (xdata == t[1000:1102]).all()
+    assert (ydata == y[1000:1102]).all()
+    plt.close(fig)
+
+
+def test_decimatedplot_resize_and_empty():
+    import matplotlib.pyplot as plt
+    from matplotlib.backend_bases import ResizeEvent
+    from tempoo.timetick import decimatedplot
+
+    t = UTC(2016, 1, 1).timestamp + np.arange(1000000) * 0.01
+    y = np.sin(np.arange(1000000) * 0.001)
+    fig = plt.figure(figsize=(2, 2), dpi=100)
+    ax = fig.add_subplot(111)
+    decimated_line = decimatedplot(ax, t, y, 'k')
+    npoints = len(decimated_line.line.get_xdata())
+
+    # a larger figure has more pixels in view => more points
+    fig.set_size_inches(20, 2)
+    fig.canvas.callbacks.process('resize_event', ResizeEvent('resize_event', fig.canvas))
+    assert len(decimated_line.line.get_xdata()) > npoints
+    assert len(decimated_line.line.get_xdata()) <= decimated_line.max_points() + 4
+    decimated_line.remove()
+
+    # empty series : empty line
+    decimated_line = decimatedplot(ax, np.zeros(0), np.zeros(0), 'k')
+    assert len(decimated_line.line.get_xdata()) == 0
+    ax.set_xlim(t[0], t[-1])
+    assert len(decimated_line.line.get_xdata()) == 0
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def test_julday_locator():
+    from tempoo.timetick import JuldayLocator
+
+    start, end = UTC(2016, 1, 1).timestamp, UTC(2016, 3, 1).timestamp
+    ticks = JuldayLocator(maxticks=10).tick_values(start, end)
+    assert 1 < len(ticks) <= 10
+    juldays = [UTCFromTimestamp(tick).julday for tick in ticks]
+    assert juldays == [1, 10, 20, 30, 40, 50, 60]
+
+
+def test_gps_locators():
+    from tempoo.gps import timestamp2gps
+    from tempoo.timetick import GPSWeekLocator, GPSCalendarLocator, TimeLocator, WEEK
+
+    start, end = UTC(2016, 1, 1).timestamp, UTC(2016, 3, 1).timestamp
+    gps_start, gps_end = timestamp2gps(np.array([start, end]))
+
+    ticks = np.asarray(GPSWeekLocator(maxticks=10).tick_values(gps_start, gps_end))
+    assert 1 < len(ticks) <= 10
+    assert (ticks % WEEK == 0.).all()
+
+    # same calendar ticks as TimeLocator, but in GPS seconds
+    ticks = GPSCalendarLocator(maxticks=10).tick_values(gps_start, gps_end)
+    expected_ticks = TimeLocator(maxticks=10).tick_values(start, end)
+    assert np.all(np.asarray(ticks) - np.asarray(expected_ticks) == timestamp2gps(start) - start)
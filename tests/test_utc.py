@@ -77,6 +77,23 @@ def test_utc_from_decimal_year_new():
         assert utc_new.ceilyear.year - 1 == int(decimal_year)
 
 
+def test_decimal_year_round_trip():
+    from tempoo.utc import UTCFromDecimalYear, utc2microseconds
+
+    assert UTC(2024, 7, 2).decimal_year == 2024.5
+    assert UTC(2023, 1, 1).decimal_year == 2023.
+    assert isinstance(UTC(2023, 1, 1).decimal_year, float)
+    assert UTCFromDecimalYear(2024.5) == UTC(2024, 7, 2)
+    assert isinstance(UTCFromDecimalYear(2024.5), UTCFromDecimalYear)
+
+    for t, y, m, d, h, mn, sc, ms in \
+            zip(TIMESTAMPS, YEARS, MONTHS, DAYS, HOURS, MINUTES, SECONDS, MICROSECONDS):
+        utc = UTC(year=y, month=m, day=d, hour=h, minute=mn, second=sc, microsecond=ms)
+        # float64 resolution of the decimal years 1024-2047 : 2 ** -42 years ~ 7 microseconds
+        error = utc2microseconds(UTCFromDecimalYear(utc.decimal_year)) - utc2microseconds(utc)
+        assert abs(error) <= 4
+
+
 def test_utc_add():
     i, j = np.array(np.random.rand(2) * len(TIMESTAMPS), int)
 
@@ -157,6 +174,34 @@ def test_julian_utc_new():
         assert str(utc_new) == s
 
 
+def test_julian_utc_errors():
+    assert UTCFromJulday(2024, 366) == UTC(2024, 12, 31)
+    for year, julday in [(2023, 366), (1900, 366), (2024, 0), (2024, 367)]:
+        with pytest.raises(ValueError):
+            UTCFromJulday(year, julday)
+    with pytest.raises(ValueError):
+        UTCFromJulday(2024, 1, hour=24)
+    with pytest.raises(TypeError):
+        UTCFromJulday(2024, 1.)
+
+
+def test_julday2timestamps():
+    from tempoo.utc import julday2timestamps, julday2microseconds
+
+    timestamps = julday2timestamps(YEARS, JULDAYS, HOURS, MINUTES, SECONDS, MICROSECONDS)
+    assert (timestamps == TIMESTAMPS).all()
+    microseconds = julday2microseconds(YEARS, JULDAYS, HOURS, MINUTES, SECONDS, MICROSECONDS)
+    assert microseconds.dtype == np.int64 and (microseconds % 1000000 == MICROSECONDS).all()
+
+    # broadcasting
+    assert julday2timestamps(2024, [1, 366]).tolist() == [UTC(2024, 1, 1).timestamp, UTC(2024, 12, 31).timestamp]
+
+    with pytest.raises(ValueError, match="julday out of range at index 1, got 366"):
+        julday2timestamps([2024, 2023], [366, 366])
+    with pytest.raises(ValueError, match="second out of range at index 0"):
+        julday2timestamps(2024, 1, second=[60, 0])
+
+
 def test_utc_from_timestamp_new():
     for t, s, y, m, d, jd, wd, h, mn, sc, ms in \
             zip(TIMESTAMPS, TIMESTRINGS, YEARS, MONTHS, DAYS, JULDAYS, WEEKDAYS,
@@ -296,3 +341,161 @@ def test_pickle_utc_from_str():
 
 
 
+
+
+def test_str2timestamps():
+    from tempoo.utc import str2timestamps, str2microseconds
+
+    assert (str2timestamps(TIMESTRINGS) == TIMESTAMPS).all()
+    assert (str2timestamps(np.char.encode(TIMESTRINGS)) == TIMESTAMPS).all()
+    microseconds = str2microseconds(TIMESTRINGS)
+    assert microseconds.dtype == np.int64 and (microseconds % 1000000 == MICROSECONDS).all()
+    assert str2timestamps(TIMESTRINGS[0]) == TIMESTAMPS[0]
+
+    # other formats go through UTCFromStr
+    assert str2timestamps(["2000-01-01T00:00:00.5Z"]).tolist() == [UTCFromStr("2000-01-01T00:00:00.5Z").timestamp]
+    with pytest.raises(ValueError):
+        str2timestamps(["2023-02-29T00:00:00.000000Z"])
+    with pytest.raises(ValueError):
+        str2timestamps(["2023-01-01"])
+
+
+def test_pickle_compact():
+    from tempoo.utc import utc2microseconds
+
+    for utc in [UTC(2016, 3, 5, 12, 30, 15, 123456), UTCFromJulday(2020, 60, 1, 2, 3, 4),
+                UTCFromTimestamp(-1e9 + 0.5), UTCFromStr("0001-01-01T00:00:00.000000Z")]:
+        function, (cls, microseconds) = utc.__reduce_ex__(4)
+        assert cls is type(utc) and microseconds == utc2microseconds(utc)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(utc, protocol=protocol))
+            assert loaded == utc and type(loaded) is type(utc)
+
+    # pickles of the former format (datetime bytes state) can still be loaded
+    for cls in [UTC, UTCFromJulday, UTCFromTimestamp, UTCFromStr]:
+        utc = UTC.__new__(cls, 2016, 3, 5, 12, 30, 15, 123456)
+        constructor, args = datetime.datetime.__reduce_ex__(utc, 2)[:2]
+        assert constructor(*args) == utc
+
+
+def test_utc_array():
+    from tempoo.utc import UTCArray
+
+    utcs = [UTCFromStr(s) for s in TIMESTRINGS]
+    array = UTCArray.from_utcs(utcs)
+    assert len(array) == len(utcs)
+    assert array.tolist() == utcs
+    assert (array.timestamps == TIMESTAMPS).all()
+    assert array == UTCArray.from_strings(TIMESTRINGS)
+    assert array[-1] == utcs[-1] and array[1:3].tolist() == utcs[1:3]
+
+    assert pickle.loads(pickle.dumps(array)) == array
+
+
+def test_utc_array_calendar_dtypes():
+    from tempoo.utc import UTCArray
+
+    # 7 consecutive days from 2023-11-14 (inside the calendar table), and the same days in 2300 (outside)
+    for start in [UTC(2023, 11, 14), UTC(2300, 11, 14)]:
+        array = UTCArray.from_utcs([start + n * 86400. for n in range(7)])
+        for name in ['year', 'month', 'day', 'julday', 'weekday']:
+            assert getattr(array, name).dtype == np.int64, name
+        assert sorted((array.weekday - 1).tolist()) == [-1, 0, 1, 2, 3, 4, 5]
+        assert (array.month - 12).tolist() == [-1] * 7
+        assert (array.day - 20).tolist() == [-6, -5, -4, -3, -2, -1, 0]
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5, reason="pickle protocol 5 needs python >= 3.8")
+def test_utc_array_pickle_out_of_band():
+    from tempoo.utc import UTCArray
+
+    array = UTCArray.from_strings(TIMESTRINGS)
+    # protocol 5 : the data is passed out-of-band without copy
+    buffers = []
+    pkl = pickle.dumps(array, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1 and len(pkl) < 200
+    loaded = pickle.loads(pkl, buffers=buffers)
+    assert loaded == array and np.shares_memory(loaded.microseconds, array.microseconds)
+
+
+def test_utc_cache():
+    from tempoo.utc import enable_utc_cache, disable_utc_cache, utc_cache_info
+
+    assert utc_cache_info() is None
+    enable_utc_cache(maxsize=2)
+    try:
+        first = UTCFromTimestamp(TIMESTAMPS[0])
+        assert UTCFromTimestamp(TIMESTAMPS[0]) is first
+        assert UTCFromStr(TIMESTRINGS[0]) == first and type(UTCFromStr(TIMESTRINGS[0])) is UTCFromStr
+        info = utc_cache_info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (2, 2, 2, 2)
+        assert info.hit_rate == 0.5
+
+        # least recently used entry dropped, the results do not change
+        for t, s in zip(TIMESTAMPS[:10], TIMESTRINGS[:10]):
+            assert UTCFromTimestamp(t) == UTCFromStr(s)
+            assert str(UTCFromTimestamp(t)) == s
+        assert utc_cache_info().currsize == 2
+        assert UTCFromTimestamp(TIMESTAMPS[0]) is not first
+
+        # numbers of different types are cached apart
+        misses = utc_cache_info().misses
+        assert UTCFromTimestamp(1) == UTCFromTimestamp(1.) == UTCFromTimestamp(np.float64(1.))
+        assert utc_cache_info().misses == misses + 3
+        with pytest.raises(ValueError):
+            UTCFromStr("2023-01-01")
+        with pytest.raises(ValueError):
+            enable_utc_cache(0)
+    finally:
+        disable_utc_cache()
+    assert utc_cache_info() is None
+    assert UTCFromTimestamp(TIMESTAMPS[0]) is not UTCFromTimestamp(TIMESTAMPS[0])
+
+
+def test_add_months():
+    from tempoo.civil import add_months, add_years, add_weeks, add_days
+    from tempoo.utc import UTCArray, utc2microseconds
+
+    utc = UTC(2024, 1, 31, 12, 30, 15, 123456)
+    assert utc.add_months(1) == UTC(2024, 2, 29, 12, 30, 15, 123456)
+    assert utc.add_months(1, end_of_month='overflow') == UTC(2024, 3, 2, 12, 30, 15, 123456)
+    assert utc.add_months(-2) == UTC(2023, 11, 30, 12, 30, 15, 123456)
+    assert utc.add_months(13) == UTC(2025, 2, 28, 12, 30, 15, 123456)
+    assert utc.add_months(11) == UTC(2024, 12, 31, 12, 30, 15, 123456)
+    assert UTC(2024, 2, 29).add_years(1) == UTC(2025, 2, 28)
+    assert UTC(2024, 2, 29).add_years(1, end_of_month='overflow') == UTC(2025, 3, 1)
+    assert UTC(2024, 2, 29).add_years(4, end_of_month='raise') == UTC(2028, 2, 29)
+    assert utc.add_weeks(-2) == UTC(2024, 1, 17, 12, 30, 15, 123456)
+    assert utc.add_days(1) == UTC(2024, 2, 1, 12, 30, 15, 123456)
+    with pytest.raises(ValueError):
+        utc.add_months(1, end_of_month='raise')
+    with pytest.raises(ValueError):
+        utc.add_months(1, end_of_month='round')
+
+    # arrays : same results as the scalar version, float timestamps and int64 microseconds
+    rng = np.random.RandomState(0)
+    months = rng.randint(-300, 300, len(TIMESTAMPS))
+    days = rng.randint(-3000, 3000, len(TIMESTAMPS))
+    utcs = [UTCFromTimestamp(t) for t in TIMESTAMPS]
+    array = UTCArray.from_timestamps(TIMESTAMPS)
+    for end_of_month in ['clip', 'overflow']:
+        expected = UTCArray.from_utcs([u.add_months(m, end_of_month) for u, m in zip(utcs, months.tolist())])
+        assert array.add_months(months, end_of_month) == expected
+        assert (add_months(TIMESTAMPS, months, end_of_month) == expected.timestamps).all()
+
+        expected = UTCArray.from_utcs([u.add_years(m, end_of_month) for u, m in zip(utcs, months.tolist())])
+        assert array.add_years(months, end_of_month) == expected
+
+    expected = UTCArray.from_utcs([u.add_days(d) for u, d in zip(utcs, days.tolist())])
+    assert array.add_days(days) == expected
+    assert (add_days(TIMESTAMPS, days) == expected.timestamps).all()
+    assert array.add_weeks(3) == UTCArray.from_utcs([u.add_weeks(3) for u in utcs])
+    assert (add_weeks(TIMESTAMPS, 3) == array.add_weeks(3).timestamps).all()
+
+    # scalars and broadcasting
+    microseconds = utc2microseconds(utc)
+    assert add_months(microseconds, [1, 2]).tolist() == \
+        [utc2microseconds(utc.add_months(1)), utc2microseconds(utc.add_months(2))]
+    assert add_years(utc.timestamp, 1) == utc.add_years(1).timestamp
+    with pytest.raises(ValueError, match="index 1"):
+        add_months([utc.timestamp - 30 * 86400., utc.timestamp], 1, end_of_month='raise')